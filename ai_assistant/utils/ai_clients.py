@@ -3,6 +3,8 @@ import json
 import logging
 from django.conf import settings
 
+from kanban.utils.ai_utils import generate_content, generate_content_async
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,14 +28,13 @@ class GeminiClient:
             logger.error(f"Error initializing Gemini client: {e}")
             self.model = None
     
-    def get_response(self, prompt, system_prompt=None, history=None):
+    def get_response(self, prompt, system_prompt=None):
         """
         Get response from Gemini model
         
         Args:
             prompt (str): User prompt
             system_prompt (str): System context
-            history (list): Chat history
             
         Returns:
             dict: Response with content and token info
@@ -46,22 +47,55 @@ class GeminiClient:
             }
         
         try:
-            full_prompt = prompt
-            if system_prompt:
-                full_prompt = f"{system_prompt}\n\n{prompt}"
-            
-            response = self.model.generate_content(full_prompt)
-            
-            return {
-                'content': response.text,
-                'error': None,
-                'tokens': len(response.text.split()),  # Approximate token count
-            }
+            response = generate_content(self.model, self._build_prompt(prompt, system_prompt))
+            return self._build_response(response)
         
         except Exception as e:
-            logger.error(f"Error getting Gemini response: {e}")
+            return self._build_error(e)
+    
+    async def get_response_async(self, prompt, system_prompt=None):
+        """
+        Async version of get_response for async views and Channels consumers
+        
+        Shares the concurrency limit, timeout and retry policy of
+        kanban.utils.ai_utils.generate_content_async.
+        
+        Returns:
+            dict: Response with content and token info
+        """
+        if not self.model:
             return {
-                'content': f"Error: {str(e)}",
-                'error': str(e),
+                'content': 'Gemini service is unavailable',
+                'error': 'Model not initialized',
                 'tokens': 0
             }
+        
+        try:
+            response = await generate_content_async(self.model, self._build_prompt(prompt, system_prompt))
+            return self._build_response(response)
+        
+        except Exception as e:
+            return self._build_error(e)
+    
+    @staticmethod
+    def _build_prompt(prompt, system_prompt=None):
+        if system_prompt:
+            return f"{system_prompt}\n\n{prompt}"
+        return prompt
+    
+    @staticmethod
+    def _build_response(response):
+        return {
+            'content': response.text,
+            'error': None,
+            'tokens': len(response.text.split()),  # Approximate token count
+        }
+    
+    @staticmethod
+    def _build_error(error):
+        logger.error(f"Error getting Gemini response: {error}")
+        return {
+            'content': f"Error: {str(error)}",
+            'error': str(error),
+            'tokens': 0
+        }
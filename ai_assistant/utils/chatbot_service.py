@@ -283,9 +283,14 @@ class TaskFlowChatbotService:
                 return "You don't have access to any boards yet."
             
             # Get aggregate data
-            total_tasks = Task.objects.filter(
+            totals = Task.objects.filter(
                 column__board__in=user_boards
-            ).count()
+            ).aggregate(
+                total=Count('id'),
+                completed=Count('id', filter=Q(is_done=True))
+            )
+            total_tasks = totals['total']
+            completed_tasks = totals['completed']
             
             # Get tasks by status
             tasks_by_status = Task.objects.filter(
@@ -305,6 +310,7 @@ class TaskFlowChatbotService:
             context = f"""**System-Wide Task Analytics (All Your Projects):**
 
 - **Total Tasks:** {total_tasks}
+- **Completed Tasks:** {completed_tasks}
 - **Total Boards:** {user_boards.count()}
 
 **Tasks by Status:**
@@ -811,7 +817,7 @@ For suggestions, provide confidence levels and reasoning."""
                 system_prompt += "\n\n**Available Context Data:**\n" + "\n".join(context_parts)
             
             # Get response from Gemini
-            response = self.gemini_client.get_response(prompt, system_prompt, history)
+            response = self.gemini_client.get_response(prompt, system_prompt)
             
             return {
                 'response': response['content'],
@@ -853,7 +859,7 @@ For suggestions, provide confidence levels and reasoning."""
             
             report_prompt = f"""Generate a comprehensive project status report for "{board.name}" based on:
             - Total tasks: {tasks.count()}
-            - Completed: {tasks.filter(column__name__icontains='done').count()}
+            - Completed: {tasks.filter(is_done=True).count()}
             - In Progress: {tasks.filter(column__name__icontains='progress').count()}
             - Not Started: {tasks.filter(column__name__icontains='todo').count()}
             
@@ -11,12 +11,13 @@ from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.utils import timezone
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
-from kanban.models import Task, Comment, Board, Column, TaskActivity
+from kanban.models import Task, Comment, Board, Column, TaskActivity, AIJob
 from accounts.models import UserProfile
 from django.contrib.auth.models import User
 from kanban.utils.ai_utils import (
@@ -35,8 +36,36 @@ from kanban.utils.ai_utils import (
     extract_tasks_from_transcript,
     calculate_task_risk_score,
     generate_risk_mitigation_suggestions,
-    assess_task_dependencies_and_risks
+    assess_task_dependencies_and_risks,
+    ai_cache_scope
 )
+from kanban.utils.position_service import TaskPositionService
+from kanban.utils.ai_job_service import AIJobService
+from kanban.utils.board_snapshot_service import BoardSnapshotService
+from kanban.utils.board_access_service import BoardAccessService
+from kanban.utils.task_search_service import TaskSearchService
+from kanban.utils.board_import_service import BoardImportService
+from kanban.utils.board_analytics_service import BoardAnalyticsService
+from kanban.utils.flow_metrics_service import FlowMetricsService
+from kanban.utils.cycle_time_service import CycleTimeService
+from kanban.utils.board_events import broadcast_board_event, task_payload
+
+def ai_job_response(job):
+    """
+    Respond to a request that queued an AIJob
+
+    If the job already finished (eager Celery or the inline fallback) the
+    result is returned as before; otherwise 202 with the job to poll.
+    """
+    job.refresh_from_db()
+    if job.status == 'succeeded':
+        return JsonResponse(job.result)
+    if job.status == 'failed':
+        return JsonResponse({'error': job.error}, status=500)
+
+    response = job.as_dict()
+    response['status_url'] = reverse('ai_job_status_api', args=[job.id])
+    return JsonResponse(response, status=202)
 
 @login_required
 @require_http_methods(["POST"])
@@ -73,7 +102,7 @@ def summarize_comments_api(request, task_id):
         board = task.column.board
         
         # Check if user has access to this board/task
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         # Format comments for AI
@@ -88,8 +117,9 @@ def summarize_comments_api(request, task_id):
         if not comments_data:
             return JsonResponse({'summary': 'No comments to summarize.'})
             
-        # Generate summary
-        summary = summarize_comments(comments_data)
+        # Generate summary (cached until the task changes, ?refresh=1 forces a new one)
+        with ai_cache_scope(task=task, bypass=request.GET.get('refresh') == '1'):
+            summary = summarize_comments(comments_data)
         
         if not summary:
             return JsonResponse({'error': 'Failed to generate summary'}, status=500)
@@ -132,133 +162,11 @@ def summarize_board_analytics_api(request, board_id):
         board = get_object_or_404(Board, id=board_id)
         
         # Check if user has access to this board
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
-        # Gather analytics data (same as in board_analytics view)
-        from django.db.models import Count, Q
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        # Get all tasks for this board
-        all_tasks = Task.objects.filter(column__board=board)
-        total_tasks = all_tasks.count()
-        
-        # Completed tasks
-        completed_count = Task.objects.filter(
-            column__board=board, 
-            column__name__icontains='done'
-        ).count()
-        
-        # Calculate productivity
-        total_progress_percentage = 0
-        for task in all_tasks:
-            if task.column.name.lower().find('done') >= 0:
-                progress = 100
-            else:
-                progress = task.progress
-            total_progress_percentage += progress
-        
-        productivity = 0
-        if total_tasks > 0:
-            productivity = (total_progress_percentage / (total_tasks * 100)) * 100
-        
-        # Overdue and upcoming tasks
-        today = timezone.now().date()
-        overdue_tasks = Task.objects.filter(
-            column__board=board,
-            due_date__date__lt=today
-        ).exclude(column__name__icontains='done')
-        
-        upcoming_tasks = Task.objects.filter(
-            column__board=board,
-            due_date__date__gte=today,
-            due_date__date__lte=today + timedelta(days=7)
-        )
-        
-        # Lean Six Sigma metrics
-        value_added_count = Task.objects.filter(
-            column__board=board, 
-            labels__name='Value-Added', 
-            labels__category='lean'
-        ).count()
-        
-        necessary_nva_count = Task.objects.filter(
-            column__board=board, 
-            labels__name='Necessary NVA', 
-            labels__category='lean'
-        ).count()
-        
-        waste_count = Task.objects.filter(
-            column__board=board, 
-            labels__name='Waste/Eliminate', 
-            labels__category='lean'
-        ).count()
-        
-        total_categorized = value_added_count + necessary_nva_count + waste_count
-        value_added_percentage = 0
-        if total_categorized > 0:
-            value_added_percentage = (value_added_count / total_categorized) * 100
-        
-        # Task distribution by column
-        columns = Column.objects.filter(board=board)
-        tasks_by_column = []
-        for column in columns:
-            count = Task.objects.filter(column=column).count()
-            tasks_by_column.append({'name': column.name, 'count': count})
-        
-        # Task distribution by priority
-        priority_queryset = Task.objects.filter(column__board=board).values('priority').annotate(
-            count=Count('id')
-        ).order_by('priority')
-        
-        tasks_by_priority = []
-        for item in priority_queryset:
-            priority_name = dict(Task.PRIORITY_CHOICES).get(item['priority'], item['priority'])
-            tasks_by_priority.append({'priority': priority_name, 'count': item['count']})
-        
-        # Task distribution by user
-        user_queryset = Task.objects.filter(column__board=board).values(
-            'assigned_to__username'
-        ).annotate(count=Count('id')).order_by('-count')
-        
-        tasks_by_user = []
-        for item in user_queryset:
-            username = item['assigned_to__username'] or 'Unassigned'
-            completed_user_tasks = Task.objects.filter(
-                column__board=board,
-                assigned_to__username=item['assigned_to__username'],
-                column__name__icontains='done'
-            ).count()
-            
-            user_completion_rate = 0
-            if item['count'] > 0:
-                user_completion_rate = (completed_user_tasks / item['count']) * 100
-                
-            tasks_by_user.append({
-                'username': username,
-                'count': item['count'],
-                'completion_rate': int(user_completion_rate)
-            })
-        
-        # Prepare analytics data for AI
-        analytics_data = {
-            'total_tasks': total_tasks,
-            'completed_count': completed_count,
-            'productivity': round(productivity, 1),
-            'overdue_count': overdue_tasks.count(),
-            'upcoming_count': upcoming_tasks.count(),
-            'value_added_percentage': round(value_added_percentage, 1),
-            'total_categorized': total_categorized,
-            'tasks_by_lean_category': [
-                {'name': 'Value-Added', 'count': value_added_count},
-                {'name': 'Necessary NVA', 'count': necessary_nva_count},
-                {'name': 'Waste/Eliminate', 'count': waste_count}
-            ],
-            'tasks_by_column': tasks_by_column,
-            'tasks_by_priority': tasks_by_priority,
-            'tasks_by_user': tasks_by_user
-        }
+        # Precomputed analytics (same snapshot as the board_analytics view)
+        analytics_data = BoardAnalyticsService(board).summary_data()
         
         # Generate analytics summary
         summary = summarize_board_analytics(analytics_data)
@@ -293,14 +201,14 @@ def suggest_task_priority_api(request):
             board = task.column.board
             
             # Check access
-            if not (board.created_by == request.user or request.user in board.members.all()):
+            if not BoardAccessService.can_access(request.user, board):
                 return JsonResponse({'error': 'Access denied'}, status=403)
         else:
             # For new tasks, try to get board from request
             board_id = data.get('board_id')
             if board_id:
                 board = get_object_or_404(Board, id=board_id)
-                if not (board.created_by == request.user or request.user in board.members.all()):
+                if not BoardAccessService.can_access(request.user, board):
                     return JsonResponse({'error': 'Access denied'}, status=403)
             else:
                 return JsonResponse({'error': 'Board ID or Task ID is required'}, status=400)
@@ -313,7 +221,7 @@ def suggest_task_priority_api(request):
             'total_tasks': all_tasks.count(),
             'high_priority_count': all_tasks.filter(priority='high').count(),
             'urgent_count': all_tasks.filter(priority='urgent').count(),
-            'overdue_count': all_tasks.filter(due_date__lt=timezone.now()).exclude(column__name__icontains='done').count(),
+            'overdue_count': all_tasks.filter(is_done=False, due_date__lt=timezone.now()).count(),
             'upcoming_deadlines': all_tasks.filter(
                 due_date__gte=timezone.now(),
                 due_date__lte=timezone.now() + timedelta(days=7)
@@ -328,7 +236,8 @@ def suggest_task_priority_api(request):
         }
         
         # Call AI function
-        suggestion = suggest_task_priority(task_data, board_context)
+        with ai_cache_scope(task=task if task_id else None, bypass=bool(data.get('refresh'))):
+            suggestion = suggest_task_priority(task_data, board_context)
         
         if not suggestion:
             return JsonResponse({'error': 'Failed to suggest priority'}, status=500)
@@ -365,7 +274,7 @@ def predict_deadline_api(request):
             return JsonResponse({'error': 'Board ID or Task ID is required'}, status=400)
         
         # Check access
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         # Gather team context for deadline prediction
@@ -375,7 +284,7 @@ def predict_deadline_api(request):
         # Calculate average completion times (simplified calculation)
         completed_tasks = Task.objects.filter(
             column__board=board, 
-            column__name__icontains='done'
+            is_done=True
         )
         
         team_avg_completion = 5  # Default fallback
@@ -386,8 +295,9 @@ def predict_deadline_api(request):
             total_days = 0
             count = 0
             for task in completed_tasks:
-                if task.updated_at and task.created_at:
-                    days_to_complete = (task.updated_at - task.created_at).days
+                finished_at = task.completed_at or task.updated_at
+                if finished_at and task.created_at:
+                    days_to_complete = (finished_at - task.created_at).days
                     if days_to_complete > 0:  # Avoid zero or negative days
                         total_days += days_to_complete
                         count += 1
@@ -403,8 +313,9 @@ def predict_deadline_api(request):
                 assignee_user = User.objects.get(username=assigned_to)
                 assignee_current_tasks = Task.objects.filter(
                     column__board=board,
-                    assigned_to=assignee_user
-                ).exclude(column__name__icontains='done').count()
+                    assigned_to=assignee_user,
+                    is_done=False
+                ).count()
             except User.DoesNotExist:
                 pass
         
@@ -424,7 +335,8 @@ def predict_deadline_api(request):
         }
         
         # Call AI function
-        prediction = predict_realistic_deadline(task_data, team_context)
+        with ai_cache_scope(task=task if task_id else None, bypass=bool(data.get('refresh'))):
+            prediction = predict_realistic_deadline(task_data, team_context)
         
         if not prediction:
             return JsonResponse({'error': 'Failed to predict deadline'}, status=500)
@@ -448,7 +360,7 @@ def recommend_columns_api(request):
             board = get_object_or_404(Board, id=board_id)
             
             # Check access
-            if not (board.created_by == request.user or request.user in board.members.all()):
+            if not BoardAccessService.can_access(request.user, board):
                 return JsonResponse({'error': 'Access denied'}, status=403)
             
             existing_columns = [col.name for col in board.columns.all()]
@@ -505,7 +417,7 @@ def suggest_task_breakdown_api(request):
             board = task.column.board
             
             # Check access
-            if not (board.created_by == request.user or request.user in board.members.all()):
+            if not BoardAccessService.can_access(request.user, board):
                 return JsonResponse({'error': 'Access denied'}, status=403)
         
         task_data = {
@@ -517,7 +429,8 @@ def suggest_task_breakdown_api(request):
         }
         
         # Call AI function
-        breakdown = suggest_task_breakdown(task_data)
+        with ai_cache_scope(task=task if task_id else None, bypass=bool(data.get('refresh'))):
+            breakdown = suggest_task_breakdown(task_data)
         
         if not breakdown:
             return JsonResponse({'error': 'Failed to suggest task breakdown'}, status=500)
@@ -542,97 +455,59 @@ def analyze_workflow_optimization_api(request):
         board = get_object_or_404(Board, id=board_id)
         
         # Check access
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
-        # Gather comprehensive board analytics (similar to existing analytics)
-        from django.db.models import Count, Avg
-        from django.utils import timezone
-        from datetime import timedelta
-        
-        all_tasks = Task.objects.filter(column__board=board)
-        total_tasks = all_tasks.count()
+        # The analytics and Gemini call run on a Celery worker
+        job = AIJobService.enqueue(request.user, 'workflow_optimization', board=board)
+        return ai_job_response(job)
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+
+@login_required
+@require_http_methods(["POST"])
+def analyze_critical_path_api(request):
+    """
+    API endpoint to queue an AI critical path analysis for a board
+    """
+    return _queue_board_ai_job(request, 'critical_path')
+
+@login_required
+@require_http_methods(["POST"])
+def generate_project_timeline_api(request):
+    """
+    API endpoint to queue an AI project timeline for a board
+    """
+    return _queue_board_ai_job(request, 'project_timeline')
+
+def _queue_board_ai_job(request, kind):
+    try:
+        data = json.loads(request.body)
+        board_id = data.get('board_id')
         
-        # Calculate average completion time
-        completed_tasks = all_tasks.filter(column__name__icontains='done')
-        avg_completion_time = 5  # Default
-        if completed_tasks.exists():
-            total_days = 0
-            count = 0
-            for task in completed_tasks:
-                if task.updated_at and task.created_at:
-                    days = (task.updated_at - task.created_at).days
-                    if days > 0:
-                        total_days += days
-                        count += 1
-            if count > 0:
-                avg_completion_time = total_days / count
-        
-        # Task distribution by column
-        columns = Column.objects.filter(board=board)
-        tasks_by_column = []
-        for column in columns:
-            count = Task.objects.filter(column=column).count()
-            tasks_by_column.append({'name': column.name, 'count': count})
-        
-        # Task distribution by priority
-        priority_queryset = all_tasks.values('priority').annotate(count=Count('id'))
-        tasks_by_priority = []
-        for item in priority_queryset:
-            priority_name = dict(Task.PRIORITY_CHOICES).get(item['priority'], item['priority'])
-            tasks_by_priority.append({'priority': priority_name, 'count': item['count']})
-        
-        # Task distribution by user
-        user_queryset = all_tasks.values('assigned_to__username').annotate(count=Count('id'))
-        tasks_by_user = []
-        for item in user_queryset:
-            username = item['assigned_to__username'] or 'Unassigned'
-            completed_user_tasks = completed_tasks.filter(
-                assigned_to__username=item['assigned_to__username']
-            ).count()
-            
-            completion_rate = 0
-            if item['count'] > 0:
-                completion_rate = (completed_user_tasks / item['count']) * 100
-                
-            tasks_by_user.append({
-                'username': username,
-                'count': item['count'],
-                'completion_rate': int(completion_rate)
-            })
+        if not board_id:
+            return JsonResponse({'error': 'Board ID is required'}, status=400)
         
-        # Calculate productivity
-        total_progress = sum(task.progress for task in all_tasks)
-        productivity = 0
-        if total_tasks > 0:
-            productivity = total_progress / total_tasks
-        
-        # Overdue count
-        overdue_count = all_tasks.filter(
-            due_date__lt=timezone.now()
-        ).exclude(column__name__icontains='done').count()
-        
-        board_analytics = {
-            'total_tasks': total_tasks,
-            'tasks_by_column': tasks_by_column,
-            'tasks_by_priority': tasks_by_priority,
-            'tasks_by_user': tasks_by_user,
-            'avg_completion_time_days': avg_completion_time,
-            'overdue_count': overdue_count,
-            'productivity': productivity,
-            'weekly_velocity': []  # Could be enhanced with historical data
-        }
+        board = get_object_or_404(Board, id=board_id)
         
-        # Call AI function
-        optimization = analyze_workflow_optimization(board_analytics)
+        # Check access
+        if not BoardAccessService.can_access(request.user, board):
+            return JsonResponse({'error': 'Access denied'}, status=403)
         
-        if not optimization:
-            return JsonResponse({'error': 'Failed to analyze workflow'}, status=500)
-            
-        return JsonResponse(optimization)
+        job = AIJobService.enqueue(request.user, kind, board=board)
+        return ai_job_response(job)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
+@login_required
+@require_http_methods(["GET"])
+def ai_job_status_api(request, job_id):
+    """
+    API endpoint to poll a queued AI job
+    """
+    job = get_object_or_404(AIJob, id=job_id, user=request.user)
+    return JsonResponse(job.as_dict())
+
 @login_required
 @require_http_methods(["POST"])
 def create_subtasks_api(request):
@@ -649,7 +524,7 @@ def create_subtasks_api(request):
             return JsonResponse({'error': 'Missing required fields (board_id, subtasks)'}, status=400)
               # Verify user has access to the board
         board = get_object_or_404(Board, id=board_id)
-        if not (request.user in board.members.all() or request.user == board.created_by):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
             
         # Get column - if not specified, use first column
@@ -714,7 +589,7 @@ def create_subtasks_api(request):
                     priority=priority,
                     due_date=due_date,
                     created_by=request.user,
-                    position=Task.objects.filter(column=column).count()  # Add to end
+                    position=TaskPositionService(column).append_position()  # Add to end
                 )
                 
                 created_tasks.append({
@@ -771,35 +646,23 @@ def calculate_task_risk_api(request):
             return JsonResponse({'error': 'Board ID or Task ID is required'}, status=400)
         
         # Check access
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
-        # Get board context
-        board_context = f"Board: {board.name}. Description: {board.description or 'N/A'}"
-        
-        # Calculate risk score
-        risk_analysis = calculate_task_risk_score(title, description, priority, board_context)
-        
-        if not risk_analysis:
-            return JsonResponse({'error': 'Failed to calculate risk score'}, status=500)
-        
-        # If task_id provided, save the analysis to the task
-        if task_id:
-            task.risk_likelihood = risk_analysis.get('likelihood', {}).get('score')
-            task.risk_impact = risk_analysis.get('impact', {}).get('score')
-            task.risk_score = risk_analysis.get('risk_assessment', {}).get('risk_score')
-            task.risk_level = risk_analysis.get('risk_assessment', {}).get('risk_level', 'low').lower()
-            task.risk_indicators = risk_analysis.get('risk_indicators', [])
-            task.mitigation_suggestions = risk_analysis.get('mitigation_suggestions', [])
-            task.risk_analysis = risk_analysis
-            task.last_risk_assessment = timezone.now()
-            task.save()
-        
-        return JsonResponse({
-            'success': True,
-            'risk_analysis': risk_analysis,
-            'saved': bool(task_id)
-        })
+        # Score (and save) the risk on a Celery worker
+        job = AIJobService.enqueue(
+            request.user,
+            'task_risk',
+            params={
+                'title': title,
+                'description': description,
+                'priority': priority,
+                'refresh': bool(data.get('refresh')),
+            },
+            board=board,
+            task=task if task_id else None
+        )
+        return ai_job_response(job)
     except Exception as e:
         logger.error(f"Error in calculate_task_risk_api: {str(e)}")
         return JsonResponse({'error': str(e)}, status=500)
@@ -834,17 +697,18 @@ def get_mitigation_suggestions_api(request):
             return JsonResponse({'error': 'Board ID or Task ID is required'}, status=400)
         
         # Check access
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         # Get mitigation suggestions
-        mitigation_suggestions = generate_risk_mitigation_suggestions(
-            title, 
-            description,
-            risk_likelihood,
-            risk_impact,
-            risk_indicators
-        )
+        with ai_cache_scope(task=task if task_id else None, bypass=bool(data.get('refresh'))):
+            mitigation_suggestions = generate_risk_mitigation_suggestions(
+                title, 
+                description,
+                risk_likelihood,
+                risk_impact,
+                risk_indicators
+            )
         
         if not mitigation_suggestions:
             return JsonResponse({'error': 'Failed to generate mitigation suggestions'}, status=500)
@@ -886,7 +750,7 @@ def assess_task_dependencies_api(request):
             return JsonResponse({'error': 'Board ID or Task ID is required'}, status=400)
         
         # Check access
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         # Get related tasks
@@ -905,7 +769,8 @@ def assess_task_dependencies_api(request):
         ]
         
         # Assess dependencies
-        dependency_analysis = assess_task_dependencies_and_risks(task_title, tasks_data)
+        with ai_cache_scope(task=task if task_id else None, bypass=bool(data.get('refresh'))):
+            dependency_analysis = assess_task_dependencies_and_risks(task_title, tasks_data)
         
         if not dependency_analysis:
             return JsonResponse({'error': 'Failed to assess task dependencies'}, status=500)
@@ -1011,17 +876,17 @@ def extract_tasks_from_transcript_api(request):
             
         # Verify board access
         board = get_object_or_404(Board, id=board_id)
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
-        # Extract tasks using AI
-        from kanban.utils.ai_utils import extract_tasks_from_transcript
-        extracted_tasks = extract_tasks_from_transcript(transcript, meeting_context, board)
-        
-        if not extracted_tasks:
-            return JsonResponse({'error': 'Failed to extract tasks from transcript'}, status=500)
-            
-        return JsonResponse(extracted_tasks)
+        # Extract tasks using AI on a Celery worker
+        job = AIJobService.enqueue(
+            request.user,
+            'transcript_extraction',
+            params={'transcript': transcript, 'meeting_context': meeting_context},
+            board=board
+        )
+        return ai_job_response(job)
     except Exception as e:
         logger.error(f"Error in extract_tasks_from_transcript_api: {str(e)}")
         return JsonResponse({'error': str(e)}, status=500)
@@ -1043,7 +908,7 @@ def create_tasks_from_extraction_api(request):
         
         # Verify board access
         board = get_object_or_404(Board, id=board_id)
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         # Get the "To Do" column
@@ -1070,14 +935,14 @@ def create_tasks_from_extraction_api(request):
                     priority=task_data.get('priority', 'medium'),
                     due_date=parse_due_date(task_data.get('due_date_suggestion')),
                     created_by=request.user,
-                    position=Task.objects.filter(column=todo_column).count(),
+                    position=TaskPositionService(todo_column).append_position(),
                 )
                 
                 # Assign if suggested
                 if task_data.get('suggested_assignee'):
                     try:
                         assignee = User.objects.get(username=task_data['suggested_assignee'])
-                        if assignee in board.members.all() or assignee == board.created_by:
+                        if BoardAccessService.can_access(assignee, board):
                             task.assigned_to = assignee
                             task.save()
                     except User.DoesNotExist:
@@ -1189,7 +1054,7 @@ def get_task_dependencies_api(request, task_id):
         task = get_object_or_404(Task, id=task_id)
         
         # Verify user has access to this task's board
-        if not request.user in task.column.board.members.all() and task.column.board.created_by != request.user:
+        if not BoardAccessService.can_access(request.user, task.column.board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         dependencies = {
@@ -1249,7 +1114,7 @@ def set_parent_task_api(request, task_id):
         task = get_object_or_404(Task, id=task_id)
         
         # Verify user has access
-        if not request.user in task.column.board.members.all() and task.column.board.created_by != request.user:
+        if not BoardAccessService.can_access(request.user, task.column.board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         data = json.loads(request.body)
@@ -1295,7 +1160,7 @@ def add_related_task_api(request, task_id):
         task = get_object_or_404(Task, id=task_id)
         
         # Verify user has access
-        if not request.user in task.column.board.members.all() and task.column.board.created_by != request.user:
+        if not BoardAccessService.can_access(request.user, task.column.board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         data = json.loads(request.body)
@@ -1335,7 +1200,7 @@ def analyze_task_dependencies_api(request, task_id):
         task = get_object_or_404(Task, id=task_id)
         
         # Verify user has access
-        if not request.user in task.column.board.members.all() and task.column.board.created_by != request.user:
+        if not BoardAccessService.can_access(request.user, task.column.board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         data = json.loads(request.body)
@@ -1369,7 +1234,7 @@ def get_dependency_tree_api(request, task_id):
         task = get_object_or_404(Task, id=task_id)
         
         # Verify user has access
-        if not request.user in task.column.board.members.all() and task.column.board.created_by != request.user:
+        if not BoardAccessService.can_access(request.user, task.column.board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         include_related = request.GET.get('include_related', 'false').lower() == 'true'
@@ -1399,7 +1264,7 @@ def get_board_dependency_graph_api(request, board_id):
         board = get_object_or_404(Board, id=board_id)
         
         # Verify user has access
-        if not request.user in board.members.all() and board.created_by != request.user:
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         root_task_id = request.GET.get('root_task_id')
@@ -1420,6 +1285,141 @@ def get_board_dependency_graph_api(request, board_id):
         return JsonResponse({'error': str(e)}, status=500)
 
 
+@login_required
+@require_http_methods(["GET"])
+def board_snapshot_api(request, board_id):
+    """
+    Get the columns, cards, labels and members of a board as one JSON document
+    """
+    board = get_object_or_404(Board, id=board_id)
+    
+    if not BoardAccessService.can_access(request.user, board):
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    return JsonResponse(BoardSnapshotService(board).build())
+
+
+@login_required
+@require_http_methods(["GET"])
+def cumulative_flow_api(request, board_id):
+    """
+    Tasks per column at the end of each day (cumulative flow diagram)
+    """
+    board = get_object_or_404(Board, id=board_id)
+    
+    if not BoardAccessService.can_access(request.user, board):
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    days = FlowMetricsService.parse_window(request.GET.get('days'), default=90, maximum=730)
+    if days is None:
+        return JsonResponse({'error': 'days must be a number'}, status=400)
+    
+    return JsonResponse(FlowMetricsService(board).cumulative_flow(days=days))
+
+
+@login_required
+@require_http_methods(["GET"])
+def burndown_api(request, board_id):
+    """
+    Scope, done and remaining tasks at the end of each day (burndown/burnup)
+    """
+    board = get_object_or_404(Board, id=board_id)
+    
+    if not BoardAccessService.can_access(request.user, board):
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    days = FlowMetricsService.parse_window(request.GET.get('days'), default=90, maximum=730)
+    if days is None:
+        return JsonResponse({'error': 'days must be a number'}, status=400)
+    
+    return JsonResponse(FlowMetricsService(board).burndown(days=days))
+
+
+@login_required
+@require_http_methods(["GET"])
+def throughput_api(request, board_id):
+    """
+    Tasks completed per week
+    """
+    board = get_object_or_404(Board, id=board_id)
+    
+    if not BoardAccessService.can_access(request.user, board):
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    weeks = FlowMetricsService.parse_window(request.GET.get('weeks'), default=12, maximum=104)
+    if weeks is None:
+        return JsonResponse({'error': 'weeks must be a number'}, status=400)
+    
+    return JsonResponse(FlowMetricsService(board).throughput(weeks=weeks))
+
+
+@login_required
+@require_http_methods(["GET"])
+def cycle_time_api(request, board_id):
+    """
+    Lead and cycle time percentiles (hours) for the board, its assignees and its labels
+    """
+    board = get_object_or_404(Board, id=board_id)
+    
+    if not BoardAccessService.can_access(request.user, board):
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    days = FlowMetricsService.parse_window(request.GET.get('days'), default=None, maximum=3650)
+    if days is None and request.GET.get('days'):
+        return JsonResponse({'error': 'days must be a number'}, status=400)
+    
+    return JsonResponse(CycleTimeService.summary(board, days=days))
+
+
+@login_required
+@require_http_methods(["GET"])
+def import_progress_api(request, import_id):
+    """
+    Get the progress of a board import started by the current user
+    """
+    progress = BoardImportService.get_progress(request.user.id, import_id)
+    if progress is None:
+        return JsonResponse({'error': 'Import not found'}, status=404)
+    return JsonResponse(progress)
+
+
+@login_required
+@require_http_methods(["GET"])
+def search_tasks_api(request, board_id):
+    """
+    Full-text search over a board's tasks, best match first
+    """
+    board = get_object_or_404(Board, id=board_id)
+    
+    if not BoardAccessService.can_access(request.user, board):
+        return JsonResponse({'error': 'Access denied'}, status=403)
+    
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = min(max(int(request.GET.get('limit', 50)), 1), 200)
+    except ValueError:
+        return JsonResponse({'error': 'limit must be a number'}, status=400)
+    
+    tasks = TaskSearchService.filter_queryset(
+        Task.objects.filter(column__board=board), board, query, ranked=True, limit=limit
+    ).values('id', 'title', 'column_id', 'column__name', 'priority', 'is_done')[:limit] if query else []
+    
+    return JsonResponse({
+        'query': query,
+        'results': [
+            {
+                'id': task['id'],
+                'title': task['title'],
+                'column_id': task['column_id'],
+                'column_name': task['column__name'],
+                'priority': task['priority'],
+                'is_done': task['is_done'],
+            }
+            for task in tasks
+        ],
+    })
+
+
 @login_required
 @require_http_methods(["POST"])
 def update_task_dates_api(request):
@@ -1439,7 +1439,7 @@ def update_task_dates_api(request):
         
         # Verify user has access
         board = task.column.board
-        if not (request.user in board.members.all() or board.created_by == request.user):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': 'Access denied'}, status=403)
         
         # Update dates
@@ -1459,6 +1459,7 @@ def update_task_dates_api(request):
                 task.due_date = datetime.strptime(due_date + ' 23:59:59', '%Y-%m-%d %H:%M:%S')
         
         task.save()
+        broadcast_board_event(board.id, 'task_dates', task_payload(task, 'start_date', 'due_date'), user=request.user)
         
         # Log activity
         TaskActivity.objects.create(
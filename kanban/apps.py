@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class KanbanConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kanban'
+    
+    def ready(self):
+        """Perform app initialization"""
+        import kanban.signals  # noqa
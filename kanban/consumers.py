@@ -0,0 +1,89 @@
+import asyncio
+import json
+from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.db import database_sync_to_async
+from .models import Board
+from .utils.board_events import board_group_name
+from .utils.board_access_service import BoardAccessService
+
+
+class BoardConsumer(AsyncWebsocketConsumer):
+    """WebSocket consumer that pushes task/column diffs to open board pages"""
+
+    # Events arriving within this window are merged into one frame
+    COALESCE_SECONDS = 0.1
+
+    async def connect(self):
+        """Handle WebSocket connection"""
+        self.board_id = self.scope['url_route']['kwargs']['board_id']
+        self.board_group_name = board_group_name(self.board_id)
+        self.user = self.scope['user']
+        self.pending_events = {}
+        self.flush_task = None
+
+        # Check if user is authorized
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+
+        is_authorized = await self.is_user_authorized()
+        if not is_authorized:
+            await self.close()
+            return
+
+        # Join board group
+        await self.channel_layer.group_add(
+            self.board_group_name,
+            self.channel_name
+        )
+
+        await self.accept()
+
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection"""
+        if self.flush_task:
+            self.flush_task.cancel()
+
+        await self.channel_layer.group_discard(
+            self.board_group_name,
+            self.channel_name
+        )
+
+    async def board_events(self, event):
+        """Queue diffs from the group and send them as one batch per burst"""
+        for item in event['events']:
+            key = self.event_key(item)
+            # A later diff for the same task/column replaces the earlier one
+            self.pending_events.pop(key, None)
+            self.pending_events[key] = {**item, 'actor_id': event.get('actor_id')}
+
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.ensure_future(self.flush_events())
+
+    async def flush_events(self):
+        """Send the queued diffs after the coalescing window"""
+        await asyncio.sleep(self.COALESCE_SECONDS)
+        events = list(self.pending_events.values())
+        self.pending_events = {}
+
+        if events:
+            await self.send(text_data=json.dumps({
+                'type': 'board_update',
+                'events': events
+            }))
+
+    @staticmethod
+    def event_key(item):
+        """Identify which earlier diff an event supersedes"""
+        if 'task_id' in item:
+            return (item['event'], item['task_id'])
+        return (item['event'],)
+
+    @database_sync_to_async
+    def is_user_authorized(self):
+        """Check if user can view the board"""
+        try:
+            board = Board.objects.get(id=self.board_id)
+            return BoardAccessService.can_access(self.user, board)
+        except Board.DoesNotExist:
+            return False
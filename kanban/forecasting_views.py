@@ -17,6 +17,7 @@ from kanban.models import (
     WorkloadDistributionRecommendation, Task
 )
 from kanban.utils.forecasting_service import DemandForecastingService, WorkloadAnalyzer
+from kanban.utils.board_access_service import BoardAccessService
 
 
 @login_required
@@ -27,7 +28,7 @@ def forecast_dashboard(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check board access
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         messages.error(request, "You don't have access to this board.")
         return redirect('dashboard')
     
@@ -70,7 +71,7 @@ def generate_forecast(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check access
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
     
     service = DemandForecastingService()
@@ -90,6 +91,8 @@ def generate_forecast(request, board_id):
                     'capacity': float(f.available_capacity_hours),
                     'utilization': f"{f.utilization_percentage:.0f}%",
                     'overloaded': f.is_overloaded,
+                    'expected_new_tasks': forecast_data['trends'][f.resource_user_id]['arrivals'],
+                    'expected_completions': forecast_data['trends'][f.resource_user_id]['completions'],
                 } for f in forecast_data['forecasts']
             ]
         })
@@ -105,7 +108,7 @@ def workload_recommendations(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check access
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         messages.error(request, "You don't have access to this board.")
         return redirect('dashboard')
     
@@ -132,7 +135,7 @@ def capacity_alerts(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check access
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         messages.error(request, "You don't have access to this board.")
         return redirect('dashboard')
     
@@ -166,7 +169,7 @@ def acknowledge_alert(request, board_id, alert_id):
     alert = get_object_or_404(TeamCapacityAlert, id=alert_id, board=board)
     
     # Check access
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
     
     if request.method == 'POST':
@@ -219,7 +222,7 @@ def recommendation_detail(request, board_id, rec_id):
     recommendation = get_object_or_404(WorkloadDistributionRecommendation, id=rec_id, board=board)
     
     # Check access
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         messages.error(request, "You don't have access to this board.")
         return redirect('dashboard')
     
@@ -300,7 +303,7 @@ def team_capacity_chart(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check access
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
     
     # Get latest forecasts
@@ -326,7 +329,7 @@ def task_assignment_suggestion(request, board_id, task_id):
     task = get_object_or_404(Task, id=task_id, column__board=board)
     
     # Check access
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return JsonResponse({'success': False, 'error': 'Access denied'}, status=403)
     
     # Find optimal assignee
@@ -13,9 +13,13 @@ class BoardForm(forms.ModelForm):
 class ColumnForm(forms.ModelForm):
     class Meta:
         model = Column
-        fields = ['name']
+        fields = ['name', 'is_terminal']
+        labels = {
+            'is_terminal': 'Completion column',
+        }
         widgets = {
             'name': forms.TextInput(attrs={'class': 'form-control'}),
+            'is_terminal': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
         }
 
 class TaskLabelForm(forms.ModelForm):
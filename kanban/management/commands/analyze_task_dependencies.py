@@ -3,10 +3,18 @@
 Management command to analyze tasks for suggested dependencies
 """
 
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from django.core.management.base import BaseCommand, CommandError
-from django.db.models import Q
+from django.db import connections
 from kanban.models import Task, Board
-from kanban.utils.dependency_suggestions import analyze_and_suggest_dependencies
+from kanban.utils.dependency_suggestions import analyze_board_dependencies
+
+
+def _init_worker():
+    # Spawned workers start without Django; forked ones already have it set up
+    import django
+    django.setup()
 
 
 class Command(BaseCommand):
@@ -28,54 +36,86 @@ class Command(BaseCommand):
             action='store_true',
             help='Automatically create links to top suggestions'
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only analyze tasks edited since their last analysis'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Analyze boards in this many worker processes (default: 1, in this process)'
+        )
 
     def handle(self, *args, **options):
         board_id = options.get('board_id')
         task_id = options.get('task_id')
         auto_link = options.get('auto_link', False)
+        incremental = options.get('incremental', False)
+        workers = options.get('workers') or 1
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
 
-        # Get tasks to analyze
+        # Boards to analyze; each board is analyzed against one similarity index
+        task_ids = None
         if task_id:
-            try:
-                tasks = Task.objects.filter(id=task_id)
-                if not tasks.exists():
-                    raise CommandError(f"Task with ID {task_id} not found")
-            except Task.DoesNotExist:
+            board_ids = list(Task.objects.filter(id=task_id).values_list('column__board_id', flat=True))
+            if not board_ids:
                 raise CommandError(f"Task with ID {task_id} not found")
+            task_ids = [task_id]
         elif board_id:
             try:
                 board = Board.objects.get(id=board_id)
-                tasks = Task.objects.filter(column__board=board)
-                self.stdout.write(f"Analyzing {tasks.count()} tasks in board: {board.name}")
             except Board.DoesNotExist:
                 raise CommandError(f"Board with ID {board_id} not found")
+            board_ids = [board.id]
+            self.stdout.write(f"Analyzing tasks in board: {board.name}")
         else:
-            tasks = Task.objects.all()
-            self.stdout.write(f"Analyzing all {tasks.count()} tasks")
+            board_ids = list(Board.objects.filter(columns__tasks__isnull=False).distinct().values_list('id', flat=True))
+            self.stdout.write(f"Analyzing tasks in {len(board_ids)} boards")
 
-        # Analyze each task
-        analyzed_count = 0
-        for task in tasks:
-            try:
-                board = task.column.board if task.column else None
-                result = analyze_and_suggest_dependencies(task, board, auto_link)
-                
-                parent_suggestions = len(result.get('parent_suggestions', []))
-                related_suggestions = len(result.get('related_suggestions', []))
-                confidence = result.get('confidence', 0)
-                
-                self.stdout.write(
-                    f"✓ Task '{task.title}': "
-                    f"Found {parent_suggestions} parent suggestions, "
-                    f"{related_suggestions} related tasks (confidence: {confidence})"
-                )
-                
-                analyzed_count += 1
-            except Exception as e:
-                self.stdout.write(
-                    self.style.ERROR(f"✗ Error analyzing task '{task.title}': {str(e)}")
-                )
+        jobs = [(board, task_ids, incremental, auto_link) for board in board_ids]
+        started = time.monotonic()
+        totals = {'analyzed': 0, 'skipped': 0, 'linked': 0, 'errors': 0}
+
+        if workers == 1 or len(jobs) == 1:
+            for done, job in enumerate(jobs, start=1):
+                try:
+                    counts = analyze_board_dependencies(*job)
+                except Exception as e:
+                    counts = e
+                self._report(done, len(jobs), job[0], counts, totals)
+        else:
+            # Workers open their own connections rather than sharing the parent's
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                futures = {executor.submit(analyze_board_dependencies, *job): job[0] for job in jobs}
+                for done, future in enumerate(as_completed(futures), start=1):
+                    try:
+                        counts = future.result()
+                    except Exception as e:
+                        counts = e
+                    self._report(done, len(jobs), futures[future], counts, totals)
+
+        elapsed = time.monotonic() - started
+        rate = totals['analyzed'] / elapsed if elapsed else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nSuccessfully analyzed {totals['analyzed']} tasks in {elapsed:.1f}s ({rate:.1f} tasks/s); "
+                f"skipped {totals['skipped']} unchanged, linked {totals['linked']}, {totals['errors']} errors"
+            )
+        )
 
+    def _report(self, done, total, board_id, counts, totals):
+        """Print a finished board's counts (or error) and add them to totals"""
+        if isinstance(counts, Exception):
+            totals['errors'] += 1
+            self.stdout.write(self.style.ERROR(f"✗ [{done}/{total}] Error analyzing board {board_id}: {str(counts)}"))
+            return
+        for key in totals:
+            totals[key] += counts[key]
         self.stdout.write(
-            self.style.SUCCESS(f"\nSuccessfully analyzed {analyzed_count} tasks")
+            f"✓ [{done}/{total}] {counts['board_name']}: "
+            f"{counts['analyzed']} analyzed, {counts['skipped']} skipped, {counts['errors']} errors"
         )
@@ -0,0 +1,34 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from kanban.models import Board
+from kanban.utils.flow_metrics_service import FlowMetricsService
+
+class Command(BaseCommand):
+    help = 'Rebuilds daily flow metrics (cumulative flow, burndown, throughput) from task activity history'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board_id', type=int, help='The ID of the board to backfill (optional)')
+        parser.add_argument('--days', type=int, help='Only rebuild this many most recent days (default: full history)')
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options['board_id']:
+            boards = boards.filter(id=options['board_id'])
+            if not boards.exists():
+                self.stdout.write(self.style.ERROR(f"Board with ID {options['board_id']} not found"))
+                return
+
+        # Moves recorded before activities carried column ids
+        linked = FlowMetricsService.link_move_activities(board_id=options['board_id'])
+        self.stdout.write(f'Linked {linked} move activities to their columns')
+
+        start = None
+        if options['days']:
+            start = timezone.localdate() - timedelta(days=options['days'] - 1)
+
+        for board in boards.iterator():
+            days = FlowMetricsService(board).rebuild(start=start)
+            self.stdout.write(f'{board.name}: {days} days')
+
+        self.stdout.write(self.style.SUCCESS('Flow metrics backfilled'))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from kanban.models import Board, Column
+from kanban.utils.position_service import TaskPositionService
+
+class Command(BaseCommand):
+    help = 'Respaces task positions so drag-and-drop moves can insert between any two tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board_id', type=int, help='The ID of the board to rebalance (optional)')
+
+    def handle(self, *args, **options):
+        columns = Column.objects.all()
+        if options['board_id']:
+            if not Board.objects.filter(id=options['board_id']).exists():
+                self.stdout.write(self.style.ERROR(f"Board with ID {options['board_id']} not found"))
+                return
+            columns = columns.filter(board_id=options['board_id'])
+
+        tasks_updated = 0
+        for column in columns:
+            tasks_updated += TaskPositionService(column).rebalance()
+
+        self.stdout.write(self.style.SUCCESS(f'Rebalanced {columns.count()} columns ({tasks_updated} tasks updated)'))
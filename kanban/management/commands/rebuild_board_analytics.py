@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from kanban.models import Board
+from kanban.utils.board_analytics_service import BoardAnalyticsService
+
+class Command(BaseCommand):
+    help = 'Recomputes board analytics snapshots from scratch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board_id', type=int, help='The ID of the board to rebuild (optional)')
+
+    def handle(self, *args, **options):
+        boards = Board.objects.all()
+        if options['board_id']:
+            boards = boards.filter(id=options['board_id'])
+            if not boards.exists():
+                self.stdout.write(self.style.ERROR(f"Board with ID {options['board_id']} not found"))
+                return
+
+        count = 0
+        for board in boards.iterator():
+            BoardAnalyticsService(board).refresh()
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt analytics for {count} boards'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from kanban.models import Board
+from kanban.utils.cycle_time_service import CycleTimeService
+
+class Command(BaseCommand):
+    help = 'Recomputes lead and cycle times of completed tasks from their move activity'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board_id', type=int, help='The ID of the board to rebuild (optional)')
+
+    def handle(self, *args, **options):
+        if options['board_id'] and not Board.objects.filter(id=options['board_id']).exists():
+            self.stdout.write(self.style.ERROR(f"Board with ID {options['board_id']} not found"))
+            return
+
+        count = CycleTimeService.rebuild(board_id=options['board_id'])
+        self.stdout.write(self.style.SUCCESS(f'Recorded lead and cycle times for {count} completed tasks'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from kanban.models import Board
+from kanban.utils.task_search_service import TaskSearchService
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text task search index from the task table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board_id', type=int, help='The ID of the board to re-index (optional)')
+
+    def handle(self, *args, **options):
+        if TaskSearchService.backend() is None:
+            self.stdout.write(self.style.WARNING('This database has no full-text index; search uses substring matching'))
+            return
+
+        if options['board_id'] and not Board.objects.filter(id=options['board_id']).exists():
+            self.stdout.write(self.style.ERROR(f"Board with ID {options['board_id']} not found"))
+            return
+
+        tasks_indexed = TaskSearchService.rebuild(board_id=options['board_id'])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {tasks_indexed} tasks'))
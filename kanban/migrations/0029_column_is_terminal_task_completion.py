@@ -0,0 +1,58 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:30
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_completion_state(apps, schema_editor):
+    """Mark existing 'done' columns as terminal and flag the tasks inside them"""
+    Column = apps.get_model('kanban', 'Column')
+    Task = apps.get_model('kanban', 'Task')
+    
+    Column.objects.filter(name__icontains='done').update(is_terminal=True)
+    # updated_at is the best available approximation of when existing tasks were completed
+    Task.objects.filter(column__is_terminal=True).update(is_done=True, completed_at=F('updated_at'))
+
+
+def clear_completion_state(apps, schema_editor):
+    Column = apps.get_model('kanban', 'Column')
+    Task = apps.get_model('kanban', 'Task')
+    
+    Column.objects.update(is_terminal=False)
+    Task.objects.update(is_done=False, completed_at=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0028_task_dependencies_task_start_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='column',
+            name='is_terminal',
+            field=models.BooleanField(db_index=True, default=False, help_text="Tasks in this column count as completed (new columns named 'Done' are marked automatically)"),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='completed_at',
+            field=models.DateTimeField(blank=True, db_index=True, help_text='When the task last entered a completion column', null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='is_done',
+            field=models.BooleanField(db_index=True, default=False, help_text='Whether the task is in a completion column'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'is_done'], name='kanban_task_assigne_736b32_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['is_done', 'due_date'], name='kanban_task_is_done_40a75f_idx'),
+        ),
+        migrations.RunPython(backfill_completion_state, clear_completion_state),
+    ]
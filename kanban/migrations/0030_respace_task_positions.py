@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+POSITION_GAP = 1024
+
+
+def respace_task_positions(apps, schema_editor):
+    """Spread existing dense positions (0, 1, 2, ...) out so moves can insert between them"""
+    Task = apps.get_model('kanban', 'Task')
+    
+    changed = []
+    column_id, index = None, 0
+    for task in Task.objects.only('id', 'column_id', 'position').order_by('column_id', 'position', 'id'):
+        if task.column_id != column_id:
+            column_id, index = task.column_id, 0
+        index += 1
+        task.position = index * POSITION_GAP
+        changed.append(task)
+    Task.objects.bulk_update(changed, ['position'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0029_column_is_terminal_task_completion'),
+    ]
+
+    operations = [
+        migrations.RunPython(respace_task_positions, migrations.RunPython.noop),
+    ]
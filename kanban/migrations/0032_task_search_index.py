@@ -0,0 +1,66 @@
+# Generated by Django 5.2.3 on 2026-10-18 05:10
+
+from django.db import migrations
+
+# The SQL as of this migration; TaskSearchService keeps its own copy, so later
+# changes to the service do not alter what this migration does
+
+CREATE_SQL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS kanban_task_fts USING fts5("
+        "board_id UNINDEXED, title, description, tokenize = 'unicode61 remove_diacritics 2')",
+    ],
+    'postgresql': [
+        "CREATE TABLE IF NOT EXISTS kanban_task_fts ("
+        "task_id integer PRIMARY KEY, board_id integer NOT NULL, document tsvector NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS kanban_task_fts_document ON kanban_task_fts USING GIN (document)",
+        "CREATE INDEX IF NOT EXISTS kanban_task_fts_board ON kanban_task_fts (board_id)",
+    ],
+}
+
+POPULATE_SQL = {
+    'sqlite': (
+        "INSERT INTO kanban_task_fts (rowid, board_id, title, description) "
+        "SELECT t.id, c.board_id, t.title, COALESCE(t.description, '') "
+        "FROM kanban_task t JOIN kanban_column c ON c.id = t.column_id"
+    ),
+    'postgresql': (
+        "INSERT INTO kanban_task_fts (task_id, board_id, document) "
+        "SELECT t.id, c.board_id, "
+        "setweight(to_tsvector('simple', t.title), 'A') || "
+        "setweight(to_tsvector('simple', COALESCE(t.description, '')), 'B') "
+        "FROM kanban_task t JOIN kanban_column c ON c.id = t.column_id"
+    ),
+}
+
+DROP_SQL = "DROP TABLE IF EXISTS kanban_task_fts"
+
+
+def create_search_index(apps, schema_editor):
+    """Create the full-text index table for this database and index existing tasks"""
+    conn = schema_editor.connection
+    if conn.vendor not in CREATE_SQL:
+        return
+    with conn.cursor() as cursor:
+        for sql in CREATE_SQL[conn.vendor]:
+            cursor.execute(sql)
+        cursor.execute(POPULATE_SQL[conn.vendor])
+
+
+def drop_search_index(apps, schema_editor):
+    conn = schema_editor.connection
+    if conn.vendor not in CREATE_SQL:
+        return
+    with conn.cursor() as cursor:
+        cursor.execute(DROP_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0031_aijob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
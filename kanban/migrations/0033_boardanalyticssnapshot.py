@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-18 05:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0032_task_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardAnalyticsSnapshot',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='analytics_snapshot', serialize=False, to='kanban.board')),
+                ('data', models.JSONField(default=dict, help_text='Counters and chart series (see BoardAnalyticsService.compute)')),
+                ('as_of', models.DateField(help_text='Day the date-relative counters (overdue, upcoming, last 30 days) refer to')),
+                ('computed_at', models.DateTimeField()),
+                ('stale_since', models.DateTimeField(blank=True, help_text='First task or column change not reflected in the data yet', null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.3 on 2026-10-18 05:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0033_boardanalyticssnapshot'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardFlowDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('total_tasks', models.IntegerField(default=0, help_text='Tasks on the board at the end of the day')),
+                ('done_tasks', models.IntegerField(default=0, help_text='Tasks in completion columns at the end of the day')),
+                ('created_count', models.IntegerField(default=0, help_text='Tasks created during the day')),
+                ('completed_count', models.IntegerField(default=0, help_text='Tasks that entered a completion column during the day')),
+            ],
+            options={
+                'ordering': ['board', 'date'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ColumnFlowDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('task_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['board', 'date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='taskactivity',
+            name='from_column',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='kanban.column'),
+        ),
+        migrations.AddField(
+            model_name='taskactivity',
+            name='to_column',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='kanban.column'),
+        ),
+        migrations.AddIndex(
+            model_name='taskactivity',
+            index=models.Index(fields=['activity_type', 'created_at'], name='kanban_task_activit_39b2ec_idx'),
+        ),
+        migrations.AddField(
+            model_name='boardflowday',
+            name='board',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='flow_days', to='kanban.board'),
+        ),
+        migrations.AddField(
+            model_name='columnflowday',
+            name='board',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='column_flow_days', to='kanban.board'),
+        ),
+        migrations.AddField(
+            model_name='columnflowday',
+            name='column',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='flow_days', to='kanban.column'),
+        ),
+        migrations.AddConstraint(
+            model_name='boardflowday',
+            constraint=models.UniqueConstraint(fields=('board', 'date'), name='unique_board_flow_day'),
+        ),
+        migrations.AddIndex(
+            model_name='columnflowday',
+            index=models.Index(fields=['board', 'date'], name='kanban_colu_board_i_ac6ffb_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='columnflowday',
+            constraint=models.UniqueConstraint(fields=('column', 'date'), name='unique_column_flow_day'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.3 on 2026-10-18 05:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0034_flow_metrics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskFlowTime',
+            fields=[
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='flow_time', serialize=False, to='kanban.task')),
+                ('started_at', models.DateTimeField(blank=True, help_text="When work started: first move out of the board's first column", null=True)),
+                ('completed_at', models.DateTimeField()),
+                ('lead_time_hours', models.FloatField(help_text='Hours from creation to completion')),
+                ('cycle_time_hours', models.FloatField(blank=True, help_text='Hours from start to completion', null=True)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_flow_times', to='kanban.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'completed_at'], name='kanban_task_board_i_9a7f66_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
 from colorfield.fields import ColorField
 from accounts.models import Organization
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -19,12 +20,40 @@ class Column(models.Model):
     name = models.CharField(max_length=100)
     board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='columns')
     position = models.IntegerField(default=0)
+    is_terminal = models.BooleanField(
+        default=False,
+        db_index=True,
+        help_text="Tasks in this column count as completed (new columns named 'Done' are marked automatically)"
+    )
     
     class Meta:
         ordering = ['position']
     
     def __str__(self):
         return f"{self.name} - {self.board.name}"
+    
+    @staticmethod
+    def is_terminal_name(name):
+        """Check if a column name conventionally marks completed work"""
+        return 'done' in (name or '').lower()
+    
+    def save(self, *args, **kwargs):
+        """Infer the completion flag for new columns and sync tasks when it changes"""
+        previous = None
+        if self._state.adding:
+            if not self.is_terminal:
+                self.is_terminal = Column.is_terminal_name(self.name)
+        else:
+            previous = Column.objects.filter(pk=self.pk).values_list('is_terminal', flat=True).first()
+        
+        super().save(*args, **kwargs)
+        
+        if previous is not None and previous != self.is_terminal:
+            # Keep the denormalized task completion state in one UPDATE
+            self.tasks.update(
+                is_done=self.is_terminal,
+                completed_at=timezone.now() if self.is_terminal else None
+            )
 
 class TaskLabel(models.Model):
     CATEGORY_CHOICES = [
@@ -61,6 +90,12 @@ class Task(models.Model):
     labels = models.ManyToManyField(TaskLabel, related_name='tasks', blank=True)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES, default='medium')
     progress = models.IntegerField(default=0, validators=[MinValueValidator(0), MaxValueValidator(100)])
+    
+    # Completion state (denormalized from Column.is_terminal for indexed analytics)
+    is_done = models.BooleanField(default=False, db_index=True,
+                                  help_text="Whether the task is in a completion column")
+    completed_at = models.DateTimeField(blank=True, null=True, db_index=True,
+                                        help_text="When the task last entered a completion column")
       # AI Analysis Results
     ai_risk_score = models.IntegerField(blank=True, null=True, validators=[MinValueValidator(0), MaxValueValidator(100)],
                                       help_text="AI-calculated risk score (0-100)")
@@ -215,10 +250,28 @@ class Task(models.Model):
     
     class Meta:
         ordering = ['position']
+        indexes = [
+            models.Index(fields=['assigned_to', 'is_done']),
+            models.Index(fields=['is_done', 'due_date']),
+        ]
     
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        """Keep the denormalized completion state in sync with the task's column"""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'column' in update_fields:
+            is_done = self.column.is_terminal
+            if is_done and not (self.is_done and self.completed_at):
+                self.completed_at = timezone.now()
+            elif not is_done:
+                self.completed_at = None
+            self.is_done = is_done
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'is_done', 'completed_at'}
+        super().save(*args, **kwargs)
+    
     def duration_days(self):
         """Calculate task duration in days"""
         if self.start_date and self.due_date:
@@ -229,46 +282,30 @@ class Task(models.Model):
     
     def get_all_subtasks(self):
         """Get all subtasks recursively"""
-        subtasks = list(self.subtasks.all())
-        for subtask in subtasks:
-            subtasks.extend(subtask.get_all_subtasks())
-        return subtasks
+        from kanban.utils.task_hierarchy_service import TaskHierarchyService
+        return TaskHierarchyService.descendants(self)
     
     def get_all_parent_tasks(self):
         """Get all parent tasks up the hierarchy"""
-        parents = []
-        current = self.parent_task
-        while current:
-            parents.append(current)
-            current = current.parent_task
-        return parents
+        from kanban.utils.task_hierarchy_service import TaskHierarchyService
+        return TaskHierarchyService.ancestors(self)
     
     def get_dependency_level(self):
         """Get the nesting level of this task in the hierarchy"""
-        level = 0
-        current = self.parent_task
-        while current:
-            level += 1
-            current = current.parent_task
-        return level
+        from kanban.utils.task_hierarchy_service import TaskHierarchyService
+        return TaskHierarchyService.depth(self)
     
     def has_circular_dependency(self, potential_parent):
         """Check if setting a parent would create a circular dependency"""
-        if potential_parent is None:
-            return False
-        if potential_parent == self:
-            return True
-        return self in potential_parent.get_all_parent_tasks() or potential_parent in self.get_all_subtasks()
+        from kanban.utils.task_hierarchy_service import TaskHierarchyService
+        return TaskHierarchyService.would_create_cycle(self, potential_parent)
     
     def update_dependency_chain(self):
-        """Update the dependency chain based on parent relationships"""
-        chain = []
-        current = self
-        while current:
-            chain.insert(0, current.id)
-            current = current.parent_task
-        self.dependency_chain = chain
+        """Save the task and rebuild the dependency chains of it and all its subtasks"""
+        from kanban.utils.task_hierarchy_service import TaskHierarchyService
+        self.dependency_chain = TaskHierarchyService.chain(self.parent_task_id, self.id)
         self.save()
+        TaskHierarchyService.update_descendant_chains(self)
 
 class Comment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='comments')
@@ -298,10 +335,16 @@ class TaskActivity(models.Model):
     activity_type = models.CharField(max_length=20, choices=ACTIVITY_CHOICES)
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Structured source/target of 'moved' activities (used by the flow metrics)
+    from_column = models.ForeignKey(Column, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    to_column = models.ForeignKey(Column, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
     
     class Meta:
         ordering = ['-created_at']
         verbose_name_plural = 'Task Activities'
+        indexes = [
+            models.Index(fields=['activity_type', 'created_at']),
+        ]
     
     def __str__(self):
         return f"{self.activity_type} by {self.user.username} on {self.task.title}"
@@ -551,3 +594,130 @@ class TaskFile(models.Model):
         """Validate file type"""
         ext = filename.split('.')[-1].lower()
         return ext in TaskFile.ALLOWED_FILE_TYPES
+
+
+class AIJob(models.Model):
+    """A long-running AI analysis executed by a Celery worker instead of the web request"""
+    KIND_CHOICES = [
+        ('workflow_optimization', 'Workflow Optimization'),
+        ('critical_path', 'Critical Path Analysis'),
+        ('project_timeline', 'Project Timeline'),
+        ('transcript_extraction', 'Transcript Task Extraction'),
+        ('task_risk', 'Task Risk Score'),
+    ]
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+    
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='ai_jobs')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='ai_jobs', null=True, blank=True)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='ai_jobs', null=True, blank=True)
+    params = models.JSONField(default=dict, blank=True, help_text="Inputs the job was queued with")
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} job {self.id} ({self.status})"
+    
+    @property
+    def is_finished(self):
+        return self.status in ('succeeded', 'failed')
+    
+    def as_dict(self):
+        """JSON-safe status for polling and WebSocket completion events"""
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error or None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class BoardAnalyticsSnapshot(models.Model):
+    """Precomputed board analytics, served by the analytics page and the AI summary"""
+    board = models.OneToOneField(Board, on_delete=models.CASCADE, primary_key=True, related_name='analytics_snapshot')
+    data = models.JSONField(default=dict, help_text="Counters and chart series (see BoardAnalyticsService.compute)")
+    as_of = models.DateField(help_text="Day the date-relative counters (overdue, upcoming, last 30 days) refer to")
+    computed_at = models.DateTimeField()
+    stale_since = models.DateTimeField(null=True, blank=True,
+                                       help_text="First task or column change not reflected in the data yet")
+    
+    def __str__(self):
+        return f"Analytics for {self.board.name} ({self.computed_at:%Y-%m-%d %H:%M})"
+
+
+class BoardFlowDay(models.Model):
+    """End-of-day task totals of a board (burndown/burnup and throughput series)"""
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='flow_days')
+    date = models.DateField()
+    total_tasks = models.IntegerField(default=0, help_text="Tasks on the board at the end of the day")
+    done_tasks = models.IntegerField(default=0, help_text="Tasks in completion columns at the end of the day")
+    created_count = models.IntegerField(default=0, help_text="Tasks created during the day")
+    completed_count = models.IntegerField(default=0, help_text="Tasks that entered a completion column during the day")
+    
+    class Meta:
+        ordering = ['board', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'date'], name='unique_board_flow_day'),
+        ]
+    
+    def __str__(self):
+        return f"{self.board.name} on {self.date}"
+
+
+class ColumnFlowDay(models.Model):
+    """End-of-day task count of one column (cumulative flow diagram series)"""
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='column_flow_days')
+    column = models.ForeignKey(Column, on_delete=models.CASCADE, related_name='flow_days')
+    date = models.DateField()
+    task_count = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['board', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['column', 'date'], name='unique_column_flow_day'),
+        ]
+        indexes = [
+            models.Index(fields=['board', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.column.name} on {self.date}: {self.task_count}"
+
+
+class TaskFlowTime(models.Model):
+    """Lead and cycle time of a completed task (see CycleTimeService)"""
+    task = models.OneToOneField(Task, on_delete=models.CASCADE, primary_key=True, related_name='flow_time')
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='task_flow_times')
+    started_at = models.DateTimeField(null=True, blank=True,
+                                      help_text="When work started: first move out of the board's first column")
+    completed_at = models.DateTimeField()
+    lead_time_hours = models.FloatField(help_text="Hours from creation to completion")
+    cycle_time_hours = models.FloatField(null=True, blank=True, help_text="Hours from start to completion")
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['board', 'completed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.task.title}: lead {self.lead_time_hours:.1f}h"
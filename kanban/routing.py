@@ -0,0 +1,6 @@
+from django.urls import path
+from kanban import consumers
+
+websocket_urlpatterns = [
+    path('ws/board/<int:board_id>/', consumers.BoardConsumer.as_asgi()),
+]
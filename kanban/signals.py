@@ -0,0 +1,100 @@
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Board, Column, Task
+from .utils.board_access_service import BoardAccessService
+from .utils.task_search_service import TaskSearchService
+from .utils.board_analytics_service import BoardAnalyticsService
+from .utils.cycle_time_service import CycleTimeService
+from .utils.task_similarity_service import TaskSimilarityService
+
+
+@receiver(m2m_changed, sender=Board.members.through)
+def invalidate_member_access(sender, instance, action, reverse, pk_set, **kwargs):
+    """Forget cached accessible boards for users joining or leaving boards"""
+    if action in ('post_add', 'post_remove'):
+        BoardAccessService.invalidate([instance.id] if reverse else pk_set)
+    elif action == 'pre_clear' and not reverse:
+        BoardAccessService.invalidate(list(instance.members.values_list('id', flat=True)))
+    elif action == 'post_clear' and reverse:
+        BoardAccessService.invalidate([instance.id])
+
+
+@receiver(post_save, sender=Board)
+def invalidate_creator_access(sender, instance, **kwargs):
+    """The creator can always open the board (also covers a changed creator)"""
+    BoardAccessService.invalidate([instance.created_by_id])
+
+
+@receiver(pre_delete, sender=Board)
+def invalidate_deleted_board_access(sender, instance, **kwargs):
+    """Drop a deleted board from its creator's and members' cached boards"""
+    BoardAccessService.invalidate(
+        [instance.created_by_id] + list(instance.members.values_list('id', flat=True))
+    )
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the full-text search index in step with task titles and descriptions"""
+    # Position, progress and analysis saves leave the indexed text alone
+    if not raw and (update_fields is None or TaskSearchService.INDEXED_FIELDS & set(update_fields)):
+        TaskSearchService.index_task(instance)
+
+
+@receiver(post_delete, sender=Task)
+def unindex_task(sender, instance, **kwargs):
+    TaskSearchService.remove_task(instance.id)
+
+
+@receiver(post_save, sender=Task)
+def task_saved_analytics(sender, instance, raw=False, **kwargs):
+    """Queue a rebuild of the board's analytics snapshot"""
+    if not raw:
+        BoardAnalyticsService.mark_stale(instance.column.board_id)
+
+
+@receiver(post_save, sender=Task)
+def task_created_done(sender, instance, created, raw=False, **kwargs):
+    """Tasks created straight into a completion column never move there"""
+    if created and instance.is_done and not raw:
+        CycleTimeService.update_tasks([instance.id])
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_analytics(sender, instance, **kwargs):
+    BoardAnalyticsService.mark_stale(
+        Column.objects.filter(id=instance.column_id).values_list('board_id', flat=True).first()
+    )
+
+
+@receiver(m2m_changed, sender=Task.labels.through)
+def task_labels_changed_analytics(sender, instance, action, reverse, **kwargs):
+    """Lean Six Sigma counts depend on task labels"""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        BoardAnalyticsService.mark_stale(instance.board_id if reverse else instance.column.board_id)
+
+
+@receiver(post_save, sender=Column)
+@receiver(post_delete, sender=Column)
+def column_changed_analytics(sender, instance, **kwargs):
+    BoardAnalyticsService.mark_stale(instance.board_id)
+
+
+@receiver(post_save, sender=Task)
+def task_saved_similarity(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Rebuild the board's similarity index after text or placement changes"""
+    if not raw and (update_fields is None or TaskSimilarityService.INDEXED_FIELDS & set(update_fields)):
+        TaskSimilarityService.invalidate(instance.column.board_id)
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted_similarity(sender, instance, **kwargs):
+    TaskSimilarityService.invalidate(
+        Column.objects.filter(id=instance.column_id).values_list('board_id', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Column)
+@receiver(post_delete, sender=Column)
+def column_changed_similarity(sender, instance, **kwargs):
+    TaskSimilarityService.invalidate(instance.board_id)
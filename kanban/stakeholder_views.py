@@ -15,6 +15,7 @@ import csv
 import json
 
 from .models import Board, Task
+from .utils.board_access_service import BoardAccessService
 from .stakeholder_models import (
     ProjectStakeholder, StakeholderTaskInvolvement,
     StakeholderEngagementRecord, EngagementMetrics, StakeholderTag
@@ -29,7 +30,7 @@ from .stakeholder_forms import (
 def check_board_access(user, board_id):
     """Helper function to check if user has access to board"""
     board = get_object_or_404(Board, id=board_id)
-    if board.created_by != user and user not in board.members.all():
+    if not BoardAccessService.can_access(user, board):
         return None
     return board
 
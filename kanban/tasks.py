@@ -0,0 +1,47 @@
+"""
+Background tasks for the kanban app
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def rebalance_column_positions(column_id):
+    """Respace the task positions of a column whose gaps are running out"""
+    from kanban.models import Column
+    from kanban.utils.position_service import TaskPositionService
+
+    column = Column.objects.filter(id=column_id).first()
+    if not column:
+        return 0
+    return TaskPositionService(column).rebalance()
+
+
+@shared_task(ignore_result=True, soft_time_limit=5 * 60)
+def run_ai_job(job_id):
+    """Run a queued AI analysis (see AIJobService); the AIJob row holds the outcome"""
+    from kanban.utils.ai_job_service import AIJobService
+
+    job = AIJobService.run(job_id)
+    return job.status if job else None
+
+
+@shared_task(ignore_result=True)
+def refresh_board_analytics(board_id):
+    """Rebuild a board's analytics snapshot after a burst of task changes"""
+    from kanban.models import Board
+    from kanban.utils.board_analytics_service import BoardAnalyticsService
+
+    board = Board.objects.filter(id=board_id).first()
+    if board:
+        BoardAnalyticsService(board).refresh()
+
+
+@shared_task(ignore_result=True, soft_time_limit=30 * 60)
+def record_flow_metrics():
+    """Refresh the daily flow metric rows of every board (scheduled in CELERY_BEAT_SCHEDULE)"""
+    from kanban.models import Board
+    from kanban.utils.flow_metrics_service import FlowMetricsService
+
+    for board in Board.objects.iterator():
+        FlowMetricsService(board).record_recent()
@@ -1,9 +1,18 @@
 # filepath: c:\Users\Avishek Paul\TaskFlow\kanban\tests.py
 import json
-from datetime import datetime, timedelta
-from django.test import TestCase, TransactionTestCase
-from django.contrib.auth.models import User
+import time
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
 from rest_framework.test import APITestCase, APIClient
@@ -11,8 +20,25 @@ from rest_framework import status
 from unittest.mock import patch, MagicMock
 
 # Import models from kanban app
-from .models import Board, Column, Task, Comment, TaskLabel, TaskActivity
+from .models import Board, BoardAnalyticsSnapshot, BoardFlowDay, Column, ColumnFlowDay, Task, Comment, TaskLabel, TaskActivity, TaskFlowTime
+from .models import ResourceDemandForecast, TaskFile, TeamCapacityAlert
 from accounts.models import Organization, UserProfile
+from .utils.position_service import TaskPositionService
+from .utils.board_access_service import BoardAccessService
+from .utils.task_search_service import TaskSearchService
+from .utils.board_export_service import BoardExportService
+from .utils.board_import_service import BoardImportService
+from .utils.board_analytics_service import BoardAnalyticsService
+from .utils.flow_metrics_service import FlowMetricsService
+from .utils.cycle_time_service import CycleTimeService, percentile
+from .utils.critical_path_service import CriticalPathService
+from .utils.dependency_suggestions import (
+    DependencyAnalyzer, DependencyGraphGenerator, TaskGraph, analyze_and_suggest_dependencies,
+    analyze_board_dependencies
+)
+from .utils.task_similarity_service import TaskSimilarityService
+from .utils.forecasting_service import DemandForecastingService, ThroughputForecaster
+from .tasks import refresh_board_analytics
 
 
 class BoardTestCase(TestCase):
@@ -669,6 +695,223 @@ class TaskProgressTestCase(TestCase):
         self.assertEqual(progress_activities.count(), 4)
 
 
+class TaskCompletionStateTestCase(TestCase):
+    """Test the explicit completion column flag and indexed task completion state"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='completionuser', password='pass123')
+        self.organization = Organization.objects.create(name='Completion Org', domain='completion.com', created_by=self.user)
+        self.board = Board.objects.create(name='Completion Board', organization=self.organization, created_by=self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.shipped = Column.objects.create(board=self.board, name='Shipped', position=1, is_terminal=True)
+
+    def test_terminal_flag_inferred_from_name(self):
+        """Test new columns named 'Done' are marked as completion columns"""
+        done = Column.objects.create(board=self.board, name='Done', position=2)
+        self.assertTrue(done.is_terminal)
+        self.assertFalse(self.todo.is_terminal)
+
+    def test_task_move_sets_completion_state(self):
+        """Test moving a task in and out of a completion column"""
+        task = Task.objects.create(title='Ship it', column=self.todo, created_by=self.user)
+        self.assertFalse(task.is_done)
+        self.assertIsNone(task.completed_at)
+
+        task.column = self.shipped
+        task.save(update_fields=['column'])
+        task.refresh_from_db()
+        self.assertTrue(task.is_done)
+        self.assertIsNotNone(task.completed_at)
+
+        task.column = self.todo
+        task.save()
+        task.refresh_from_db()
+        self.assertFalse(task.is_done)
+        self.assertIsNone(task.completed_at)
+
+    def test_column_flag_change_updates_tasks(self):
+        """Test toggling the column flag updates the tasks already in it"""
+        Task.objects.create(title='A', column=self.todo, created_by=self.user)
+        Task.objects.create(title='B', column=self.todo, created_by=self.user)
+
+        self.todo.is_terminal = True
+        self.todo.save()
+        self.assertEqual(Task.objects.filter(column=self.todo, is_done=True).count(), 2)
+
+        self.todo.is_terminal = False
+        self.todo.save()
+        self.assertFalse(Task.objects.filter(column=self.todo, is_done=True).exists())
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TaskPositionTestCase(TestCase):
+    """Test gapped task positions used by drag-and-drop moves"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='positionuser', password='pass123')
+        self.organization = Organization.objects.create(name='Position Org', domain='position.com', created_by=self.user)
+        self.board = Board.objects.create(name='Position Board', organization=self.organization, created_by=self.user)
+        self.board.members.add(self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.done = Column.objects.create(board=self.board, name='Done', position=1)
+        self.tasks = [
+            Task.objects.create(title=f'Task {i}', column=self.todo, created_by=self.user,
+                                position=(i + 1) * TaskPositionService.POSITION_GAP)
+            for i in range(5)
+        ]
+        self.client.force_login(self.user)
+
+    def _titles(self, column):
+        return list(Task.objects.filter(column=column).order_by('position', 'id').values_list('title', flat=True))
+
+    def _move(self, task, column, position):
+        return self.client.post(
+            reverse('move_task'),
+            data=json.dumps({'taskId': task.id, 'columnId': column.id, 'position': position}),
+            content_type='application/json',
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+    def test_move_writes_single_task(self):
+        """Test moving a task only updates the moved row"""
+        untouched = dict(Task.objects.exclude(id=self.tasks[4].id).values_list('id', 'updated_at'))
+
+        self.assertEqual(self._move(self.tasks[4], self.todo, 1).status_code, 200)
+
+        self.assertEqual(self._titles(self.todo), ['Task 0', 'Task 4', 'Task 1', 'Task 2', 'Task 3'])
+        self.assertEqual(dict(Task.objects.exclude(id=self.tasks[4].id).values_list('id', 'updated_at')), untouched)
+
+    def test_move_across_columns(self):
+        """Test moving into another column places the task at the requested index"""
+        self._move(self.tasks[0], self.done, 0)
+        self._move(self.tasks[1], self.done, 0)
+        self._move(self.tasks[2], self.done, 1)
+
+        self.assertEqual(self._titles(self.done), ['Task 1', 'Task 2', 'Task 0'])
+        self.assertEqual(self._titles(self.todo), ['Task 3', 'Task 4'])
+        self.assertTrue(Task.objects.get(id=self.tasks[2].id).is_done)
+
+    def test_exhausted_gap_rebalances_column(self):
+        """Test a move between adjacent positions respaces the column first"""
+        Task.objects.filter(id=self.tasks[1].id).update(position=self.tasks[0].position + 1)
+
+        self._move(self.tasks[4], self.todo, 1)
+
+        self.assertEqual(self._titles(self.todo), ['Task 0', 'Task 4', 'Task 1', 'Task 2', 'Task 3'])
+        positions = list(Task.objects.filter(column=self.todo).order_by('position').values_list('position', flat=True))
+        self.assertEqual(len(set(positions)), 5)
+
+    def test_reorder_multiple_tasks(self):
+        """Test the bulk move endpoint applies moves in order"""
+        response = self.client.post(
+            reverse('reorder_multiple_tasks'),
+            data=json.dumps({'boardId': self.board.id, 'tasks': [
+                {'taskId': self.tasks[3].id, 'columnId': self.done.id, 'position': 0},
+                {'taskId': self.tasks[4].id, 'columnId': self.done.id, 'position': 0},
+                {'taskId': self.tasks[0].id, 'columnId': self.todo.id, 'position': 2},
+            ]}),
+            content_type='application/json',
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._titles(self.done), ['Task 4', 'Task 3'])
+        self.assertEqual(self._titles(self.todo), ['Task 1', 'Task 2', 'Task 0'])
+        self.assertEqual(TaskActivity.objects.filter(activity_type='moved').count(), 2)
+
+
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+)
+class BoardConsumerTestCase(TransactionTestCase):
+    """Test real-time board sync over WebSockets"""
+
+    def _create_board(self):
+        user = User.objects.create_user(username='syncuser', password='pass123')
+        outsider = User.objects.create_user(username='outsider', password='pass123')
+        organization = Organization.objects.create(name='Sync Org', domain='sync.com', created_by=user)
+        board = Board.objects.create(name='Sync Board', organization=organization, created_by=user)
+        todo = Column.objects.create(board=board, name='To Do', position=0)
+        done = Column.objects.create(board=board, name='Done', position=1)
+        task = Task.objects.create(title='Sync me', column=todo, created_by=user, position=1024)
+        return user, outsider, board, done, task
+
+    def _communicator(self, user, board):
+        from channels.testing import WebsocketCommunicator
+        from .consumers import BoardConsumer
+
+        communicator = WebsocketCommunicator(BoardConsumer.as_asgi(), f'/ws/board/{board.id}/')
+        communicator.scope['user'] = user
+        communicator.scope['url_route'] = {'kwargs': {'board_id': board.id}}
+        return communicator
+
+    async def test_only_board_members_connect(self):
+        """Test non-members are rejected"""
+        from channels.db import database_sync_to_async
+
+        user, outsider, board, done, task = await database_sync_to_async(self._create_board)()
+
+        communicator = self._communicator(outsider, board)
+        connected, _ = await communicator.connect()
+        self.assertFalse(connected)
+
+        communicator = self._communicator(user, board)
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        await communicator.disconnect()
+
+    async def test_bursts_are_coalesced(self):
+        """Test a burst of diffs arrives as one frame with superseded diffs dropped"""
+        from channels.db import database_sync_to_async
+        from channels.layers import get_channel_layer
+        from .utils.board_events import board_group_name
+
+        user, outsider, board, done, task = await database_sync_to_async(self._create_board)()
+        communicator = self._communicator(user, board)
+        await communicator.connect()
+
+        channel_layer = get_channel_layer()
+        for progress in (10, 20, 30):
+            await channel_layer.group_send(board_group_name(board.id), {
+                'type': 'board_events',
+                'events': [{'event': 'task_progress', 'task_id': task.id, 'column_id': task.column_id, 'progress': progress}],
+                'actor_id': user.id,
+            })
+
+        frame = await communicator.receive_json_from(timeout=1)
+        self.assertEqual(frame['type'], 'board_update')
+        self.assertEqual([event['progress'] for event in frame['events']], [30])
+        self.assertTrue(await communicator.receive_nothing(timeout=0.3))
+        await communicator.disconnect()
+
+    async def test_move_task_broadcasts_diff(self):
+        """Test move_task pushes the new column and position to open boards"""
+        from asgiref.sync import sync_to_async
+        from channels.db import database_sync_to_async
+
+        user, outsider, board, done, task = await database_sync_to_async(self._create_board)()
+        communicator = self._communicator(user, board)
+        await communicator.connect()
+
+        await sync_to_async(self.client.force_login)(user)
+        response = await sync_to_async(self.client.post)(
+            reverse('move_task'),
+            data=json.dumps({'taskId': task.id, 'columnId': done.id, 'position': 0}),
+            content_type='application/json',
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        frame = await communicator.receive_json_from(timeout=1)
+        event = frame['events'][0]
+        self.assertEqual(event['event'], 'task_moved')
+        self.assertEqual(event['task_id'], task.id)
+        self.assertEqual(event['column_id'], done.id)
+        self.assertTrue(event['is_done'])
+        await communicator.disconnect()
+
+
 class LeanSixSigmaIntegrationTestCase(TestCase):
     """Test complete Lean Six Sigma integration workflow"""
     
@@ -789,6 +1032,1451 @@ class LeanSixSigmaIntegrationTestCase(TestCase):
         self.assertEqual(improvement_task.labels.filter(category='lean').count(), 3)
 
 
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class DashboardStatsTestCase(TestCase):
+    """Test the single-query dashboard statistics service"""
+    
+    def setUp(self):
+        from django.utils import timezone
+        
+        self.user = User.objects.create_user(username='dashuser', password='pass123')
+        self.organization = Organization.objects.create(name='Dash Org', domain='dash.com', created_by=self.user)
+        UserProfile.objects.create(user=self.user, organization=self.organization, completed_wizard=True)
+        self.board = Board.objects.create(name='Dash Board', organization=self.organization, created_by=self.user)
+        self.board.members.add(self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.done = Column.objects.create(board=self.board, name='Done', position=1)
+        
+        now = timezone.now()
+        Task.objects.create(column=self.todo, title='Overdue', created_by=self.user,
+                            assigned_to=self.user, due_date=now - timedelta(days=2))
+        Task.objects.create(column=self.todo, title='Due soon', created_by=self.user,
+                            due_date=now + timedelta(days=1))
+        Task.objects.create(column=self.done, title='Finished', created_by=self.user,
+                            assigned_to=self.user, due_date=now - timedelta(days=5))
+        
+        self.client.force_login(self.user)
+    
+    def _user_boards(self):
+        return Board.objects.filter(members=self.user).distinct()
+    
+    def test_counts_single_query(self):
+        """Test all counters are computed in one aggregate query"""
+        from kanban.utils.dashboard_service import DashboardStatsService
+        
+        service = DashboardStatsService(self.user, self._user_boards())
+        with self.assertNumQueries(1):
+            stats = service.get_counts()
+        
+        self.assertEqual(stats['task_count'], 3)
+        self.assertEqual(stats['completed_count'], 1)
+        self.assertEqual(stats['overdue_count'], 1)
+        self.assertEqual(stats['due_soon'], 1)
+        self.assertEqual(stats['my_tasks_count'], 1)
+        self.assertEqual(stats['remaining_tasks'], 2)
+        self.assertEqual(stats['completion_rate'], 33.3)
+    
+    def test_task_page_pagination(self):
+        """Test modal task lists are served page by page"""
+        from kanban.utils.dashboard_service import DashboardStatsService
+        
+        service = DashboardStatsService(self.user, self._user_boards())
+        first = service.get_task_page('all', 1, per_page=2)
+        second = service.get_task_page('all', 2, per_page=2)
+        
+        self.assertEqual(first['total'], 3)
+        self.assertTrue(first['has_next'])
+        self.assertFalse(second['has_next'])
+        self.assertEqual(len(first['tasks']) + len(second['tasks']), 3)
+        self.assertEqual([t['title'] for t in service.get_task_page('overdue')['tasks']], ['Overdue'])
+    
+    def test_dashboard_tasks_api(self):
+        """Test the paginated dashboard task list endpoint"""
+        response = self.client.get(reverse('dashboard_tasks_api', args=['completed']))
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['total'], 1)
+        self.assertEqual(data['tasks'][0]['title'], 'Finished')
+        
+        response = self.client.get(reverse('dashboard_tasks_api', args=['bogus']))
+        self.assertEqual(response.status_code, 404)
+    
+    def test_dashboard_query_count_constant(self):
+        """Benchmark: dashboard query count does not grow with boards or tasks"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as small:
+            self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+        
+        for i in range(10):
+            board = Board.objects.create(name=f'Extra {i}', organization=self.organization, created_by=self.user)
+            board.members.add(self.user)
+            column = Column.objects.create(board=board, name='Done', position=0)
+            Task.objects.bulk_create([
+                Task(column=column, title=f'Task {j}', created_by=self.user) for j in range(20)
+            ])
+        
+        with CaptureQueriesContext(connection) as large:
+            self.assertEqual(self.client.get(reverse('dashboard')).status_code, 200)
+        
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+
+class AsyncAIClientTestCase(SimpleTestCase):
+    """Test the async and sync Gemini call wrappers"""
+
+    class FakeModel:
+        """Stands in for a GenerativeModel, failing the first `failures` calls"""
+
+        def __init__(self, failures=0, delay=0):
+            self.failures = failures
+            self.delay = delay
+            self.calls = 0
+            self.running = 0
+            self.max_running = 0
+
+        def generate_content(self, prompt, request_options=None):
+            import time
+            from google.api_core import exceptions as google_exceptions
+
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                time.sleep(self.delay)
+                if self.calls <= self.failures:
+                    raise google_exceptions.ResourceExhausted('rate limited')
+                return MagicMock(text=f'  {prompt} done  ')
+            finally:
+                self.running -= 1
+
+        async def generate_content_async(self, prompt, request_options=None):
+            import asyncio
+            from google.api_core import exceptions as google_exceptions
+
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(self.delay)
+                if self.calls <= self.failures:
+                    raise google_exceptions.ServiceUnavailable('overloaded')
+                return MagicMock(text=f'  {prompt} done  ')
+            finally:
+                self.running -= 1
+
+    @patch('kanban.utils.ai_utils.retry_delay', return_value=0)
+    async def test_retries_transient_errors(self, _delay):
+        """Test overloaded responses are retried until one succeeds"""
+        from google.api_core import exceptions as google_exceptions
+        from .utils.ai_utils import generate_content_async
+
+        model = self.FakeModel(failures=2)
+        response = await generate_content_async(model, 'summarize')
+        self.assertEqual(response.text.strip(), 'summarize done')
+        self.assertEqual(model.calls, 3)
+
+        with self.assertRaises(google_exceptions.ServiceUnavailable):
+            await generate_content_async(self.FakeModel(failures=5), 'summarize')
+
+    @override_settings(AI_ASSISTANT_CONFIG={'RESPONSE_TIMEOUT': 1, 'MAX_CONCURRENT_REQUESTS': 2, 'MAX_RETRIES': 0})
+    async def test_limits_concurrency_and_times_out(self):
+        """Test concurrent calls are capped and slow calls are cut off"""
+        import asyncio
+        from .utils.ai_utils import _ai_semaphores, generate_content_async
+
+        _ai_semaphores.clear()
+        model = self.FakeModel(delay=0.05)
+        await asyncio.gather(*(generate_content_async(model, f'prompt {i}') for i in range(6)))
+        self.assertEqual(model.calls, 6)
+        self.assertEqual(model.max_running, 2)
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await generate_content_async(self.FakeModel(delay=5), 'slow')
+
+    @patch('kanban.utils.ai_utils.retry_delay', return_value=0)
+    def test_sync_retries_transient_errors(self, _delay):
+        """Test the sync wrapper retries rate-limited calls like the async one"""
+        from google.api_core import exceptions as google_exceptions
+        from .utils.ai_utils import generate_content
+
+        model = self.FakeModel(failures=2)
+        self.assertEqual(generate_content(model, 'summarize').text.strip(), 'summarize done')
+        self.assertEqual(model.calls, 3)
+
+        with self.assertRaises(google_exceptions.ResourceExhausted):
+            generate_content(self.FakeModel(failures=5), 'summarize')
+
+    @override_settings(AI_ASSISTANT_CONFIG={'RESPONSE_TIMEOUT': 0.2, 'MAX_CONCURRENT_REQUESTS': 2, 'MAX_RETRIES': 0})
+    def test_sync_limits_concurrency(self):
+        """Test sync calls from many threads are capped, and callers give up when no slot frees"""
+        from concurrent.futures import ThreadPoolExecutor
+        from .utils import ai_utils
+
+        ai_utils._ai_sync_semaphore = None
+        try:
+            model = self.FakeModel(delay=0.02)
+            with ThreadPoolExecutor(max_workers=6) as executor:
+                list(executor.map(lambda i: ai_utils.generate_content(model, f'prompt {i}'), range(6)))
+            self.assertEqual(model.calls, 6)
+            self.assertEqual(model.max_running, 2)
+
+            semaphore = ai_utils._get_sync_ai_semaphore()
+            semaphore.acquire()
+            semaphore.acquire()
+            try:
+                with self.assertRaises(ai_utils.AIBusyError):
+                    ai_utils.generate_content(model, 'waiting')
+                self.assertIsNone(ai_utils.generate_ai_content('waiting'))
+            finally:
+                semaphore.release()
+                semaphore.release()
+        finally:
+            ai_utils._ai_sync_semaphore = None
+
+
+class AIResponseCacheTestCase(TestCase):
+    """Test the prompt-hash cache in front of the AI utility functions"""
+
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+
+        self.user = User.objects.create_user(username='aicache', password='pass123')
+        organization = Organization.objects.create(name='AI Org', domain='ai.com', created_by=self.user)
+        board = Board.objects.create(name='AI Board', organization=organization, created_by=self.user)
+        column = Column.objects.create(name='To Do', board=board, position=0)
+        self.task = Task.objects.create(title='Write docs', column=column, created_by=self.user)
+
+        self.model = MagicMock()
+        self.model.generate_content.return_value = MagicMock(text='**Objective:** Write docs')
+        patcher = patch('kanban.utils.ai_utils.get_model', return_value=self.model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_identical_prompts_hit_cache(self):
+        """Test a repeated call is served from the cache and counted as a hit"""
+        from .utils.ai_utils import generate_task_description, get_ai_cache_stats
+
+        first = generate_task_description('Write docs')
+        second = generate_task_description('Write docs')
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.model.generate_content.call_count, 1)
+        self.assertEqual(get_ai_cache_stats()['generate_task_description'], {'hits': 1, 'misses': 1})
+
+        generate_task_description('Write tests')
+        self.assertEqual(self.model.generate_content.call_count, 2)
+
+    def test_task_updates_and_bypass_skip_cache(self):
+        """Test editing the task or asking to bypass calls Gemini again"""
+        from .utils.ai_utils import ai_cache_scope, generate_task_description
+
+        with ai_cache_scope(task=self.task):
+            generate_task_description('Write docs')
+            generate_task_description('Write docs')
+        self.assertEqual(self.model.generate_content.call_count, 1)
+
+        with ai_cache_scope(task=self.task, bypass=True):
+            generate_task_description('Write docs')
+        self.assertEqual(self.model.generate_content.call_count, 2)
+
+        Task.objects.filter(id=self.task.id).update(updated_at=timezone.now() + timedelta(seconds=1))
+        self.task.refresh_from_db()
+        with ai_cache_scope(task=self.task):
+            generate_task_description('Write docs')
+        self.assertEqual(self.model.generate_content.call_count, 3)
+
+@override_settings(
+    SECURE_SSL_REDIRECT=False,
+    CHANNEL_LAYERS={'default': {'BACKEND': 'channels.layers.InMemoryChannelLayer'}}
+)
+class AIJobTestCase(TestCase):
+    """Test AI analyses queued as Celery jobs"""
+
+    def setUp(self):
+        from kanban_board.celery import app as celery_app
+
+        # Same as running with CELERY_TASK_ALWAYS_EAGER=True
+        eager = celery_app.conf.task_always_eager
+        celery_app.conf.update(task_always_eager=True)
+        self.addCleanup(celery_app.conf.update, task_always_eager=eager)
+
+        self.user = User.objects.create_user(username='jobowner', password='pass123')
+        self.other = User.objects.create_user(username='stranger', password='pass123')
+        organization = Organization.objects.create(name='Job Org', domain='jobs.com', created_by=self.user)
+        self.board = Board.objects.create(name='Job Board', organization=organization, created_by=self.user)
+        Column.objects.create(name='To Do', board=self.board, position=0)
+        self.client.force_login(self.user)
+
+    def post(self, url_name, data):
+        return self.client.post(reverse(url_name), data=json.dumps(data), content_type='application/json')
+
+    @patch('kanban.utils.ai_utils.analyze_workflow_optimization', return_value={'bottlenecks': ['Review']})
+    def test_job_is_queued_then_polled(self, analyze):
+        """Test the endpoint answers 202 and the worker stores the result"""
+        from .models import AIJob
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post('analyze_workflow_optimization_api', {'board_id': self.board.id})
+
+        self.assertEqual(response.status_code, 202)
+        job_id = response.json()['job_id']
+        self.assertEqual(response.json()['status_url'], reverse('ai_job_status_api', args=[job_id]))
+        analyze.assert_called_once()
+        self.assertEqual(analyze.call_args[0][0]['total_tasks'], 0)
+
+        status_response = self.client.get(reverse('ai_job_status_api', args=[job_id]))
+        self.assertEqual(status_response.json()['status'], 'succeeded')
+        self.assertEqual(status_response.json()['result'], {'bottlenecks': ['Review']})
+        self.assertIsNotNone(AIJob.objects.get(id=job_id).finished_at)
+
+    @patch('kanban.utils.ai_utils.extract_tasks_from_transcript', return_value=None)
+    def test_failed_job_and_ownership(self, _extract):
+        """Test a failed analysis is recorded and only its owner can read it"""
+        from .utils.ai_job_service import AIJobService
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.post('extract_tasks_from_transcript_api', {
+                'board_id': self.board.id, 'transcript': 'Alice will draft the spec'
+            })
+        job_id = response.json()['job_id']
+
+        status_response = self.client.get(reverse('ai_job_status_api', args=[job_id]))
+        self.assertEqual(status_response.json()['status'], 'failed')
+        self.assertEqual(status_response.json()['error'], 'Failed to extract tasks from transcript')
+
+        # A finished job is never run again
+        self.assertIsNone(AIJobService.run(job_id))
+
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(reverse('ai_job_status_api', args=[job_id])).status_code, 404)
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class BoardSnapshotTestCase(TestCase):
+    """Test the board snapshot builder used by board_detail and its JSON endpoint"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='snapuser', password='pass123')
+        self.organization = Organization.objects.create(name='Snap Org', domain='snap.com', created_by=self.user)
+        UserProfile.objects.create(user=self.user, organization=self.organization, completed_wizard=True)
+        self.board = Board.objects.create(name='Snap Board', organization=self.organization, created_by=self.user)
+        self.board.members.add(self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.done = Column.objects.create(board=self.board, name='Done', position=1)
+        self.label = TaskLabel.objects.create(name='Backend', color='#123456', board=self.board)
+        self.client.force_login(self.user)
+
+    def add_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(
+                column=self.todo if i % 2 else self.done, title=f'Card {i}', created_by=self.user,
+                assigned_to=self.user, position=i
+            )
+            task.labels.add(self.label)
+            Comment.objects.create(task=task, user=self.user, content='Looks good')
+
+    def test_snapshot_structure(self):
+        """Test cards are grouped by column with labels, assignee and counts"""
+        from .utils.board_snapshot_service import BoardSnapshotService
+
+        self.add_tasks(3)
+        snapshot = BoardSnapshotService(self.board).build()
+
+        self.assertEqual([column['name'] for column in snapshot['columns']], ['To Do', 'Done'])
+        self.assertTrue(snapshot['columns'][0]['is_todo'])
+        self.assertEqual([task['title'] for task in snapshot['columns'][1]['tasks']], ['Card 0', 'Card 2'])
+        card = snapshot['columns'][0]['tasks'][0]
+        self.assertEqual(card['labels'][0]['name'], 'Backend')
+        self.assertEqual(card['assigned_to']['username'], 'snapuser')
+        self.assertEqual(card['comment_count'], 1)
+        self.assertEqual(card['file_count'], 0)
+        self.assertEqual(snapshot['task_count'], 3)
+
+        response = self.client.get(reverse('board_snapshot_api', args=[self.board.id]))
+        self.assertEqual(response.json()['task_count'], 3)
+
+    def test_counts_are_aggregated_separately(self):
+        """Test comment and file counts neither multiply each other nor include deleted files"""
+        from django.utils import timezone
+        from .utils.board_snapshot_service import BoardSnapshotService
+
+        self.add_tasks(1)
+        task = Task.objects.get(title='Card 0')
+        Comment.objects.create(task=task, user=self.user, content='Agreed')
+        for i in range(3):
+            TaskFile.objects.create(
+                task=task, uploaded_by=self.user, file=f'tasks/spec{i}.pdf', filename=f'spec{i}.pdf',
+                file_size=100, file_type='pdf', deleted_at=timezone.now() if i == 2 else None
+            )
+
+        card = BoardSnapshotService(self.board).build()['columns'][1]['tasks'][0]
+        self.assertEqual((card['comment_count'], card['file_count']), (2, 2))
+
+    def test_query_count_independent_of_board_size(self):
+        """Test building the snapshot and rendering the board do not query per card"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        from .utils.board_snapshot_service import BoardSnapshotService
+
+        self.add_tasks(2)
+        with CaptureQueriesContext(connection) as small_build:
+            BoardSnapshotService(self.board).build()
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(reverse('board_detail', args=[self.board.id]))
+
+        self.add_tasks(20)
+        with CaptureQueriesContext(connection) as large_build:
+            BoardSnapshotService(self.board).build()
+        with CaptureQueriesContext(connection) as large_page:
+            response = self.client.get(reverse('board_detail', args=[self.board.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Card 19')
+        self.assertEqual(len(small_build), 5)
+        self.assertEqual(len(large_build), len(small_build))
+        self.assertEqual(len(large_page), len(small_page))
+
+class BoardAccessServiceTestCase(TestCase):
+    """Test cached board permission checks and their invalidation"""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='pass123')
+        self.member = User.objects.create_user(username='member', password='pass123')
+        self.outsider = User.objects.create_user(username='outsider', password='pass123')
+        organization = Organization.objects.create(name='Access Org', domain='access.com', created_by=self.owner)
+        self.board = Board.objects.create(name='Access Board', organization=organization, created_by=self.owner)
+        self.board.members.add(self.member)
+
+    def test_per_process_cache_is_not_trusted(self):
+        """Test checks query the database when the cache is local to each process"""
+        self.assertFalse(BoardAccessService.cache_is_shared())  # LocMemCache in tests
+        self.assertTrue(BoardAccessService.can_access(self.member, self.board))
+        with self.assertNumQueries(1):
+            self.assertTrue(BoardAccessService.can_access(self.member, self.board))
+        # A removal handled by another process is seen at once
+        self.board.members.through.objects.filter(user=self.member).delete()
+        self.assertFalse(BoardAccessService.can_access(self.member, self.board))
+
+    @patch.object(BoardAccessService, 'cache_is_shared', return_value=True)
+    def test_access_is_cached(self, _shared):
+        """Test the accessible board ids are loaded once and then served from a shared cache"""
+        self.assertTrue(BoardAccessService.can_access(self.member, self.board))
+        with self.assertNumQueries(0):
+            self.assertTrue(BoardAccessService.can_access(self.member, self.board))
+        self.assertEqual(BoardAccessService.accessible_board_ids(self.member), {self.board.id})
+
+    def test_creator_has_access_without_membership(self):
+        """Test the creator can open the board but is not counted as a member"""
+        with self.assertNumQueries(0):
+            self.assertTrue(BoardAccessService.can_access(self.owner, self.board))
+        self.assertFalse(BoardAccessService.is_member(self.owner, self.board))
+        self.assertTrue(BoardAccessService.is_member(self.member, self.board))
+
+    @patch.object(BoardAccessService, 'cache_is_shared', return_value=True)
+    def test_membership_changes_invalidate(self, _shared):
+        """Test adding, removing and clearing members is reflected immediately"""
+        self.assertFalse(BoardAccessService.can_access(self.outsider, self.board))
+
+        self.board.members.add(self.outsider)
+        self.assertTrue(BoardAccessService.can_access(self.outsider, self.board))
+
+        self.board.members.remove(self.outsider)
+        self.assertFalse(BoardAccessService.can_access(self.outsider, self.board))
+
+        self.outsider.member_boards.add(self.board)  # Reverse side of the relation
+        self.assertTrue(BoardAccessService.can_access(self.outsider, self.board))
+
+        self.board.members.clear()
+        self.assertFalse(BoardAccessService.can_access(self.member, self.board))
+        self.assertFalse(BoardAccessService.can_access(self.outsider, self.board))
+
+    def test_anonymous_user_denied(self):
+        """Test anonymous users never have access"""
+        self.assertFalse(BoardAccessService.can_access(AnonymousUser(), self.board))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TaskSearchTestCase(TestCase):
+    """Test the full-text task search index and the board search that uses it"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='searcher', password='pass123')
+        organization = Organization.objects.create(name='Search Org', domain='search.com', created_by=self.user)
+        UserProfile.objects.create(user=self.user, organization=organization, completed_wizard=True)
+        self.board = Board.objects.create(name='Search Board', organization=organization, created_by=self.user)
+        self.other_board = Board.objects.create(name='Other Board', organization=organization, created_by=self.user)
+        self.column = Column.objects.create(board=self.board, name='To Do', position=0)
+        other_column = Column.objects.create(board=self.other_board, name='To Do', position=0)
+
+        self.gateway = Task.objects.create(column=self.column, title='Deployment of the API gateway', created_by=self.user)
+        self.docs = Task.objects.create(
+            column=self.column, title='Write docs', description='Explain how to deploy the API', created_by=self.user
+        )
+        self.unrelated = Task.objects.create(column=self.column, title='Plan retro', created_by=self.user)
+        Task.objects.create(column=other_column, title='Deploy other API', created_by=self.user)
+        self.client.force_login(self.user)
+
+    def test_prefix_match_ranks_titles_first(self):
+        """Test every word matches as a prefix and title hits outrank description hits"""
+        self.assertEqual(TaskSearchService.search(self.board, 'deploy api'), [self.gateway.id, self.docs.id])
+        self.assertEqual(TaskSearchService.search(self.board, 'retro'), [self.unrelated.id])
+        self.assertEqual(TaskSearchService.search(self.board, '"*) OR'), [])
+
+    def test_index_follows_task_changes(self):
+        """Test saves and deletes update the index"""
+        self.unrelated.title = 'Deploy retro notes'
+        self.unrelated.save()
+        self.assertIn(self.unrelated.id, TaskSearchService.search(self.board, 'deploy'))
+
+        self.gateway.delete()
+        self.assertEqual(TaskSearchService.search(self.board, 'gateway'), [])
+
+    def test_non_text_saves_skip_indexing(self):
+        """Test saves limited to fields outside the index leave it alone"""
+        with patch.object(TaskSearchService, 'index_task') as index_task:
+            self.docs.progress = 50
+            self.docs.save(update_fields=['progress'])
+            index_task.assert_not_called()
+
+            self.docs.title = 'Write the deploy guide'
+            self.docs.save(update_fields=['title'])
+            index_task.assert_called_once_with(self.docs)
+
+    def test_filter_joins_index_in_sql(self):
+        """Test the board filter queries the index in a subquery rather than passing ids"""
+        tasks = TaskSearchService.filter_queryset(Task.objects.all(), self.board, 'deploy')
+        self.assertIn('kanban_task_fts', str(tasks.query))
+        self.assertEqual(set(tasks), {self.gateway, self.docs})
+        self.assertFalse(TaskSearchService.filter_queryset(Task.objects.all(), self.board, '*)').exists())
+
+    def test_rebuild(self):
+        """Test the rebuild command re-creates rows removed from the index"""
+        TaskSearchService.remove_task(self.docs.id)
+        self.assertEqual(TaskSearchService.search(self.board, 'explain'), [])
+
+        call_command('rebuild_search_index', board_id=self.board.id, stdout=StringIO())
+
+        self.assertEqual(TaskSearchService.search(self.board, 'explain'), [self.docs.id])
+        self.assertEqual(len(TaskSearchService.search(self.other_board, 'deploy')), 1)
+
+    def test_search_endpoints(self):
+        """Test the board filter and the ranked search API"""
+        response = self.client.get(reverse('board_detail', args=[self.board.id]), {'search_term': 'deploy'})
+        titles = [task['title'] for column in response.context['columns'] for task in column['tasks']]
+        self.assertEqual(sorted(titles), ['Deployment of the API gateway', 'Write docs'])
+
+        response = self.client.get(reverse('search_tasks_api', args=[self.board.id]), {'q': 'api deploy'})
+        self.assertEqual([task['id'] for task in response.json()['results']], [self.gateway.id, self.docs.id])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class BoardExportTestCase(TestCase):
+    """Test the streaming board export"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='exporter', password='pass123')
+        organization = Organization.objects.create(name='Export Org', domain='export.com', created_by=self.user)
+        self.board = Board.objects.create(name='Export Board', organization=organization, created_by=self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        Column.objects.create(board=self.board, name='Empty', position=1)
+        self.done = Column.objects.create(board=self.board, name='Done', position=2)
+        label = TaskLabel.objects.create(name='Backend', color='#123456', board=self.board)
+        for i in range(6):
+            task = Task.objects.create(
+                column=self.done if i % 2 else self.todo, title=f'Task {i}', created_by=self.user,
+                assigned_to=self.user if i % 3 == 0 else None, position=i
+            )
+            task.labels.add(label)
+        self.client.force_login(self.user)
+
+    def export(self, export_format):
+        response = self.client.get(reverse('export_board', args=[self.board.id]), {'format': export_format})
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_json_export_keeps_import_shape(self):
+        """Test the streamed JSON parses into columns in order with their tasks"""
+        data = json.loads(self.export('json'))
+
+        self.assertEqual(data['board']['name'], 'Export Board')
+        self.assertEqual([column['name'] for column in data['columns']], ['To Do', 'Empty', 'Done'])
+        self.assertEqual([task['title'] for task in data['columns'][0]['tasks']], ['Task 0', 'Task 2', 'Task 4'])
+        self.assertEqual(data['columns'][1]['tasks'], [])
+        self.assertEqual(data['columns'][2]['tasks'][0]['labels'], ['Backend'])
+        self.assertEqual(data['columns'][2]['tasks'][1]['assigned_to'], 'exporter')
+
+    def test_csv_and_ndjson_exports(self):
+        """Test CSV has one row per task and NDJSON one object per line"""
+        rows = self.export('csv').splitlines()
+        self.assertEqual(len(rows), 7)
+        self.assertTrue(rows[1].startswith('To Do,Task 0,'))
+
+        lines = [json.loads(line) for line in self.export('ndjson').splitlines()]
+        self.assertEqual([line['type'] for line in lines], ['board'] + ['column'] * 3 + ['task'] * 6)
+        self.assertEqual(lines[-1]['column'], 'Done')
+
+    def test_query_count_is_independent_of_board_size(self):
+        """Test tasks, users and labels are fetched per chunk rather than per task"""
+        service = BoardExportService(self.board, chunk_size=100)
+        with self.assertNumQueries(3):
+            list(service.stream('json'))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class BoardImportTestCase(TestCase):
+    """Test the bulk, transactional board import"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='importer', password='pass123')
+        self.teammate = User.objects.create_user(username='teammate', password='pass123')
+        self.stranger = User.objects.create_user(username='stranger', password='pass123')
+        self.organization = Organization.objects.create(name='Import Org', domain='import.com', created_by=self.user)
+        other_organization = Organization.objects.create(name='Other Org', domain='other.com', created_by=self.stranger)
+        UserProfile.objects.create(user=self.user, organization=self.organization, completed_wizard=True)
+        UserProfile.objects.create(user=self.teammate, organization=self.organization, completed_wizard=True)
+        UserProfile.objects.create(user=self.stranger, organization=other_organization, completed_wizard=True)
+        self.client.force_login(self.user)
+
+    def export_data(self, task_count):
+        return {
+            'board': {'name': 'Migrated Board', 'description': 'From another instance'},
+            'columns': [
+                {'name': 'To Do', 'position': 0, 'tasks': [
+                    {
+                        'title': f'Card {i}', 'position': i, 'priority': 'high',
+                        'assigned_to': ['teammate', 'stranger', 'nobody', None][i % 4],
+                        'labels': ['Backend', 'Urgent'] if i % 2 else ['Backend'],
+                    }
+                    for i in range(task_count)
+                ]},
+                {'name': 'Done', 'position': 1, 'tasks': [{'title': 'Shipped', 'labels': ['Backend']}]},
+            ],
+        }
+
+    def upload(self, content, name='board.json', **extra):
+        upload = SimpleUploadedFile(name, content.encode(), content_type='application/json')
+        return self.client.post(reverse('import_board'), {'import_file': upload, **extra})
+
+    def test_import_creates_board_in_bulk(self):
+        """Test columns, tasks, assignees and labels are created with batched queries"""
+        service = BoardImportService(self.user, self.organization)
+        data = self.export_data(10)
+        with self.assertNumQueries(13):
+            board = service.import_file(ContentFile(json.dumps(data).encode()), filename='board.json')
+
+        tasks = Task.objects.filter(column__board=board)
+        self.assertEqual(tasks.count(), 11)
+        self.assertEqual(set(board.labels.values_list('name', flat=True)), {'Backend', 'Urgent'})
+        self.assertEqual(tasks.filter(assigned_to=self.teammate).count(), 3)
+        self.assertFalse(tasks.filter(assigned_to=self.stranger).exists())  # Outside the organization
+        self.assertEqual(Task.objects.get(title='Card 1').labels.count(), 2)
+        self.assertTrue(Task.objects.get(title='Shipped').is_done)
+        self.assertEqual(Task.objects.get(title='Shipped').position, 0)
+        self.assertEqual(TaskSearchService.search(board, 'card 3'), [Task.objects.get(title='Card 3').id])
+
+    def test_ndjson_round_trip_with_progress(self):
+        """Test an NDJSON export imports line by line and reports progress per batch"""
+        source = BoardImportService(self.user, self.organization).import_file(
+            ContentFile(json.dumps(self.export_data(5)).encode()), filename='board.json'
+        )
+        ndjson = ''.join(BoardExportService(source).stream('ndjson'))
+
+        reports = []
+        service = BoardImportService(self.user, self.organization, progress=lambda *args: reports.append(args))
+        service.BATCH_SIZE = 4
+        board = service.import_file(ContentFile(ndjson.encode()), filename='board.ndjson')
+
+        self.assertEqual(reports, [(0, None), (4, None), (6, None)])
+        self.assertEqual(list(board.columns.values_list('name', flat=True)), ['To Do', 'Done'])
+        self.assertEqual(Task.objects.filter(column__board=board).count(), 6)
+
+    def test_failed_import_leaves_nothing_behind(self):
+        """Test an error part way through rolls back the whole import"""
+        lines = [
+            {'type': 'board', 'name': 'Broken Board'},
+            {'type': 'column', 'name': 'To Do'},
+            {'type': 'task', 'column': 'To Do', 'title': 'Fine'},
+            {'type': 'task', 'column': 'Missing', 'title': 'Orphan'},
+        ]
+        response = self.upload('\n'.join(json.dumps(line) for line in lines), name='board.ndjson')
+
+        self.assertRedirects(response, reverse('board_list'), fetch_redirect_response=False)
+        self.assertFalse(Board.objects.filter(name='Broken Board').exists())
+        self.assertFalse(Task.objects.filter(title='Fine').exists())
+
+    @patch.object(BoardAccessService, 'cache_is_shared', return_value=True)
+    def test_import_view_reports_progress(self, cache_is_shared):
+        """Test the upload view stores progress for the polling endpoint"""
+        self.assertContains(self.client.get(reverse('board_list')), '/board-imports/')
+        response = self.upload(json.dumps(self.export_data(3)), import_id='abc123')
+
+        board = Board.objects.get(name='Migrated Board')
+        self.assertRedirects(response, reverse('board_detail', args=[board.id]), fetch_redirect_response=False)
+        response = self.client.get(reverse('import_progress_api', args=['abc123']))
+        self.assertEqual(response.json(), {'processed': 4, 'total': 4})
+
+    def test_no_progress_polling_without_shared_cache(self):
+        """Test progress is neither stored nor polled when other workers could not see it"""
+        self.assertNotContains(self.client.get(reverse('board_list')), '/board-imports/')
+        self.upload(json.dumps(self.export_data(3)), import_id='abc123')
+
+        self.assertTrue(Board.objects.filter(name='Migrated Board').exists())
+        self.assertIsNone(BoardImportService.get_progress(self.user.id, 'abc123'))
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class BoardAnalyticsSnapshotTestCase(TestCase):
+    """Test precomputed board analytics snapshots"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='snapshotter', password='pass123')
+        organization = Organization.objects.create(name='Stats Org', domain='stats.com', created_by=self.user)
+        self.board = Board.objects.create(name='Stats Board', organization=organization, created_by=self.user)
+        self.board.members.add(self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.done = Column.objects.create(board=self.board, name='Done', position=1)
+        value_added = TaskLabel.objects.create(name='Value-Added', color='#28a745', board=self.board, category='lean')
+        waste = TaskLabel.objects.create(name='Waste/Eliminate', color='#dc3545', board=self.board, category='lean')
+
+        self.open_task = Task.objects.create(
+            column=self.todo, title='Open', created_by=self.user, assigned_to=self.user, priority='high', progress=50,
+            due_date=timezone.now() - timedelta(days=2)
+        )
+        self.open_task.labels.add(value_added)
+        shipped = Task.objects.create(column=self.done, title='Shipped', created_by=self.user, assigned_to=self.user)
+        shipped.labels.add(value_added)
+        Task.objects.create(column=self.todo, title='Unassigned', created_by=self.user).labels.add(waste)
+        self.client.force_login(self.user)
+
+    def test_snapshot_values(self):
+        """Test the snapshot holds the counters and chart series the page shows"""
+        data = BoardAnalyticsService(self.board).get()
+
+        self.assertEqual(data['total_tasks'], 3)
+        self.assertEqual(data['completed_count'], 1)
+        self.assertEqual(data['productivity'], 50.0)  # (50 + 100 + 0) / 300
+        self.assertEqual(data['overdue_count'], 1)
+        self.assertEqual(data['tasks_by_column'], [{'name': 'To Do', 'count': 2}, {'name': 'Done', 'count': 1}])
+        self.assertEqual(data['tasks_by_user'][0], {
+            'username': 'snapshotter', 'count': 2, 'completed': 1, 'completion_rate': 50
+        })
+        self.assertEqual([item['count'] for item in data['tasks_by_lean_category']], [2, 0, 1])
+        self.assertEqual(data['value_added_percentage'], 66.7)
+
+    def test_snapshot_read_in_one_query(self):
+        """Test a current snapshot is served without recomputing"""
+        BoardAnalyticsService(self.board).get()
+        with self.assertNumQueries(1):
+            BoardAnalyticsService(self.board).get()
+
+    def test_changes_mark_snapshot_stale(self):
+        """Test task changes flag the snapshot and a refresh picks them up"""
+        service = BoardAnalyticsService(self.board)
+        service.get()
+
+        self.open_task.column = self.done
+        self.open_task.save()
+
+        snapshot = BoardAnalyticsSnapshot.objects.get(board=self.board)
+        self.assertIsNotNone(snapshot.stale_since)
+        self.assertEqual(service.get()['completed_count'], 1)  # Served stale until the queued rebuild runs
+
+        refresh_board_analytics(self.board.id)
+        snapshot.refresh_from_db()
+        self.assertIsNone(snapshot.stale_since)
+        self.assertEqual(snapshot.data['completed_count'], 2)
+
+        # A rebuild that never ran is done by the reader after the grace period
+        Task.objects.create(column=self.done, title='Late', created_by=self.user)
+        later = BoardAnalyticsService(self.board, now=timezone.now() + BoardAnalyticsService.STALE_GRACE * 2)
+        self.assertEqual(later.get()['completed_count'], 3)
+
+    def test_views_read_snapshot_and_rebuild_command(self):
+        """Test the analytics page renders from the snapshot the rebuild command writes"""
+        call_command('rebuild_board_analytics', stdout=StringIO())
+        self.assertTrue(BoardAnalyticsSnapshot.objects.filter(board=self.board, stale_since__isnull=True).exists())
+
+        response = self.client.get(reverse('board_analytics', args=[self.board.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_tasks'], 3)
+        self.assertEqual(response.context['overdue_count'], 1)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class FlowMetricsTestCase(TestCase):
+    """Test daily flow metric rows rebuilt from task activity history"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='flowuser', password='pass123')
+        organization = Organization.objects.create(name='Flow Org', domain='flow.com', created_by=self.user)
+        self.board = Board.objects.create(name='Flow Board', organization=organization, created_by=self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.doing = Column.objects.create(board=self.board, name='Doing', position=1)
+        self.done = Column.objects.create(board=self.board, name='Done', position=2)
+        self.today = timezone.localdate()
+        now = timezone.now()
+
+        # A: created three days ago, moved to Doing two days ago and to Done yesterday
+        task_a = self.create_task('A', self.done, now - timedelta(days=3))
+        self.log_move(task_a, now - timedelta(days=2), self.todo, self.doing, linked=False)  # Logged before column ids
+        self.log_move(task_a, now - timedelta(days=1), self.doing, self.done)
+        # B: created two days ago, never moved; C: created in Done yesterday
+        self.create_task('B', self.todo, now - timedelta(days=2))
+        self.create_task('C', self.done, now - timedelta(days=1))
+        self.client.force_login(self.user)
+
+    def create_task(self, title, column, created_at):
+        task = Task.objects.create(column=column, title=title, created_by=self.user)
+        Task.objects.filter(id=task.id).update(created_at=created_at)
+        return task
+
+    def log_move(self, task, at, from_column, to_column, linked=True):
+        activity = TaskActivity.objects.create(
+            task=task, user=self.user, activity_type='moved',
+            description=f"Moved task '{task.title}' from '{from_column.name}' to '{to_column.name}'",
+            from_column=from_column if linked else None,
+            to_column=to_column if linked else None
+        )
+        TaskActivity.objects.filter(id=activity.id).update(created_at=at)
+
+    def test_backfill_from_history(self):
+        """Test end-of-day column counts and completions are reconstructed"""
+        call_command('backfill_flow_metrics', board_id=self.board.id, stdout=StringIO())
+
+        self.assertEqual(TaskActivity.objects.filter(activity_type='moved', to_column=self.doing).count(), 1)
+        flow = FlowMetricsService(self.board).cumulative_flow(days=4)
+        self.assertEqual(flow['dates'][0], (self.today - timedelta(days=3)).isoformat())
+        self.assertEqual([column['counts'] for column in flow['columns']], [
+            [1, 1, 1, 1],  # To Do
+            [0, 1, 0, 0],  # Doing
+            [0, 0, 2, 2],  # Done
+        ])
+
+        burndown = FlowMetricsService(self.board).burndown(days=4)
+        self.assertEqual(burndown['scope'], [1, 2, 3, 3])
+        self.assertEqual(burndown['remaining'], [1, 2, 1, 1])
+        days = BoardFlowDay.objects.filter(board=self.board).order_by('date')
+        self.assertEqual([day.completed_count for day in days], [0, 0, 2, 0])
+
+    def test_recent_refresh_matches_full_rebuild(self):
+        """Test the daily job only rewrites recent days and agrees with the backfill"""
+        service = FlowMetricsService(self.board)
+        FlowMetricsService.link_move_activities()
+        service.rebuild()
+        before = list(ColumnFlowDay.objects.order_by('date', 'column_id').values_list('date', 'column_id', 'task_count'))
+
+        with self.assertNumQueries(10):
+            self.assertEqual(service.record_recent(), 2)
+        after = list(ColumnFlowDay.objects.order_by('date', 'column_id').values_list('date', 'column_id', 'task_count'))
+        self.assertEqual(before, after)
+
+    def test_endpoints(self):
+        """Test the flow endpoints serve the stored series"""
+        call_command('backfill_flow_metrics', stdout=StringIO())
+
+        response = self.client.get(reverse('cumulative_flow_api', args=[self.board.id]), {'days': 2})
+        self.assertEqual(len(response.json()['dates']), 2)
+        response = self.client.get(reverse('burndown_api', args=[self.board.id]))
+        self.assertEqual(response.json()['done'][-1], 2)
+        response = self.client.get(reverse('throughput_api', args=[self.board.id]), {'weeks': 2})
+        self.assertEqual(sum(week['completed'] for week in response.json()['weeks']), 2)
+        response = self.client.get(reverse('throughput_api', args=[self.board.id]), {'weeks': 'many'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CycleTimeTestCase(TestCase):
+    """Test lead and cycle times recorded as tasks move and their percentile summaries"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='cycleuser', password='pass123')
+        organization = Organization.objects.create(name='Cycle Org', domain='cycle.com', created_by=self.user)
+        self.board = Board.objects.create(name='Cycle Board', organization=organization, created_by=self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.doing = Column.objects.create(board=self.board, name='Doing', position=1)
+        self.done = Column.objects.create(board=self.board, name='Done', position=2)
+        self.client.force_login(self.user)
+
+    def _move(self, task, column):
+        return self.client.post(
+            reverse('move_task'),
+            data=json.dumps({'taskId': task.id, 'columnId': column.id, 'position': 0}),
+            content_type='application/json',
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+    def _done_task(self, title, hours_ago, assignee=None):
+        """A task created in Done, so its cycle starts when it is created"""
+        task = Task.objects.create(column=self.done, title=title, created_by=self.user, assigned_to=assignee)
+        Task.objects.filter(id=task.id).update(created_at=task.completed_at - timedelta(hours=hours_ago))
+        return task
+
+    def test_percentile(self):
+        """Test percentiles interpolate between closest ranks"""
+        self.assertIsNone(percentile([], 50))
+        self.assertEqual(percentile([10, 20, 30], 50), 20)
+        self.assertAlmostEqual(percentile([10, 20, 30], 95), 29)
+
+    def test_move_records_lead_and_cycle_time(self):
+        """Test moving into Done records the task and moving back out drops it"""
+        task = Task.objects.create(column=self.todo, title='Ship it', created_by=self.user)
+        Task.objects.filter(id=task.id).update(created_at=timezone.now() - timedelta(hours=120))
+        self._move(task, self.doing)
+        TaskActivity.objects.filter(task=task, activity_type='moved').update(
+            created_at=timezone.now() - timedelta(hours=72))
+        self.assertFalse(TaskFlowTime.objects.filter(task=task).exists())
+
+        self._move(task, self.done)
+        flow_time = TaskFlowTime.objects.get(task=task)
+        self.assertAlmostEqual(flow_time.lead_time_hours, 120, places=0)
+        self.assertAlmostEqual(flow_time.cycle_time_hours, 72, places=0)
+
+        self._move(task, self.doing)
+        self.assertFalse(TaskFlowTime.objects.filter(task=task).exists())
+
+    def test_rebuild_and_summary(self):
+        """Test the rebuild matches incremental rows and summaries group by assignee and label"""
+        other = User.objects.create_user(username='cycleother', password='pass123')
+        label = TaskLabel.objects.create(name='Backend', board=self.board)
+        for title, hours_ago, assignee in [('A', 10, self.user), ('B', 20, self.user), ('C', 30, other)]:
+            self._done_task(title, hours_ago, assignee).labels.add(label)
+        Task.objects.create(column=self.todo, title='Open', created_by=self.user)
+
+        call_command('rebuild_cycle_times', board_id=self.board.id, stdout=StringIO())
+        self.assertEqual(TaskFlowTime.objects.filter(board=self.board).count(), 3)
+
+        with self.assertNumQueries(2):
+            summary = CycleTimeService.summary(self.board)
+        self.assertEqual(summary['board']['count'], 3)
+        self.assertEqual(summary['board']['lead_time'], {'p50': 20.0, 'p85': 27.0, 'p95': 29.0})
+        self.assertEqual(summary['board']['cycle_time']['p50'], 20.0)
+        self.assertEqual([(row['username'], row['count']) for row in summary['assignees']],
+                         [('cycleother', 1), ('cycleuser', 2)])
+        self.assertEqual(summary['assignees'][1]['lead_time']['p50'], 15.0)
+        self.assertEqual(summary['labels'][0]['name'], 'Backend')
+        self.assertEqual(summary['labels'][0]['count'], 3)
+
+    def test_endpoint(self):
+        """Test the cycle time endpoint checks access and validates the window"""
+        self._done_task('A', 10)
+        CycleTimeService.rebuild(board_id=self.board.id)
+
+        response = self.client.get(reverse('cycle_time_api', args=[self.board.id]), {'days': 30})
+        self.assertEqual(response.json()['board']['count'], 1)
+        response = self.client.get(reverse('cycle_time_api', args=[self.board.id]), {'days': 'all'})
+        self.assertEqual(response.status_code, 400)
+
+        stranger = User.objects.create_user(username='cyclestranger', password='pass123')
+        self.client.force_login(stranger)
+        response = self.client.get(reverse('cycle_time_api', args=[self.board.id]))
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class CriticalPathTestCase(TestCase):
+    """Test the CPM schedule built from task dependencies and dates"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='cpmuser', password='pass123')
+        organization = Organization.objects.create(name='CPM Org', domain='cpm.com', created_by=self.user)
+        self.board = Board.objects.create(name='CPM Board', organization=organization, created_by=self.user)
+        self.column = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.start = date(2025, 3, 3)
+        self.client.force_login(self.user)
+
+    def _task(self, title, offset, days, *dependencies):
+        start = self.start + timedelta(days=offset)
+        task = Task.objects.create(
+            column=self.column, title=title, created_by=self.user, start_date=start,
+            due_date=timezone.make_aware(datetime.combine(start + timedelta(days=days), datetime.min.time()))
+        )
+        task.dependencies.add(*dependencies)
+        return task
+
+    def test_schedule(self):
+        """Test earliest starts, slack and the critical path of a diamond"""
+        result = CriticalPathService.schedule(
+            {'a': 3, 'b': 2, 'c': 5, 'd': 1},
+            [('a', 'b'), ('a', 'c'), ('b', 'd'), ('c', 'd')]
+        )
+        self.assertEqual(result['earliest_start'], {'a': 0, 'b': 3, 'c': 3, 'd': 8})
+        self.assertEqual(result['slack'], {'a': 0, 'b': 3, 'c': 0, 'd': 0})
+        self.assertEqual(result['project_finish'], 9)
+        self.assertEqual(result['critical_path'], ['a', 'c', 'd'])
+
+    def test_cycles_are_reported(self):
+        """Test tasks in or behind a cycle are left unscheduled"""
+        result = CriticalPathService.schedule(
+            {'x': 1, 'y': 1, 'z': 1, 'w': 4},
+            [('x', 'y'), ('y', 'x'), ('y', 'z')]
+        )
+        self.assertEqual(sorted(result['cyclic']), ['x', 'y', 'z'])
+        self.assertEqual(result['critical_path'], ['w'])
+
+    def test_large_chain(self):
+        """Test a long chain is scheduled without recursion"""
+        durations = {node: 1 for node in range(5000)}
+        result = CriticalPathService.schedule(durations, [(node, node + 1) for node in range(4999)])
+        self.assertEqual(result['project_finish'], 5000)
+        self.assertEqual(len(result['critical_path']), 5000)
+
+    def test_board_report(self):
+        """Test the report uses dates, dependencies and subtasks of the board"""
+        design = self._task('Design', 0, 2)
+        build = self._task('Build', 2, 5, design)
+        docs = self._task('Docs', 2, 1, design)
+        release = self._task('Release', 7, 1, build, docs)
+        # A parent cannot finish before its subtasks
+        epic = self._task('Epic', 0, 3)
+        Task.objects.filter(id__in=[design.id, build.id]).update(parent_task=epic)
+
+        with self.assertNumQueries(2):
+            report = CriticalPathService(self.board).report()
+
+        self.assertEqual([step['task_title'] for step in report['critical_path']], ['Design', 'Build', 'Epic'])
+        analysis = {row['task_title']: row for row in report['task_analysis']}
+        self.assertEqual(analysis['Release']['slack_days'], 2)
+        self.assertEqual(analysis['Docs']['slack_days'], 6)
+        self.assertEqual(analysis['Epic']['earliest_start'], '2025-03-10')
+        self.assertTrue(analysis['Epic']['risk_factors'])
+        self.assertEqual(report['project_insights']['project_completion_date'], '2025-03-13')
+        self.assertEqual(release.dependencies.count(), 2)
+
+    def test_ai_only_narrates(self):
+        """Test the AI job returns the computed schedule with the model's recommendations"""
+        from .models import AIJob
+        from .utils.ai_job_service import AIJobService
+
+        design = self._task('Design', 0, 2)
+        self._task('Build', 2, 5, design)
+        job = AIJob.objects.create(kind='critical_path', user=self.user, board=self.board)
+        narration = '{"recommendations": [{"title": "Staff Build early", "impact": "high"}]}'
+        with patch('kanban.utils.ai_utils.generate_ai_content', return_value=narration) as generate:
+            AIJobService.run(job.id)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertIn('Design', generate.call_args[0][0])
+        self.assertEqual([step['task_title'] for step in job.result['critical_path']], ['Design', 'Build'])
+        self.assertEqual(job.result['recommendations'][0]['title'], 'Staff Build early')
+
+    def test_gantt_marks_critical_tasks(self):
+        """Test the Gantt chart flags critical bars and circular dependencies"""
+        first = self._task('First', 0, 2)
+        second = self._task('Second', 2, 2, first)
+        first.dependencies.add(second)
+        self._task('Alone', 0, 1)
+
+        response = self.client.get(reverse('gantt_chart', args=[self.board.id]))
+        self.assertContains(response, 'critical: true')
+        self.assertContains(response, '2 tasks could not be scheduled')
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class DependencyGraphTestCase(TestCase):
+    """Test dependency trees and graphs built from one in-memory load of the board"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='graphuser', password='pass123')
+        organization = Organization.objects.create(name='Graph Org', domain='graph.com', created_by=self.user)
+        self.board = Board.objects.create(name='Graph Board', organization=organization, created_by=self.user)
+        self.column = Column.objects.create(board=self.board, name='To Do', position=0)
+
+        # A 40-level chain of subtasks below the root, plus a second child of the root
+        self.chain = []
+        parent = None
+        for depth in range(40):
+            parent = Task.objects.create(column=self.column, title=f'Level {depth}', created_by=self.user,
+                                         parent_task=parent, position=depth)
+            self.chain.append(parent)
+        self.root = self.chain[0]
+        self.sibling = Task.objects.create(column=self.column, title='Sibling', created_by=self.user,
+                                           parent_task=self.root, position=100)
+        self.root.related_tasks.add(self.sibling)
+        self.sibling.dependencies.add(self.chain[1])
+        self.client.force_login(self.user)
+
+    def test_levels_and_tree_in_three_queries(self):
+        """Test the tree and levels of a deep hierarchy need no query per node"""
+        with self.assertNumQueries(3):
+            graph = TaskGraph.load(self.board)
+            tree = graph.tree(self.root.id, include_related=True)
+
+        self.assertEqual([child['title'] for child in tree['children']], ['Level 1', 'Sibling'])
+        self.assertEqual(tree['related'], [{'id': self.sibling.id, 'title': 'Sibling'}])
+        node = tree
+        while node['children']:
+            node = node['children'][0]
+        self.assertEqual(node['title'], 'Level 39')
+        self.assertEqual(node['level'], 39)
+        self.assertEqual(node['level'], self.chain[-1].get_dependency_level())
+        self.assertEqual(node['parent'], {'id': self.chain[-2].id, 'title': 'Level 38'})
+
+    def test_board_graph(self):
+        """Test the board graph lists every node and all three edge kinds"""
+        with self.assertNumQueries(3):
+            graph = DependencyGraphGenerator.generate_dependency_graph(self.board, self.root.id)
+
+        self.assertEqual(len(graph['nodes']), 41)
+        self.assertEqual(graph['root_id'], self.root.id)
+        edge_types = [edge['type'] for edge in graph['edges']]
+        self.assertEqual(edge_types.count('parent-child'), 40)
+        self.assertIn({'from': self.root.id, 'to': self.sibling.id, 'type': 'related'}, graph['edges'])
+        self.assertIn({'from': self.chain[1].id, 'to': self.sibling.id, 'type': 'dependency'}, graph['edges'])
+
+    def test_tree_api(self):
+        """Test the tree endpoint serves the subtree of a task"""
+        response = self.client.get(reverse('get_dependency_tree_api', args=[self.chain[38].id]))
+        tree = response.json()['tree']
+        self.assertEqual(tree['level'], 38)
+        self.assertEqual([child['title'] for child in tree['children']], ['Level 39'])
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TaskHierarchyTestCase(TestCase):
+    """Test parent/subtask queries answered by one recursive query each"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='epicuser', password='pass123')
+        organization = Organization.objects.create(name='Epic Org', domain='epic.com', created_by=self.user)
+        self.board = Board.objects.create(name='Epic Board', organization=organization, created_by=self.user)
+        self.column = Column.objects.create(board=self.board, name='To Do', position=0)
+
+        self.chain = []
+        parent = None
+        for depth in range(30):
+            parent = Task.objects.create(column=self.column, title=f'Level {depth}', created_by=self.user,
+                                         parent_task=parent)
+            self.chain.append(parent)
+        self.root, self.leaf = self.chain[0], self.chain[-1]
+        self.client.force_login(self.user)
+
+    def test_single_query_lookups(self):
+        """Test ancestors, descendants, depth and cycle checks each take one query"""
+        with self.assertNumQueries(1):
+            subtasks = self.root.get_all_subtasks()
+        self.assertEqual(subtasks, self.chain[1:])
+        with self.assertNumQueries(1):
+            parents = self.leaf.get_all_parent_tasks()
+        self.assertEqual(parents, list(reversed(self.chain[:-1])))
+        with self.assertNumQueries(1):
+            self.assertEqual(self.leaf.get_dependency_level(), 29)
+        with self.assertNumQueries(1):
+            self.assertTrue(self.root.has_circular_dependency(self.leaf))
+        with self.assertNumQueries(1):
+            self.assertFalse(self.leaf.has_circular_dependency(self.root))
+        self.assertTrue(self.root.has_circular_dependency(self.root))
+
+    def test_set_parent_updates_subtree_chains(self):
+        """Test moving a subtree rebuilds the chains of every task below it"""
+        other_root = Task.objects.create(column=self.column, title='Other epic', created_by=self.user)
+        middle = self.chain[10]
+
+        response = self.client.post(
+            reverse('set_parent_task_api', args=[middle.id]),
+            data=json.dumps({'parent_task_id': other_root.id}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.json()['dependency_chain'], [other_root.id, middle.id])
+        self.leaf.refresh_from_db()
+        self.assertEqual(self.leaf.dependency_chain, [other_root.id] + [task.id for task in self.chain[10:]])
+
+        response = self.client.post(
+            reverse('set_parent_task_api', args=[other_root.id]),
+            data=json.dumps({'parent_task_id': self.leaf.id}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class TaskSimilarityTestCase(TestCase):
+    """Test dependency suggestions served from the cached board similarity index"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='simuser', password='pass123')
+        organization = Organization.objects.create(name='Sim Org', domain='sim.com', created_by=self.user)
+        self.board = Board.objects.create(name='Sim Board', organization=organization, created_by=self.user)
+        self.todo = Column.objects.create(board=self.board, name='To Do', position=0)
+        self.review = Column.objects.create(board=self.board, name='Review', position=1)
+
+        self.schema = self._task('Database schema', self.todo, 'Design the database schema for invoices')
+        self.api = self._task('Invoice API', self.todo, 'Design the REST endpoints for invoices and payments')
+        self.tests = self._task(
+            'Schema tests', self.review,
+            'Write tests to validate the invoice database schema. Requires database schema first'
+        )
+        self.similar = self._task('Schema tests again', self.review, self.tests.description)
+        self._task('Team lunch', self.todo, 'Book a table for the team lunch on friday')
+        self._task('No text', self.todo, '')
+
+    def _task(self, title, column, description):
+        return Task.objects.create(column=column, title=title, description=description, created_by=self.user)
+
+    def test_suggestions(self):
+        """Test parent, related and blocking suggestions for a board"""
+        result = DependencyAnalyzer.analyze_task_description(self.tests, self.board)
+
+        # Mentioned by title after a dependency keyword, with the keyword pair and an earlier column
+        self.assertEqual(result['parent_suggestions'][0]['task_id'], self.schema.id)
+        self.assertEqual(result['parent_suggestions'][0]['confidence'], 0.9)
+        self.assertEqual(result['parent_suggestions'][1]['task_id'], self.api.id)
+        self.assertEqual(result['parent_suggestions'][1]['confidence'], 0.6)
+        self.assertEqual([s['task_id'] for s in result['related_suggestions']], [self.similar.id])
+        self.assertEqual(result['related_suggestions'][0]['confidence'], 1.0)
+        self.assertEqual(result['blocking_suggestions'], [])
+        self.assertTrue(result['analysis'].startswith('Found 2 potential parent tasks, 1 related tasks'))
+
+        blocked = self._task('Blocked', self.review, 'Pending: blocks release, waiting for design sign-off')
+        result = DependencyAnalyzer.analyze_task_description(blocked, self.board)
+        self.assertEqual(len(result['blocking_suggestions']), 3)
+        self.assertEqual(result['blocking_suggestions'][0]['confidence'], 0.9)
+
+    def test_tfidf_scores(self):
+        """Test cosine similarity ignores stop words and weighs rare terms"""
+        index = TaskSimilarityService([
+            {'id': 1, 'title': 'A', 'description': 'the invoice pdf export', 'column_position': 0},
+            {'id': 2, 'title': 'B', 'description': 'invoice pdf export for the client', 'column_position': 0},
+            {'id': 3, 'title': 'C', 'description': 'the the the', 'column_position': 0},
+        ])
+        count, related = index.related[0]
+        self.assertEqual(count, 1)
+        self.assertEqual(related[0][0], 1)
+        self.assertGreater(related[0][1], 0.6)
+        self.assertEqual(index.related[2], (0, []))
+
+    def test_index_scales_to_large_boards(self):
+        """Test words shared by many tasks do not make building the index quadratic"""
+        common = [f'common{i}' for i in range(30)]
+        tasks = [
+            {'id': i, 'title': f'Task {i}', 'column_position': 0,
+             'description': ' '.join(common[i % 15:i % 15 + 15] + [f'rare{i}', f'rare{i // 2}'])}
+            for i in range(5000)
+        ]
+        index = TaskSimilarityService(tasks)
+        # Every task shares common words with every other, yet few pairs are scored
+        self.assertLess(index.candidate_pairs, 10 * len(tasks))
+        # Tasks sharing a rare word are still found
+        self.assertIn(1, [j for j, _ in index.related[0][1]])
+
+    def test_related_matches_brute_force_when_postings_are_capped(self):
+        """Test pairs found through a rare word keep the score of the common words left out of the search"""
+        import math
+        from collections import Counter
+        from .utils.task_similarity_service import STOP_WORDS, tokenize
+
+        common = [f'common{i}' for i in range(30)]
+        tasks = [
+            {'id': i, 'title': f'Task {i}', 'column_position': 0,
+             'description': ' '.join([f'rare{i // 2}'] + [common[(i + k) % 30] for k in range(15)] + [f'own{i}'])}
+            for i in range(200)
+        ]
+        index = TaskSimilarityService(tasks)
+        with patch.object(TaskSimilarityService, 'MIN_MAX_POSTINGS', len(tasks)):
+            self.assertGreater(TaskSimilarityService(tasks).candidate_pairs, index.candidate_pairs)
+
+        counts = [Counter(w for w in tokenize(task['description']) if w not in STOP_WORDS) for task in tasks]
+        document_frequency = Counter(term for terms in counts for term in terms)
+        vectors = []
+        for terms in counts:
+            weights = {t: tf * (math.log(201 / (1 + document_frequency[t])) + 1) for t, tf in terms.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values()))
+            vectors.append({t: w / norm for t, w in weights.items()})
+        expected = []
+        for i, vector in enumerate(vectors):
+            scores = [(j, sum(w * other.get(t, 0.0) for t, w in vector.items())) for j, other in enumerate(vectors)]
+            matches = sorted(((j, s) for j, s in scores if j != i and s > 0.6), key=lambda m: (-m[1], m[0]))
+            expected.append((len(matches), [(j, round(s, 2)) for j, s in matches[:3]]))
+
+        self.assertEqual(sum(count for count, _ in expected), 200)
+        self.assertEqual(index.related, expected)
+
+    def test_index_is_cached_until_tasks_change(self):
+        """Test analysis reuses the index, and saving suggestions does not invalidate it"""
+        analyze_and_suggest_dependencies(self.tests, self.board)
+        with patch.object(TaskSimilarityService, '_related', wraps=lambda tokens: []) as related:
+            analyze_and_suggest_dependencies(self.api, self.board)
+            related.assert_not_called()
+
+        self.api.description = self.schema.description
+        self.api.save()
+        with self.assertNumQueries(2):  # Task count and latest edit, then the rebuilt index's tasks
+            result = DependencyAnalyzer.analyze_task_description(self.api, self.board)
+        self.assertIn(self.schema.id, [s['task_id'] for s in result['related_suggestions']])
+
+    def test_per_process_cache_follows_edits_from_other_processes(self):
+        """Test an edit that never bumped this process's version still rebuilds the index"""
+        DependencyAnalyzer.analyze_task_description(self.api, self.board)
+        # As saved by another worker: the row changes but this cache's version does not
+        Task.objects.filter(id=self.api.id).update(
+            description=self.schema.description, updated_at=timezone.now() + timedelta(seconds=1)
+        )
+        result = DependencyAnalyzer.analyze_task_description(self.api, self.board)
+        self.assertIn(self.schema.id, [s['task_id'] for s in result['related_suggestions']])
+
+    @patch.object(BoardAccessService, 'cache_is_shared', return_value=True)
+    def test_shared_cache_relies_on_version(self, cache_is_shared):
+        """Test a shared cache keys on the version and task count alone"""
+        DependencyAnalyzer.analyze_task_description(self.api, self.board)
+        with self.assertNumQueries(1):  # Task count only
+            DependencyAnalyzer.analyze_task_description(self.api, self.board)
+
+    def test_command_incremental(self):
+        """Test the command stores suggestions in bulk and incremental runs skip unedited tasks"""
+        out = StringIO()
+        call_command('analyze_task_dependencies', board_id=self.board.id, auto_link=True, stdout=out)
+        self.assertIn('Successfully analyzed 6 tasks', out.getvalue())
+        self.assertFalse(Task.objects.filter(column__board=self.board, last_dependency_analysis__isnull=True).exists())
+        self.tests.refresh_from_db()
+        self.assertEqual(self.tests.suggested_dependencies['suggestions']['parent_suggestions'][0]['task_id'],
+                         self.schema.id)
+        self.assertEqual(self.tests.parent_task_id, self.schema.id)  # Auto-linked at 0.9
+
+        out = StringIO()
+        call_command('analyze_task_dependencies', incremental=True, stdout=out)
+        self.assertIn('analyzed 0 tasks', out.getvalue())
+        self.assertIn('skipped 6 unchanged', out.getvalue())
+
+        self.api.description = 'Implement the REST endpoints for invoices'
+        self.api.save()
+        out = StringIO()
+        call_command('analyze_task_dependencies', incremental=True, stdout=out)
+        self.assertIn('analyzed 1 tasks', out.getvalue())
+
+    def test_auto_link_skips_tasks_naming_each_other(self):
+        """Test auto-linking in one batch cannot make two tasks each other's parent"""
+        alpha = self._task('Alpha module', self.todo, 'Test and implement, requires Beta module after review')
+        beta = self._task('Beta module', self.todo, 'Test and implement, requires Alpha module after review')
+
+        counts = analyze_board_dependencies(self.board.id, task_ids=[alpha.id, beta.id], auto_link=True)
+        alpha.refresh_from_db()
+        beta.refresh_from_db()
+        self.assertEqual(counts['linked'], 1)
+        self.assertEqual(alpha.parent_task_id, beta.id)
+        self.assertIsNone(beta.parent_task_id)
+
+    def test_command_workers(self):
+        """Test --workers hands each board to the process pool"""
+        other = Board.objects.create(name='Other Board', organization=self.board.organization, created_by=self.user)
+        self._task('Other', Column.objects.create(board=other, name='To Do', position=0), 'Plan the roadmap')
+
+        class InlineExecutor:
+            def __init__(self, max_workers, initializer):
+                self.max_workers = max_workers
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                return False
+
+            def submit(self, fn, *args):
+                future = Future()
+                future.set_result(fn(*args))
+                return future
+
+        out = StringIO()
+        with patch('kanban.management.commands.analyze_task_dependencies.ProcessPoolExecutor', InlineExecutor):
+            call_command('analyze_task_dependencies', workers=2, stdout=out)
+        self.assertIn('[2/2]', out.getvalue())
+        self.assertIn('Successfully analyzed 7 tasks', out.getvalue())
+
+    def test_command_reports_failed_boards(self):
+        """Test a failed board is named in the output and counted in the summary"""
+        out = StringIO()
+        with patch('kanban.management.commands.analyze_task_dependencies.analyze_board_dependencies',
+                   side_effect=RuntimeError('database is locked')):
+            call_command('analyze_task_dependencies', board_id=self.board.id, stdout=out)
+        self.assertIn(f'Error analyzing board {self.board.id}: database is locked', out.getvalue())
+        self.assertIn('1 errors', out.getvalue())
+
+
+class DemandForecastTestCase(TestCase):
+    """Test team forecasts built from one grouped task aggregation"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='forecastowner', password='pass123')
+        organization = Organization.objects.create(name='Forecast Org', domain='forecast.com', created_by=self.owner)
+        self.board = Board.objects.create(name='Forecast Board', organization=organization, created_by=self.owner)
+        column = Column.objects.create(board=self.board, name='To Do', position=0)
+        done = Column.objects.create(board=self.board, name='Done', position=1)
+
+        self.busy = User.objects.create_user(username='busy', password='pass123')
+        self.light = User.objects.create_user(username='light', password='pass123')
+        self.idle = User.objects.create_user(username='idle', password='pass123')
+        self.board.members.add(self.busy, self.light, self.idle)
+
+        for i in range(10):
+            Task.objects.create(column=column, title=f'Busy {i}', priority='high', assigned_to=self.busy,
+                                created_by=self.owner)
+        for i in range(6):
+            Task.objects.create(column=done, title=f'Done {i}', is_done=True, assigned_to=self.light,
+                                created_by=self.owner)
+        Task.objects.create(column=column, title='Light', priority='low', assigned_to=self.light, created_by=self.owner)
+
+    def test_team_forecast(self):
+        """Test workloads, confidence and alerts match the per-member formulas"""
+        service = DemandForecastingService()
+        # Members, task counts, profiles, the two activity series, then both bulk inserts in a savepoint
+        with self.assertNumQueries(9):
+            result = service.generate_team_forecast(self.board)
+
+        forecasts = {f.resource_user: f for f in ResourceDemandForecast.objects.filter(board=self.board)}
+        self.assertEqual(forecasts[self.busy].predicted_workload_hours, Decimal('144.00'))  # (10 * 8 + 10 * 4) * 1.2
+        self.assertEqual(forecasts[self.light].predicted_workload_hours, Decimal('9.60'))
+        self.assertEqual(forecasts[self.idle].predicted_workload_hours, Decimal('0.00'))
+        self.assertEqual(forecasts[self.busy].available_capacity_hours, Decimal('120.00'))
+        self.assertEqual(forecasts[self.busy].confidence_score, Decimal('0.65'))
+        self.assertEqual(forecasts[self.light].confidence_score, Decimal('0.65'))  # Done tasks count as history
+        self.assertEqual(forecasts[self.idle].confidence_score, Decimal('0.50'))
+
+        alert = TeamCapacityAlert.objects.get(board=self.board)
+        self.assertEqual(alert.forecast, forecasts[self.busy])
+        self.assertEqual(alert.alert_level, 'critical')
+        self.assertEqual(alert.workload_percentage, 120)
+        self.assertEqual(len(result['forecasts']), 3)
+        self.assertEqual(result['alerts'], [alert])
+
+    def test_arrival_trend_and_calendar(self):
+        """Test predicted workload follows task arrivals and capacity follows the availability calendar"""
+        organization = self.board.organization
+        UserProfile.objects.create(user=self.light, organization=organization, availability_schedule={
+            'monday': {'start': '09:00', 'end': '13:00'},
+            'wednesday': {'start': '09:00', 'end': '13:00'},
+            'friday': {'start': '09:00', 'end': '13:00'},
+        })
+        UserProfile.objects.create(user=self.idle, organization=organization, weekly_capacity_hours=20)
+
+        task = Task.objects.get(title='Light')
+        now = timezone.now()
+        for day in range(1, 57):  # One new task a day over the whole history window
+            activity = TaskActivity.objects.create(task=task, user=self.owner, activity_type='created',
+                                                   description='Created')
+            TaskActivity.objects.filter(id=activity.id).update(created_at=now - timedelta(days=day))
+
+        result = DemandForecastingService().generate_team_forecast(self.board)
+        forecasts = {f.resource_user: f for f in result['forecasts']}
+        self.assertEqual(result['trends'][self.light.id]['arrivals'], 21)
+        self.assertEqual(forecasts[self.light].predicted_workload_hours, Decimal('176'))  # 8 + 21 * 8
+        self.assertEqual(forecasts[self.light].available_capacity_hours, Decimal('36'))  # 3 weeks of 3 x 4h
+        self.assertEqual(forecasts[self.idle].available_capacity_hours, Decimal('60'))  # 20h a week over 3 weeks
+        self.assertEqual(forecasts[self.busy].predicted_workload_hours, Decimal('144.0'))  # No history: 20% buffer
+
+    def test_weekday_seasonality(self):
+        """Test the smoothed forecast keeps a weekly pattern"""
+        monday = date(2026, 1, 5)
+        mondays_only = [1 if day % 7 == 0 else 0 for day in range(56)]
+        self.assertAlmostEqual(ThroughputForecaster.smoothed_total(mondays_only, monday, date(2026, 3, 2), 7), 1.0)
+        self.assertEqual(ThroughputForecaster.smoothed_total(mondays_only, monday, date(2026, 3, 3), 6), 0)
+        self.assertAlmostEqual(ThroughputForecaster.smoothed_total([2] * 56, monday, date(2026, 3, 3), 10), 20.0)
+
+
 if __name__ == '__main__':
     import unittest
     unittest.main()
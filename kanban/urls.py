@@ -6,6 +6,7 @@ from . import forecasting_views
 urlpatterns = [
     path('', views.welcome, name='welcome'),
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('api/dashboard/tasks/<str:list_name>/', views.dashboard_tasks_api, name='dashboard_tasks_api'),
     
     # Getting Started Wizard
     path('getting-started/', views.getting_started_wizard, name='getting_started_wizard'),
@@ -27,9 +28,11 @@ urlpatterns = [
     path('boards/<int:board_id>/join/', views.join_board, name='join_board'),
     path('boards/<int:board_id>/export/', views.export_board, name='export_board'),
     path('boards/import/', views.import_board, name='import_board'),
+    path('api/board-imports/<slug:import_id>/progress/', api_views.import_progress_api, name='import_progress_api'),
     path('tasks/<int:task_id>/', views.task_detail, name='task_detail'),
     path('tasks/<int:task_id>/delete/', views.delete_task, name='delete_task'),
     path('tasks/move/', views.move_task, name='move_task'),
+    path('tasks/reorder-multiple/', views.reorder_multiple_tasks, name='reorder_multiple_tasks'),
     path('tasks/<int:task_id>/update-progress/', views.update_task_progress, name='update_task_progress'),
     path('organization-boards/', views.organization_boards, name='organization_boards'),
     path('labels/<int:label_id>/delete/', views.delete_label, name='delete_label'),
@@ -49,7 +52,16 @@ urlpatterns = [
     path('api/predict-deadline/', api_views.predict_deadline_api, name='predict_deadline_api'),
     path('api/recommend-columns/', api_views.recommend_columns_api, name='recommend_columns_api'),
     path('api/suggest-task-breakdown/', api_views.suggest_task_breakdown_api, name='suggest_task_breakdown_api'),
-    path('api/analyze-workflow-optimization/', api_views.analyze_workflow_optimization_api, name='analyze_workflow_optimization_api'),    path('api/create-subtasks/', api_views.create_subtasks_api, name='create_subtasks_api'),
+    path('api/analyze-workflow-optimization/', api_views.analyze_workflow_optimization_api, name='analyze_workflow_optimization_api'),
+    path('api/analyze-critical-path/', api_views.analyze_critical_path_api, name='analyze_critical_path_api'),
+    path('api/generate-project-timeline/', api_views.generate_project_timeline_api, name='generate_project_timeline_api'),
+    path('api/ai-jobs/<int:job_id>/', api_views.ai_job_status_api, name='ai_job_status_api'),
+    path('api/board/<int:board_id>/snapshot/', api_views.board_snapshot_api, name='board_snapshot_api'),    path('api/create-subtasks/', api_views.create_subtasks_api, name='create_subtasks_api'),
+    path('api/board/<int:board_id>/search/', api_views.search_tasks_api, name='search_tasks_api'),
+    path('api/board/<int:board_id>/flow/cumulative/', api_views.cumulative_flow_api, name='cumulative_flow_api'),
+    path('api/board/<int:board_id>/flow/burndown/', api_views.burndown_api, name='burndown_api'),
+    path('api/board/<int:board_id>/flow/throughput/', api_views.throughput_api, name='throughput_api'),
+    path('api/board/<int:board_id>/flow/cycle-time/', api_views.cycle_time_api, name='cycle_time_api'),
     
     # Meeting Transcript Extraction
     path('boards/<int:board_id>/meeting-transcript/', views.meeting_transcript_extraction, name='meeting_transcript_extraction'),
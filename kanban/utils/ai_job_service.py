@@ -0,0 +1,283 @@
+"""
+AI Job Service for TaskFlow
+Runs long Gemini analyses on a Celery worker. Requests queue an AIJob and
+return straight away; clients poll the job status endpoint or wait for the
+completion event on their notification WebSocket.
+"""
+
+import logging
+from typing import Dict, Any
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class AIJobError(Exception):
+    """An AI job finished without a usable result"""
+
+
+class AIJobService:
+    """
+    Service for queueing and running AIJob records
+    Each job kind maps to a runner that turns the job's params into a
+    JSON-safe result (the same body the synchronous endpoint used to return)
+    """
+
+    RUNNERS = {
+        'workflow_optimization': '_run_workflow_optimization',
+        'critical_path': '_run_critical_path',
+        'project_timeline': '_run_project_timeline',
+        'transcript_extraction': '_run_transcript_extraction',
+        'task_risk': '_run_task_risk',
+    }
+
+    @classmethod
+    def enqueue(cls, user, kind, params=None, board=None, task=None):
+        """
+        Create a job and hand it to Celery once the current transaction commits
+
+        If the broker cannot be reached the job runs in-process instead, so
+        the feature keeps working (slowly) without a worker.
+
+        Returns:
+            The queued AIJob
+        """
+        from kanban.models import AIJob
+        from kanban.tasks import run_ai_job
+
+        job = AIJob.objects.create(
+            kind=kind,
+            user=user,
+            board=board,
+            task=task,
+            params=params or {}
+        )
+
+        def dispatch():
+            try:
+                run_ai_job.delay(job.id)
+            except Exception as e:
+                logger.warning(f"Could not queue AI job {job.id}, running inline: {e}")
+                run_ai_job(job.id)
+
+        transaction.on_commit(dispatch)
+        return job
+
+    @classmethod
+    def run(cls, job_id):
+        """Execute a queued job and record its outcome"""
+        from kanban.models import AIJob
+
+        # Claim the job so a redelivered message does not run it twice
+        claimed = AIJob.objects.filter(id=job_id, status='queued').update(
+            status='running', started_at=timezone.now()
+        )
+        if not claimed:
+            return None
+
+        job = AIJob.objects.select_related('board', 'task', 'user').get(id=job_id)
+        try:
+            job.result = getattr(cls, cls.RUNNERS[job.kind])(job)
+            job.status = 'succeeded'
+        except Exception as e:
+            logger.error(f"AI job {job.id} ({job.kind}) failed: {e}")
+            job.error = str(e)
+            job.status = 'failed'
+
+        job.finished_at = timezone.now()
+        job.save(update_fields=['result', 'status', 'error', 'finished_at'])
+        cls.notify(job)
+        return job
+
+    @staticmethod
+    def notify(job):
+        """Push the finished job to the owner's notification WebSocket"""
+        from messaging.utils.unread_counters import notification_group_name
+
+        def send():
+            channel_layer = get_channel_layer()
+            if channel_layer is None:
+                return
+            try:
+                async_to_sync(channel_layer.group_send)(notification_group_name(job.user_id), {
+                    'type': 'ai_job_update',
+                    'job': job.as_dict(),
+                })
+            except Exception as e:
+                logger.warning(f"Could not push AI job {job.id} to user {job.user_id}: {e}")
+
+        transaction.on_commit(send)
+
+    # Inputs gathered from the database on the worker
+
+    @staticmethod
+    def build_workflow_analytics(board) -> Dict[str, Any]:
+        """Board analytics used by the workflow optimization prompt"""
+        from kanban.models import Task
+
+        all_tasks = Task.objects.filter(column__board=board)
+        total_tasks = all_tasks.count()
+
+        # Calculate average completion time
+        completed_tasks = all_tasks.filter(is_done=True)
+        avg_completion_time = 5  # Default
+        days = []
+        for completed_at, updated_at, created_at in completed_tasks.values_list('completed_at', 'updated_at', 'created_at'):
+            finished_at = completed_at or updated_at
+            if finished_at and created_at and (finished_at - created_at).days > 0:
+                days.append((finished_at - created_at).days)
+        if days:
+            avg_completion_time = sum(days) / len(days)
+
+        # Task distribution by column
+        tasks_by_column = [
+            {'name': column.name, 'count': column.task_count}
+            for column in board.columns.annotate(task_count=Count('tasks'))
+        ]
+
+        # Task distribution by priority
+        priority_names = dict(Task.PRIORITY_CHOICES)
+        tasks_by_priority = [
+            {'priority': priority_names.get(item['priority'], item['priority']), 'count': item['count']}
+            for item in all_tasks.values('priority').annotate(count=Count('id'))
+        ]
+
+        # Task distribution by user
+        completed_by_user = dict(
+            completed_tasks.values_list('assigned_to__username').annotate(count=Count('id'))
+        )
+        tasks_by_user = []
+        for item in all_tasks.values('assigned_to__username').annotate(count=Count('id')):
+            completed_user_tasks = completed_by_user.get(item['assigned_to__username'], 0)
+            tasks_by_user.append({
+                'username': item['assigned_to__username'] or 'Unassigned',
+                'count': item['count'],
+                'completion_rate': int(completed_user_tasks / item['count'] * 100) if item['count'] else 0
+            })
+
+        total_progress = sum(all_tasks.values_list('progress', flat=True))
+
+        return {
+            'total_tasks': total_tasks,
+            'tasks_by_column': tasks_by_column,
+            'tasks_by_priority': tasks_by_priority,
+            'tasks_by_user': tasks_by_user,
+            'avg_completion_time_days': avg_completion_time,
+            'overdue_count': all_tasks.filter(is_done=False, due_date__lt=timezone.now()).count(),
+            'productivity': total_progress / total_tasks if total_tasks else 0,
+            'weekly_velocity': []  # Could be enhanced with historical data
+        }
+
+    @staticmethod
+    def build_board_data(board) -> Dict[str, Any]:
+        """Task, team and board details used by the critical path and timeline prompts"""
+        from kanban.models import Task
+
+        tasks = Task.objects.filter(column__board=board).select_related('column', 'assigned_to')
+        return {
+            'board_info': {'name': board.name, 'description': board.description or ''},
+            'tasks': [
+                {
+                    'id': task.id,
+                    'title': task.title,
+                    'due_date': task.due_date.isoformat() if task.due_date else 'Not set',
+                    'start_date': task.start_date.isoformat() if task.start_date else None,
+                    'progress': task.progress,
+                    'assigned_to': task.assigned_to.username if task.assigned_to else 'Unassigned',
+                    'column_name': task.column.name,
+                    'priority': task.priority,
+                    'is_done': task.is_done,
+                }
+                for task in tasks
+            ],
+            'team': [
+                {'username': username}
+                for username in board.members.values_list('username', flat=True)
+            ],
+        }
+
+    # Runners
+
+    @classmethod
+    def _run_workflow_optimization(cls, job):
+        from kanban.utils.ai_utils import analyze_workflow_optimization
+
+        result = analyze_workflow_optimization(cls.build_workflow_analytics(job.board))
+        if not result:
+            raise AIJobError('Failed to analyze workflow')
+        return result
+
+    @staticmethod
+    def _run_critical_path(job):
+        from kanban.utils.ai_utils import analyze_critical_path
+        from kanban.utils.critical_path_service import CriticalPathService
+
+        # The schedule is computed here; the model only narrates it
+        result = analyze_critical_path({
+            'board_info': {'name': job.board.name, 'description': job.board.description or ''},
+            'schedule': CriticalPathService(job.board).report(),
+        })
+        if not result:
+            raise AIJobError('Failed to analyze critical path')
+        return result
+
+    @classmethod
+    def _run_project_timeline(cls, job):
+        from kanban.utils.ai_utils import generate_project_timeline
+
+        result = generate_project_timeline(cls.build_board_data(job.board))
+        if not result:
+            raise AIJobError('Failed to generate project timeline')
+        return result
+
+    @staticmethod
+    def _run_transcript_extraction(job):
+        from kanban.utils.ai_utils import extract_tasks_from_transcript
+
+        result = extract_tasks_from_transcript(
+            job.params.get('transcript', ''),
+            job.params.get('meeting_context', {}),
+            job.board
+        )
+        if not result:
+            raise AIJobError('Failed to extract tasks from transcript')
+        return result
+
+    @staticmethod
+    def _run_task_risk(job):
+        from kanban.utils.ai_utils import ai_cache_scope, calculate_task_risk_score
+
+        params = job.params
+        board_context = f"Board: {job.board.name}. Description: {job.board.description or 'N/A'}"
+        with ai_cache_scope(task=job.task, bypass=bool(params.get('refresh'))):
+            risk_analysis = calculate_task_risk_score(
+                params.get('title', ''),
+                params.get('description', ''),
+                params.get('priority', 'medium'),
+                board_context
+            )
+        if not risk_analysis:
+            raise AIJobError('Failed to calculate risk score')
+
+        # Save the analysis to the task it was requested for
+        task = job.task
+        if task:
+            task.risk_likelihood = risk_analysis.get('likelihood', {}).get('score')
+            task.risk_impact = risk_analysis.get('impact', {}).get('score')
+            task.risk_score = risk_analysis.get('risk_assessment', {}).get('risk_score')
+            task.risk_level = risk_analysis.get('risk_assessment', {}).get('risk_level', 'low').lower()
+            task.risk_indicators = risk_analysis.get('risk_indicators', [])
+            task.mitigation_suggestions = risk_analysis.get('mitigation_suggestions', [])
+            task.risk_analysis = risk_analysis
+            task.last_risk_assessment = timezone.now()
+            task.save()
+
+        return {
+            'success': True,
+            'risk_analysis': risk_analysis,
+            'saved': bool(task)
+        }
@@ -5,13 +5,24 @@ This module provides helper functions to call the Gemini API for various
 AI-powered features in the TaskFlow application.
 """
 import os
+import asyncio
+import contextvars
+import hashlib
 import logging
+import random
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 import json
 
 import google.generativeai as genai
+from asgiref.sync import sync_to_async
+from google.api_core import exceptions as google_exceptions
 from django.conf import settings
+from django.core.cache import cache
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -60,7 +71,94 @@ def get_model():
         logger.error(f"Error getting Gemini model: {str(e)}")
         return None
 
-def generate_ai_content(prompt: str) -> Optional[str]:
+# Seconds to keep cached responses, per AI function. Override any entry with
+# AI_ASSISTANT_CONFIG['CACHE_TTLS']; unlisted functions use CACHE_TTL.
+AI_CACHE_TTLS = {
+    'generate_task_description': 60 * 60 * 24,
+    'summarize_comments': 60 * 60,
+    'suggest_lean_classification': 60 * 60 * 24,
+    'summarize_board_analytics': 60 * 15,
+    'suggest_task_priority': 60 * 60,
+    'predict_realistic_deadline': 60 * 60,
+    'recommend_board_columns': 60 * 60 * 24,
+    'suggest_task_breakdown': 60 * 60 * 24,
+    'analyze_workflow_optimization': 60 * 30,
+    'analyze_critical_path': 60 * 30,
+    'predict_task_completion': 60 * 60,
+    'generate_project_timeline': 60 * 30,
+    'enhance_task_description': 60 * 60 * 24,
+    'calculate_task_risk_score': 60 * 60,
+    'generate_risk_mitigation_suggestions': 60 * 60,
+    'assess_task_dependencies_and_risks': 60 * 60,
+}
+
+_ai_cache_scope = contextvars.ContextVar('ai_cache_scope', default={})
+
+@contextmanager
+def ai_cache_scope(task=None, bypass: bool = False):
+    """
+    Scope cached AI responses for the calls made inside the block.
+    
+    Args:
+        task: Task the calls are about; its updated_at becomes part of the
+              cache key, so editing the task invalidates its cached responses
+        bypass: Skip cached responses and call Gemini (the fresh response
+                still replaces the cached one)
+    """
+    version = ''
+    if task is not None and getattr(task, 'pk', None):
+        version = f'task:{task.pk}:{task.updated_at.isoformat() if task.updated_at else ""}'
+    token = _ai_cache_scope.set({'version': version, 'bypass': bypass})
+    try:
+        yield
+    finally:
+        _ai_cache_scope.reset(token)
+
+def ai_cache_key(function_name: str, prompt: str) -> str:
+    """Content-addressed key: the same prompt for the same task version shares a response"""
+    version = _ai_cache_scope.get().get('version', '')
+    digest = hashlib.sha256(f'{version}\n{prompt}'.encode('utf-8')).hexdigest()
+    return f'ai:response:{function_name}:{digest}'
+
+def _ai_cache_ttl(function_name: str) -> int:
+    ttls = get_ai_config('CACHE_TTLS', {})
+    if function_name in ttls:
+        return ttls[function_name]
+    return AI_CACHE_TTLS.get(function_name, get_ai_config('CACHE_TTL', 3600))
+
+def _record_ai_cache(function_name: str, outcome: str):
+    key = f'ai:metrics:{function_name}:{outcome}'
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+def get_ai_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counts for each cached AI function"""
+    keys = [f'ai:metrics:{name}:{outcome}' for name in AI_CACHE_TTLS for outcome in ('hits', 'misses')]
+    values = cache.get_many(keys)
+    return {
+        name: {
+            'hits': values.get(f'ai:metrics:{name}:hits', 0),
+            'misses': values.get(f'ai:metrics:{name}:misses', 0),
+        }
+        for name in AI_CACHE_TTLS
+    }
+
+def _cached_ai_response(function_name: Optional[str], prompt: str):
+    """Return (cache_key, cached_text); the key is None when caching does not apply"""
+    if not function_name:
+        return None, None
+    key = ai_cache_key(function_name, prompt)
+    if _ai_cache_scope.get().get('bypass'):
+        return key, None
+    
+    cached = cache.get(key)
+    _record_ai_cache(function_name, 'hits' if cached is not None else 'misses')
+    return key, cached
+
+def generate_ai_content(prompt: str, cache_as: Optional[str] = None) -> Optional[str]:
     """
     Generate content using Gemini API with proper session handling.
     
@@ -71,11 +169,17 @@ def generate_ai_content(prompt: str) -> Optional[str]:
     
     Args:
         prompt: The prompt to send to the Gemini API
+        cache_as: Name of the calling AI function; when given, responses are
+                  cached by prompt hash for that function's TTL
         
     Returns:
         Generated content or None if generation fails
     """
     try:
+        cache_key, cached = _cached_ai_response(cache_as, prompt)
+        if cached is not None:
+            return cached
+        
         model = get_model()
         if not model:
             logger.error("Gemini model not available")
@@ -83,10 +187,159 @@ def generate_ai_content(prompt: str) -> Optional[str]:
         
         # Generate content without any conversation history
         # This ensures no "History Restored" messages and no token waste
-        response = model.generate_content(prompt)
+        response = generate_content(model, prompt)
         
         if response and response.text:
-            return response.text.strip()
+            text = response.text.strip()
+            if cache_key:
+                cache.set(cache_key, text, _ai_cache_ttl(cache_as))
+            return text
+        
+        logger.warning("Empty response from Gemini API")
+        return None
+        
+    except Exception as e:
+        logger.error(f"Error generating AI content: {str(e)}")
+        return None
+
+def get_ai_config(key, default):
+    """Read a value from settings.AI_ASSISTANT_CONFIG"""
+    return getattr(settings, 'AI_ASSISTANT_CONFIG', {}).get(key, default)
+
+# Upstream errors worth retrying: rate limits, overload and timeouts
+RETRYABLE_AI_ERRORS = (
+    asyncio.TimeoutError,
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+
+# asyncio primitives belong to one event loop, so keep a semaphore per loop
+_ai_semaphores = weakref.WeakKeyDictionary()
+
+def _get_ai_semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _ai_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(get_ai_config('MAX_CONCURRENT_REQUESTS', 8))
+        _ai_semaphores[loop] = semaphore
+    return semaphore
+
+def retry_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """Exponential backoff with full jitter so retries from many callers spread out"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+async def generate_content_async(model, prompt: str):
+    """
+    Call a Gemini model without blocking the event loop.
+    
+    At most AI_ASSISTANT_CONFIG['MAX_CONCURRENT_REQUESTS'] calls run at once
+    per event loop, each call is cut off after RESPONSE_TIMEOUT seconds and
+    transient failures are retried MAX_RETRIES times with jittered backoff.
+    
+    Args:
+        model: A GenerativeModel instance
+        prompt: The prompt to send
+        
+    Returns:
+        The Gemini response
+        
+    Raises:
+        The last error if every attempt fails
+    """
+    timeout = get_ai_config('RESPONSE_TIMEOUT', 30)
+    retries = get_ai_config('MAX_RETRIES', 2)
+    
+    for attempt in range(retries + 1):
+        try:
+            async with _get_ai_semaphore():
+                return await asyncio.wait_for(
+                    model.generate_content_async(prompt, request_options={'timeout': timeout}),
+                    timeout
+                )
+        except RETRYABLE_AI_ERRORS as e:
+            if attempt == retries:
+                raise
+            delay = retry_delay(attempt)
+            logger.warning(f"Gemini call failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            # Back off outside the semaphore so waiting callers can use the slot
+            await asyncio.sleep(delay)
+
+class AIBusyError(Exception):
+    """Every Gemini slot of this process stayed busy for RESPONSE_TIMEOUT seconds"""
+
+# Sync callers (request threads, Celery workers) share one limit per process
+_ai_sync_semaphore = None
+_ai_sync_semaphore_lock = threading.Lock()
+
+def _get_sync_ai_semaphore():
+    global _ai_sync_semaphore
+    with _ai_sync_semaphore_lock:
+        if _ai_sync_semaphore is None:
+            _ai_sync_semaphore = threading.BoundedSemaphore(get_ai_config('MAX_CONCURRENT_REQUESTS', 8))
+        return _ai_sync_semaphore
+
+def generate_content(model, prompt: str):
+    """
+    Blocking counterpart of generate_content_async for sync views and tasks.
+    
+    At most MAX_CONCURRENT_REQUESTS calls run at once per process; a caller
+    waits up to RESPONSE_TIMEOUT seconds for a slot, then gives up with
+    AIBusyError instead of queueing behind a stalled upstream. Each attempt
+    is cut off after RESPONSE_TIMEOUT and transient failures are retried
+    with the same jittered backoff.
+    
+    Raises:
+        AIBusyError, or the last error if every attempt fails
+    """
+    timeout = get_ai_config('RESPONSE_TIMEOUT', 30)
+    retries = get_ai_config('MAX_RETRIES', 2)
+    semaphore = _get_sync_ai_semaphore()
+    
+    for attempt in range(retries + 1):
+        if not semaphore.acquire(timeout=timeout):
+            raise AIBusyError('Too many Gemini calls in progress')
+        try:
+            return model.generate_content(prompt, request_options={'timeout': timeout})
+        except RETRYABLE_AI_ERRORS as e:
+            if attempt == retries:
+                raise
+            delay = retry_delay(attempt)
+            logger.warning(f"Gemini call failed ({type(e).__name__}), retrying in {delay:.2f}s")
+        finally:
+            semaphore.release()
+        # Back off without holding a slot
+        time.sleep(delay)
+
+async def generate_ai_content_async(prompt: str, cache_as: Optional[str] = None) -> Optional[str]:
+    """
+    Async version of generate_ai_content for async views and Channels consumers.
+    
+    Args:
+        prompt: The prompt to send to the Gemini API
+        cache_as: Name of the calling AI function (see generate_ai_content)
+        
+    Returns:
+        Generated content or None if generation fails
+    """
+    try:
+        cache_key, cached = await sync_to_async(_cached_ai_response)(cache_as, prompt)
+        if cached is not None:
+            return cached
+        
+        model = get_model()
+        if not model:
+            logger.error("Gemini model not available")
+            return None
+        
+        response = await generate_content_async(model, prompt)
+        
+        if response and response.text:
+            text = response.text.strip()
+            if cache_key:
+                await cache.aset(cache_key, text, _ai_cache_ttl(cache_as))
+            return text
         
         logger.warning("Empty response from Gemini API")
         return None
@@ -123,7 +376,7 @@ def generate_task_description(title: str) -> Optional[str]:
         Keep it concise but thorough. Include approximately 4-6 subtasks.
         """
         
-        return generate_ai_content(prompt)
+        return generate_ai_content(prompt, cache_as='generate_task_description')
     except Exception as e:
         logger.error(f"Error generating task description: {str(e)}")
         return None
@@ -157,7 +410,7 @@ def summarize_comments(comments: List[Dict]) -> Optional[str]:
         Provide a brief summary (3-5 sentences).
         """
         
-        return generate_ai_content(prompt)
+        return generate_ai_content(prompt, cache_as='summarize_comments')
     except Exception as e:
         logger.error(f"Error summarizing comments: {str(e)}")
         return None
@@ -193,7 +446,7 @@ def suggest_lean_classification(title: str, description: str) -> Optional[Dict]:
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='suggest_lean_classification')
         if response_text:
             # This is not perfect but extracting the response as if it's JSON
             # In a production app, we'd want better error handling
@@ -273,7 +526,7 @@ def summarize_board_analytics(analytics_data: Dict) -> Optional[str]:
         Keep the summary concise but comprehensive, aimed at helping the project manager make informed decisions.
         """
         
-        return generate_ai_content(prompt)
+        return generate_ai_content(prompt, cache_as='summarize_board_analytics')
     except Exception as e:
         logger.error(f"Error summarizing board analytics: {str(e)}")
         return None
@@ -343,7 +596,7 @@ def suggest_task_priority(task_data: Dict, board_context: Dict) -> Optional[Dict
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='suggest_task_priority')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -424,7 +677,7 @@ def predict_realistic_deadline(task_data: Dict, team_context: Dict) -> Optional[
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='predict_realistic_deadline')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -522,7 +775,7 @@ def recommend_board_columns(board_data: Dict) -> Optional[Dict]:
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='recommend_board_columns')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -591,7 +844,7 @@ def suggest_task_breakdown(task_data: Dict) -> Optional[Dict]:
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='suggest_task_breakdown')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -682,7 +935,7 @@ def analyze_workflow_optimization(board_analytics: Dict) -> Optional[Dict]:
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='analyze_workflow_optimization')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -699,100 +952,65 @@ def analyze_workflow_optimization(board_analytics: Dict) -> Optional[Dict]:
 
 def analyze_critical_path(board_data: Dict) -> Optional[Dict]:
     """
-    Analyze task dependencies and identify critical path using AI.
+    Narrate a computed critical path analysis using AI.
+    
+    The schedule itself (critical path, slack, dates) comes from
+    CriticalPathService; the model only writes recommendations about it.
     
     Args:
-        board_data: Dictionary containing board tasks with dependencies, dates, and durations
+        board_data: Dictionary with 'board_info' and 'schedule' (CriticalPathService.report())
         
     Returns:
-        Dictionary with critical path analysis, slack times, and schedule insights
+        The schedule with AI recommendations added, or the schedule unchanged if generation fails
     """
+    schedule = board_data.get('schedule')
+    if not schedule:
+        return None
     try:
-        tasks_info = board_data.get('tasks', [])
-        if not tasks_info:
-            return None
-              # Format tasks for AI analysis
-        formatted_tasks = []
-        for task in tasks_info:
-            task_str = f"""
-            Task ID: {task.get('id')}
-            Title: {task.get('title')}
-            Due Date: {task.get('due_date', 'Not set')}
-            Progress: {task.get('progress', 0)}%
-            Assigned To: {task.get('assigned_to', 'Unassigned')}
-            Column: {task.get('column_name', 'Unknown')}
-            Priority: {task.get('priority', 'medium')}
-            """
-            formatted_tasks.append(task_str)
-            
+        board_info = board_data.get('board_info', {})
+        insights = schedule.get('project_insights', {})
+        critical_steps = [
+            f"{step['position_in_path']}. {step['task_title']} ({step['earliest_start']} to {step['earliest_finish']})"
+            for step in schedule.get('critical_path', [])
+        ]
+        at_risk = [
+            f"- {task['task_title']}: {', '.join(task['risk_factors'])}"
+            for task in schedule.get('task_analysis', []) if task.get('risk_factors')
+        ]
+        
         prompt = f"""
-        Analyze these project tasks to identify the critical path, calculate slack times, and assess schedule risks.
-        Use project management principles similar to Gantt chart analysis.
-        
-        ## Project Tasks:
-        {chr(10).join(formatted_tasks)}
-          ## Analysis Required:
-        1. **Critical Path Identification**: Find the longest sequence of dependent tasks that determines project duration
-        2. **Slack Time Calculation**: Calculate float time for each task (Latest Start - Earliest Start)
-        3. **Schedule Risk Assessment**: Identify tasks at risk of delays
-        4. **Resource Bottlenecks**: Identify potential resource conflicts
-        5. **Milestone Analysis**: Assess milestone achievability
-        6. **Optimization Opportunities**: Suggest ways to compress the schedule
-        
-        ## Project Management Context:
-        - Tasks with zero slack time are on the critical path
-        - Delays in critical path tasks directly impact project completion
-        - Tasks with high slack can be delayed without affecting the project
-        - Resource conflicts can create bottlenecks even for non-critical tasks
+        A critical path analysis has already been computed for the project "{board_info.get('name', '')}".
+        Do not recalculate it. Explain what it means for the team and recommend actions.
+        
+        ## Schedule:
+        - Project start: {insights.get('project_start_date')}
+        - Earliest completion: {insights.get('project_completion_date')}
+        - Buffer before the last due date: {insights.get('schedule_buffer_hours', 0)} working hours
+        - Tasks that cannot meet their due date or sit in dependency cycles: {insights.get('high_risk_tasks', 0)}
+        
+        ## Critical Path:
+        {chr(10).join(critical_steps) or 'No dependent tasks with dates'}
+        
+        ## Tasks at Risk:
+        {chr(10).join(at_risk[:20]) or 'None'}
         
         CRITICAL: Respond with ONLY valid JSON. No explanations, no additional text.
         
         {{
-            "critical_path": [
-                {{
-                    "task_id": "task_id",
-                    "task_title": "title",
-                    "position_in_path": 1,
-                    "duration_hours": 8,
-                    "earliest_start": "2025-06-19 09:00",
-                    "earliest_finish": "2025-06-19 17:00"
-                }}
-            ],
-            "task_analysis": [
-                {{
-                    "task_id": "task_id",
-                    "task_title": "title",
-                    "earliest_start": "2025-06-19 09:00",
-                    "earliest_finish": "2025-06-19 17:00",
-                    "latest_start": "2025-06-19 09:00",
-                    "latest_finish": "2025-06-19 17:00",
-                    "slack_hours": 0,
-                    "is_critical": true,
-                    "risk_level": "low",
-                    "risk_factors": ["factor1"]
-                }}
-            ],
-            "project_insights": {{
-                "total_duration_hours": 120,
-                "project_completion_date": "2025-07-15",
-                "critical_path_duration": 100,
-                "schedule_buffer_hours": 20,
-                "high_risk_tasks": 3,
-                "resource_conflicts": []
-            }},
             "recommendations": [
                 {{
                     "type": "critical_path",
-                    "title": "Focus on Critical Tasks",
-                    "description": "Prioritize completion of critical path tasks to avoid project delays",
-                    "impact": "high",                    "effort": "medium",
+                    "title": "Short title",
+                    "description": "What to do and why",
+                    "impact": "high",
+                    "effort": "medium",
                     "priority": 1
                 }}
             ]
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='analyze_critical_path')
         if response_text:
             # Handle code block formatting and extract JSON
             if "```json" in response_text:
@@ -800,113 +1018,11 @@ def analyze_critical_path(board_data: Dict) -> Optional[Dict]:
             elif "```" in response_text:
                 response_text = response_text.split("```")[1].strip()
             
-            # Try to find JSON in the response if it's mixed with other text
-            json_start = response_text.find('{')
-            json_end = response_text.rfind('}')
-            
-            if json_start != -1 and json_end != -1 and json_end > json_start:
-                response_text = response_text[json_start:json_end + 1]
-            
-            try:
-                # First attempt: direct JSON parsing
-                return json.loads(response_text)
-            except json.JSONDecodeError as json_error:
-                logger.error(f"JSON parsing error in critical path analysis: {json_error}")
-                logger.error(f"Raw response snippet: {response_text[:500]}...")
-                
-                # Second attempt: Fix common JSON issues
-                try:
-                    import re
-                    # Remove trailing commas
-                    fixed_text = re.sub(r',(\s*[}\]])', r'\1', response_text)
-                    # Fix any unescaped quotes in strings
-                    fixed_text = re.sub(r'(?<!\\)"(?=\w)', r'\\"', fixed_text)
-                    return json.loads(fixed_text)
-                except json.JSONDecodeError:
-                    # Third attempt: Build a valid response from task data
-                    logger.info("Creating fallback response based on actual task data")
-                    
-                    # Calculate actual project insights from the task data
-                    total_duration = sum(task.get('estimated_duration_hours', 8) for task in tasks_info)
-                    high_risk_tasks = len([task for task in tasks_info if task.get('priority') == 'high'])
-                    
-                    return {                        "critical_path": [
-                            {
-                                "task_id": str(task.get('id')),
-                                "task_title": task.get('title', 'Unknown Task'),
-                                "position_in_path": idx + 1,
-                                "earliest_start": "2025-06-19 09:00",
-                                "earliest_finish": "2025-06-20 17:00"
-                            }
-                            for idx, task in enumerate(tasks_info[:5])  # Top 5 tasks as critical path
-                        ],
-                        "task_analysis": [
-                            {
-                                "task_id": str(task.get('id')),
-                                "task_title": task.get('title', 'Unknown Task'),
-                                "earliest_start": "2025-06-19 09:00",
-                                "earliest_finish": "2025-06-20 17:00",
-                                "latest_start": "2025-06-19 09:00",
-                                "latest_finish": "2025-06-20 17:00",
-                                "slack_hours": 0 if task.get('priority') == 'high' else 8,
-                                "is_critical": task.get('priority') == 'high',
-                                "risk_level": task.get('priority', 'medium'),
-                                "risk_factors": ["Resource dependency"] if task.get('assigned_to') else ["Unassigned task"]
-                            }
-                            for task in tasks_info[:10]  # Analyze top 10 tasks
-                        ],
-                        "project_insights": {
-                            "total_duration_hours": total_duration,
-                            "project_completion_date": "2025-08-15",
-                            "critical_path_duration": int(total_duration * 0.6),
-                            "schedule_buffer_hours": int(total_duration * 0.2),
-                            "high_risk_tasks": high_risk_tasks,
-                            "resource_conflicts": []
-                        },
-                        "recommendations": [
-                            {
-                                "type": "critical_path",
-                                "title": "Focus on High-Priority Tasks",
-                                "description": f"You have {high_risk_tasks} high-priority tasks that require immediate attention to stay on schedule.",
-                                "impact": "high",
-                                "effort": "medium",
-                                "priority": 1
-                            },
-                            {
-                                "type": "resources",
-                                "title": "Review Task Dependencies",
-                                "description": "Ensure all task dependencies are properly defined to get accurate critical path analysis.",
-                                "impact": "medium",
-                                "effort": "low",
-                                "priority": 2
-                            }
-                        ]
-                    }
-        return None
+            narration = json.loads(response_text)
+            schedule['recommendations'] = narration.get('recommendations', [])
     except Exception as e:
-        logger.error(f"Error analyzing critical path: {str(e)}")
-        return {
-            "critical_path": [],
-            "task_analysis": [],
-            "project_insights": {
-                "total_duration_hours": 0,
-                "project_completion_date": "Unknown",
-                "critical_path_duration": 0,
-                "schedule_buffer_hours": 0,
-                "high_risk_tasks": 0,
-                "resource_conflicts": []
-            },
-            "recommendations": [{
-                "type": "error",
-                "title": "System Error",
-                "description": f"Critical path analysis failed: {str(e)}",
-                "impact": "high",
-                "effort": "low",
-                "priority": 1
-            }],
-            "milestones_status": [],
-            "error": str(e)
-        }
+        logger.error(f"Error narrating critical path: {str(e)}")
+    return schedule
 
 
 def predict_task_completion(task_data: Dict, historical_data: List[Dict] = None) -> Optional[Dict]:
@@ -988,7 +1104,7 @@ def predict_task_completion(task_data: Dict, historical_data: List[Dict] = None)
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='predict_task_completion')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -1105,7 +1221,7 @@ def generate_project_timeline(board_data: Dict) -> Optional[Dict]:
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='generate_project_timeline')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -1414,7 +1530,7 @@ def enhance_task_description(task_data: Dict) -> Optional[Dict]:
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='enhance_task_description')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -1517,7 +1633,7 @@ def calculate_task_risk_score(task_title: str, task_description: str,
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='calculate_task_risk_score')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -1611,7 +1727,7 @@ def generate_risk_mitigation_suggestions(task_title: str, task_description: str,
         ]
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='generate_risk_mitigation_suggestions')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -1687,7 +1803,7 @@ def assess_task_dependencies_and_risks(task_title: str, tasks_data: List[Dict])
         }}
         """
         
-        response_text = generate_ai_content(prompt)
+        response_text = generate_ai_content(prompt, cache_as='assess_task_dependencies_and_risks')
         if response_text:
             # Handle code block formatting
             if "```json" in response_text:
@@ -0,0 +1,103 @@
+"""
+Board Access Service for TaskFlow
+Answers "can this user open this board?" without loading the board's member
+list. Each user's accessible board ids are cached as a set under a versioned
+key; membership changes bump the user's version so the next check reloads.
+The cache is only used when it is shared by every process (Redis, Memcached,
+database): with a per-process cache a removal would only be seen by the
+worker that handled it, so checks fall back to an EXISTS query instead.
+"""
+
+from typing import Set
+from django.core.cache import cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models import Q
+
+
+class BoardAccessService:
+    """
+    Service for board permission checks
+    A user can access a board they created or are a member of
+    """
+
+    CACHE_TIMEOUT = 60 * 5  # Upper bound on staleness if an invalidation is missed
+
+    @staticmethod
+    def cache_is_shared() -> bool:
+        """Whether invalidations reach every process through the default cache"""
+        return not isinstance(caches['default'], (LocMemCache, DummyCache))
+
+    @staticmethod
+    def _version_key(user_id):
+        return f'board_access:{user_id}:version'
+
+    @classmethod
+    def _ids_key(cls, user_id):
+        version = cache.get(cls._version_key(user_id))
+        if version is None:
+            version = 1
+            cache.add(cls._version_key(user_id), version, None)
+        return f'board_access:{user_id}:v{version}:ids'
+
+    @staticmethod
+    def _user_id(user):
+        return getattr(user, 'id', user)
+
+    @classmethod
+    def accessible_board_ids(cls, user) -> Set[int]:
+        """Ids of all boards the user created or is a member of (cached when the cache is shared)"""
+        from kanban.models import Board
+
+        user_id = cls._user_id(user)
+        if user_id is None:
+            return set()
+
+        def load():
+            return set(
+                Board.objects.filter(Q(created_by_id=user_id) | Q(members__id=user_id))
+                .values_list('id', flat=True)
+                .distinct()
+            )
+
+        if not cls.cache_is_shared():
+            return load()
+
+        key = cls._ids_key(user_id)
+        board_ids = cache.get(key)
+        if board_ids is None:
+            board_ids = load()
+            cache.set(key, board_ids, cls.CACHE_TIMEOUT)
+        return board_ids
+
+    @classmethod
+    def can_access(cls, user, board) -> bool:
+        """Check if a user created or is a member of a board"""
+        if not getattr(user, 'is_authenticated', True):
+            return False
+        if board.created_by_id == cls._user_id(user):
+            return True
+        if not cls.cache_is_shared():
+            return cls.is_member(user, board)
+        return board.id in cls.accessible_board_ids(user)
+
+    @classmethod
+    def is_member(cls, user, board) -> bool:
+        """Check board membership alone (the creator is not implicitly a member) with an EXISTS query"""
+        if not getattr(user, 'is_authenticated', True):
+            return False
+        return board.members.filter(id=cls._user_id(user)).exists()
+
+    @classmethod
+    def invalidate(cls, user_ids):
+        """Drop cached board ids for users whose memberships changed"""
+        for user_id in set(user_ids):
+            if user_id is None:
+                continue
+            key = cls._version_key(user_id)
+            # A new version makes results cached by in-flight requests unreachable
+            if not cache.add(key, 2, None):
+                try:
+                    cache.incr(key)
+                except ValueError:
+                    cache.set(key, 2, None)
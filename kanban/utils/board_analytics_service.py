@@ -0,0 +1,208 @@
+"""
+Board Analytics Service for TaskFlow
+Keeps a BoardAnalyticsSnapshot per board so the analytics page and the AI
+summary read one row instead of recomputing every chart. Task, label and
+column changes mark the snapshot stale, and the first change in a quiet
+period queues a rebuild a few seconds later, so a burst of edits costs one
+recomputation.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Dict, Any
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class BoardAnalyticsService:
+    """
+    Service for computing and serving board analytics snapshots
+    A snapshot is rebuilt on read only when it is missing, was computed on an
+    earlier day (overdue and upcoming counts are date-relative) or has been
+    stale for longer than STALE_GRACE (the queued rebuild never ran)
+    """
+
+    DEBOUNCE_SECONDS = 10  # Delay before a queued rebuild, so bursts of edits share one
+    STALE_GRACE = timedelta(minutes=5)
+    UPCOMING_DAYS = 7
+    COMPLETION_HISTORY_DAYS = 30
+
+    LEAN_CATEGORIES = [
+        ('Value-Added', '#28a745'),
+        ('Necessary NVA', '#ffc107'),
+        ('Waste/Eliminate', '#dc3545'),
+    ]
+
+    def __init__(self, board, now=None):
+        self.board = board
+        self.now = now or timezone.now()
+
+    def compute(self) -> Dict[str, Any]:
+        """
+        Compute all analytics for the board with one aggregate query per chart
+
+        Returns:
+            JSON-safe dict stored as BoardAnalyticsSnapshot.data
+        """
+        from kanban.models import Task
+
+        tasks = Task.objects.filter(column__board=self.board)
+        today = self.now.date()
+
+        totals = tasks.aggregate(
+            total_tasks=Count('id'),
+            completed_count=Count('id', filter=Q(is_done=True)),
+            # Completed tasks count as 100% whatever their progress field says
+            progress_sum=Sum(Case(
+                When(is_done=True, then=Value(100)),
+                default=Coalesce('progress', 0),
+                output_field=IntegerField()
+            )),
+            overdue_count=Count('id', filter=Q(is_done=False, due_date__date__lt=today)),
+            upcoming_count=Count('id', filter=Q(
+                due_date__date__gte=today,
+                due_date__date__lte=today + timedelta(days=self.UPCOMING_DAYS)
+            )),
+        )
+        total_tasks = totals['total_tasks']
+
+        productivity = 0
+        if total_tasks > 0:
+            productivity = (totals['progress_sum'] / (total_tasks * 100)) * 100
+
+        tasks_by_column = [
+            {'name': column.name, 'count': column.task_count}
+            for column in self.board.columns.annotate(task_count=Count('tasks')).order_by('position', 'id')
+        ]
+
+        priority_names = dict(Task.PRIORITY_CHOICES)
+        tasks_by_priority = [
+            {'priority': priority_names.get(item['priority'], item['priority']), 'count': item['count']}
+            for item in tasks.values('priority').annotate(count=Count('id')).order_by('priority')
+        ]
+
+        tasks_by_user = []
+        user_rows = tasks.values('assigned_to__username').annotate(
+            count=Count('id'),
+            completed=Count('id', filter=Q(is_done=True))
+        ).order_by('-count')
+        for item in user_rows:
+            tasks_by_user.append({
+                'username': item['assigned_to__username'] or 'Unassigned',
+                'count': item['count'],
+                'completed': item['completed'],
+                'completion_rate': int(item['completed'] / item['count'] * 100) if item['count'] else 0
+            })
+
+        completed_tasks = [
+            {'date': item['completed_at__date'].strftime('%Y-%m-%d'), 'count': item['count']}
+            for item in tasks.filter(
+                is_done=True,
+                completed_at__gte=self.now - timedelta(days=self.COMPLETION_HISTORY_DAYS)
+            ).values('completed_at__date').annotate(count=Count('id')).order_by('completed_at__date')
+        ]
+
+        lean_counts = dict(
+            tasks.filter(labels__category='lean', labels__name__in=[name for name, _ in self.LEAN_CATEGORIES])
+            .values_list('labels__name').annotate(count=Count('id'))
+        )
+        tasks_by_lean_category = [
+            {'name': name, 'count': lean_counts.get(name, 0), 'color': color}
+            for name, color in self.LEAN_CATEGORIES
+        ]
+        total_categorized = sum(lean_counts.values())
+        value_added_percentage = 0
+        if total_categorized > 0:
+            value_added_percentage = (lean_counts.get('Value-Added', 0) / total_categorized) * 100
+
+        return {
+            'total_tasks': total_tasks,
+            'completed_count': totals['completed_count'],
+            'productivity': round(productivity, 1),
+            'overdue_count': totals['overdue_count'],
+            'upcoming_count': totals['upcoming_count'],
+            'tasks_by_column': tasks_by_column,
+            'tasks_by_priority': tasks_by_priority,
+            'tasks_by_user': tasks_by_user,
+            'completed_tasks': completed_tasks,
+            'tasks_by_lean_category': tasks_by_lean_category,
+            'value_added_percentage': round(value_added_percentage, 1),
+            'total_categorized': total_categorized,
+        }
+
+    def refresh(self):
+        """Recompute and store the board's snapshot"""
+        from kanban.models import BoardAnalyticsSnapshot
+
+        # Cleared before computing: changes made meanwhile mark it stale again
+        BoardAnalyticsSnapshot.objects.filter(board_id=self.board.id).update(stale_since=None)
+        snapshot, _ = BoardAnalyticsSnapshot.objects.update_or_create(
+            board_id=self.board.id,
+            defaults={
+                'data': self.compute(),
+                'as_of': self.now.date(),
+                'computed_at': self.now,
+            }
+        )
+        return snapshot
+
+    def get(self) -> Dict[str, Any]:
+        """The board's analytics, read from its snapshot"""
+        from kanban.models import BoardAnalyticsSnapshot
+
+        snapshot = BoardAnalyticsSnapshot.objects.filter(board_id=self.board.id).first()
+        if (snapshot is None
+                or snapshot.as_of != self.now.date()
+                or (snapshot.stale_since and self.now - snapshot.stale_since > self.STALE_GRACE)):
+            snapshot = self.refresh()
+        return snapshot.data
+
+    def summary_data(self) -> Dict[str, Any]:
+        """Analytics in the shape summarize_board_analytics expects"""
+        data = self.get()
+        return {
+            'total_tasks': data['total_tasks'],
+            'completed_count': data['completed_count'],
+            'productivity': data['productivity'],
+            'overdue_count': data['overdue_count'],
+            'upcoming_count': data['upcoming_count'],
+            'value_added_percentage': data['value_added_percentage'],
+            'total_categorized': data['total_categorized'],
+            'tasks_by_lean_category': [
+                {'name': item['name'], 'count': item['count']} for item in data['tasks_by_lean_category']
+            ],
+            'tasks_by_column': data['tasks_by_column'],
+            'tasks_by_priority': data['tasks_by_priority'],
+            'tasks_by_user': [
+                {'username': item['username'], 'count': item['count'], 'completion_rate': item['completion_rate']}
+                for item in data['tasks_by_user']
+            ],
+        }
+
+    @classmethod
+    def mark_stale(cls, board_id):
+        """Flag a board's snapshot as outdated and queue a rebuild if it was current"""
+        from kanban.models import BoardAnalyticsSnapshot
+        from kanban.tasks import refresh_board_analytics
+
+        if board_id is None:
+            return
+        marked = BoardAnalyticsSnapshot.objects.filter(
+            board_id=board_id, stale_since__isnull=True
+        ).update(stale_since=timezone.now())
+        if not marked:
+            # No snapshot yet, or a rebuild is already pending
+            return
+
+        def enqueue():
+            try:
+                refresh_board_analytics.apply_async((board_id,), countdown=cls.DEBOUNCE_SECONDS)
+            except Exception as e:
+                # Readers rebuild the snapshot themselves once STALE_GRACE has passed
+                logger.warning(f"Could not queue analytics refresh for board {board_id}: {e}")
+
+        transaction.on_commit(enqueue)
@@ -0,0 +1,81 @@
+"""
+Board Event Broadcasting for TaskFlow
+Sends compact task/column diffs to everyone viewing a board over the
+board_<id> channel group so pages update without reloading
+"""
+
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def board_group_name(board_id):
+    """Channel group shared by every open page of a board"""
+    return f'board_{board_id}'
+
+
+def task_payload(task, *fields):
+    """
+    Build the diff for a task
+
+    Args:
+        task: Task instance
+        fields: Task fields to include besides the id and column
+
+    Returns:
+        Dict of JSON-safe values
+    """
+    payload = {'task_id': task.id, 'column_id': task.column_id}
+    for field in fields:
+        value = getattr(task, field)
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload[field] = value
+    return payload
+
+
+def columns_payload(columns):
+    """Build the diff for a column reorder"""
+    return {'columns': [{'column_id': column.id, 'position': column.position} for column in columns]}
+
+
+def broadcast_board_events(board_id, events, user=None):
+    """
+    Send a batch of events to a board's group once the current transaction commits
+
+    Events are sent together in one channel layer message so a bulk change
+    reaches clients as a single frame. Failures are logged and never break
+    the request that made the change.
+
+    Args:
+        board_id: Board the events belong to
+        events: List of (event_type, payload) tuples
+        user: User who made the change (lets clients skip their own echoes)
+    """
+    if not events:
+        return
+
+    message = {
+        'type': 'board_events',
+        'events': [{'event': event_type, **payload} for event_type, payload in events],
+        'actor_id': user.id if user else None,
+    }
+
+    def send():
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(board_group_name(board_id), message)
+        except Exception as e:
+            logger.warning(f"Could not broadcast board events for board {board_id}: {e}")
+
+    transaction.on_commit(send)
+
+
+def broadcast_board_event(board_id, event_type, payload, user=None):
+    """Send a single event to a board's group"""
+    broadcast_board_events(board_id, [(event_type, payload)], user=user)
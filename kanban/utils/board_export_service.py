@@ -0,0 +1,160 @@
+"""
+Board Export Service for TaskFlow
+Streams a board as JSON, CSV or NDJSON. Tasks are read in chunks with their
+users joined and labels prefetched per chunk, and the document is produced
+piece by piece, so memory use does not grow with the size of the board.
+"""
+
+import csv
+from typing import Dict, Any, Iterator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch
+
+
+class _Echo:
+    """File-like object for csv.writer that hands back each row instead of storing it"""
+
+    def write(self, value):
+        return value
+
+
+class BoardExportService:
+    """
+    Service for exporting a board
+    The JSON document has the same shape import_board reads: the board, then
+    its columns in order, each with its tasks in order
+    """
+
+    FORMATS = {
+        'json': ('application/json', 'json'),
+        'csv': ('text/csv', 'csv'),
+        'ndjson': ('application/x-ndjson', 'ndjson'),
+    }
+
+    CSV_HEADER = ['Column', 'Task Title', 'Description', 'Position', 'Created At', 'Updated At',
+                  'Due Date', 'Assigned To', 'Created By', 'Labels', 'Priority', 'Progress']
+
+    TASK_FIELDS = (
+        'id', 'column_id', 'title', 'description', 'position', 'created_at', 'updated_at',
+        'due_date', 'priority', 'progress', 'assigned_to__username', 'created_by__username',
+    )
+
+    def __init__(self, board, chunk_size=2000):
+        self.board = board
+        self.chunk_size = chunk_size
+        self.encoder = DjangoJSONEncoder()
+
+    def columns(self):
+        return list(self.board.columns.order_by('position', 'id').only('id', 'board_id', 'name', 'position'))
+
+    def iter_tasks(self):
+        """Tasks in column then card order, fetched chunk_size rows at a time"""
+        from kanban.models import Task, TaskLabel
+
+        return (
+            Task.objects.filter(column__board=self.board)
+            .select_related('assigned_to', 'created_by')
+            .only(*self.TASK_FIELDS)
+            .prefetch_related(Prefetch('labels', queryset=TaskLabel.objects.only('id', 'name')))
+            .order_by('column__position', 'column_id', 'position', 'id')
+            .iterator(chunk_size=self.chunk_size)
+        )
+
+    def board_data(self) -> Dict[str, Any]:
+        return {
+            'name': self.board.name,
+            'description': self.board.description,
+            'created_at': self.board.created_at.isoformat(),
+        }
+
+    @staticmethod
+    def task_data(task) -> Dict[str, Any]:
+        return {
+            'title': task.title,
+            'description': task.description,
+            'position': task.position,
+            'created_at': task.created_at.isoformat(),
+            'updated_at': task.updated_at.isoformat(),
+            'due_date': task.due_date.isoformat() if task.due_date else None,
+            'assigned_to': task.assigned_to.username if task.assigned_to else None,
+            'created_by': task.created_by.username if task.created_by else None,
+            'labels': [label.name for label in task.labels.all()],
+            'priority': task.priority,
+            'progress': task.progress,
+        }
+
+    def _batched(self, pieces: Iterator[str]) -> Iterator[str]:
+        """Join small pieces so the server writes reasonably sized blocks"""
+        batch = []
+        for piece in pieces:
+            batch.append(piece)
+            if len(batch) >= 500:
+                yield ''.join(batch)
+                batch = []
+        if batch:
+            yield ''.join(batch)
+
+    def _json_pieces(self) -> Iterator[str]:
+        dumps = self.encoder.encode
+        yield '{"board": ' + dumps(self.board_data()) + ', "columns": ['
+
+        tasks = self.iter_tasks()
+        task = next(tasks, None)
+        for index, column in enumerate(self.columns()):
+            yield (', ' if index else '') + '{"name": ' + dumps(column.name) + \
+                ', "position": ' + dumps(column.position) + ', "tasks": ['
+            first = True
+            # Tasks arrive grouped by column in the same order as the columns
+            while task is not None and task.column_id == column.id:
+                yield ('' if first else ', ') + dumps(self.task_data(task))
+                first = False
+                task = next(tasks, None)
+            yield ']}'
+        yield ']}'
+
+    def _ndjson_pieces(self) -> Iterator[str]:
+        dumps = self.encoder.encode
+        yield dumps({'type': 'board', **self.board_data()}) + '\n'
+
+        column_names = {}
+        for column in self.columns():
+            column_names[column.id] = column.name
+            yield dumps({'type': 'column', 'name': column.name, 'position': column.position}) + '\n'
+
+        for task in self.iter_tasks():
+            yield dumps({'type': 'task', 'column': column_names.get(task.column_id), **self.task_data(task)}) + '\n'
+
+    def _csv_pieces(self) -> Iterator[str]:
+        writer = csv.writer(_Echo())
+        yield writer.writerow(self.CSV_HEADER)
+
+        column_names = {column.id: column.name for column in self.columns()}
+        for task in self.iter_tasks():
+            yield writer.writerow([
+                column_names.get(task.column_id),
+                task.title,
+                task.description,
+                task.position,
+                task.created_at,
+                task.updated_at,
+                task.due_date if task.due_date else '',
+                task.assigned_to.username if task.assigned_to else '',
+                task.created_by.username if task.created_by else '',
+                ", ".join(label.name for label in task.labels.all()),
+                task.priority,
+                task.progress
+            ])
+
+    def stream(self, export_format) -> Iterator[str]:
+        """
+        Iterate over the export document in blocks
+
+        Args:
+            export_format: One of FORMATS
+        """
+        pieces = {
+            'json': self._json_pieces,
+            'csv': self._csv_pieces,
+            'ndjson': self._ndjson_pieces,
+        }[export_format]()
+        return self._batched(pieces)
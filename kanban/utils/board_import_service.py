@@ -0,0 +1,258 @@
+"""
+Board Import Service for TaskFlow
+Creates a board from a JSON or NDJSON export inside one transaction. Columns
+are inserted together, tasks and their label links in batches, and assignees
+and labels are resolved once per batch, so a failed import leaves nothing
+behind and large boards take a handful of queries per thousand cards.
+"""
+
+import json
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+
+class BoardImportError(Exception):
+    """The uploaded file is not a board export this service can read"""
+
+
+class BoardImportService:
+    """
+    Service for importing exported boards
+    Reads the JSON document export_board writes (board, columns with nested
+    tasks) and the NDJSON variant (one board, column or task object per line,
+    read line by line)
+    """
+
+    BATCH_SIZE = 1000
+    DEFAULT_LABEL_COLOR = '#FF5733'
+    PROGRESS_TIMEOUT = 60 * 60
+
+    def __init__(self, user, organization, progress: Optional[Callable[[int, Optional[int]], None]] = None):
+        """
+        Args:
+            user: User creating the board (becomes creator, member and task creator)
+            organization: Organization the board belongs to; assignees must be in it
+            progress: Optional callback called with (tasks imported, total tasks or None)
+        """
+        self.user = user
+        self.organization = organization
+        self.progress = progress
+        self._users = {}
+        self._labels = {}
+
+    # Progress shared with the polling endpoint
+
+    @staticmethod
+    def progress_available() -> bool:
+        """Whether the polling endpoint, a separate request, sees progress stored by the upload"""
+        from kanban.utils.board_access_service import BoardAccessService
+        return BoardAccessService.cache_is_shared()
+
+    @staticmethod
+    def progress_key(user_id, import_id):
+        return f'board_import:{user_id}:{import_id}'
+
+    @classmethod
+    def cache_progress(cls, user_id, import_id) -> Callable[[int, Optional[int]], None]:
+        """Progress callback that stores the latest counts for get_progress"""
+        key = cls.progress_key(user_id, import_id)
+
+        def report(processed, total):
+            cache.set(key, {'processed': processed, 'total': total}, cls.PROGRESS_TIMEOUT)
+
+        return report
+
+    @classmethod
+    def get_progress(cls, user_id, import_id) -> Optional[Dict[str, Any]]:
+        return cache.get(cls.progress_key(user_id, import_id))
+
+    # Readers: each returns (board data, column list, iterator of (column index, task data), total or None)
+
+    @staticmethod
+    def _read_json(upload):
+        try:
+            data = json.load(upload)
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise BoardImportError('Invalid JSON file')
+        if not isinstance(data, dict) or 'board' not in data or 'columns' not in data:
+            raise BoardImportError('Invalid board data format')
+
+        columns = data['columns']
+        tasks = (
+            (col_index, {'title': f'Task {task_index+1}', 'position': task_index, **task_data})
+            for col_index, column_data in enumerate(columns)
+            for task_index, task_data in enumerate(column_data.get('tasks', []))
+        )
+        total = sum(len(column_data.get('tasks', [])) for column_data in columns)
+        return data['board'], columns, tasks, total
+
+    @staticmethod
+    def _read_ndjson(upload):
+        def records():
+            for line_number, line in enumerate(upload, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    raise BoardImportError(f'Invalid JSON on line {line_number}')
+
+        lines = records()
+        board_data = None
+        columns = []
+        column_indexes = {}
+        first_task = None
+        # The board and column lines precede the tasks
+        for line_number, record in lines:
+            kind = record.get('type')
+            if kind == 'board':
+                board_data = record
+            elif kind == 'column':
+                column_indexes.setdefault(record.get('name'), len(columns))
+                columns.append(record)
+            elif kind == 'task':
+                first_task = (line_number, record)
+                break
+        if board_data is None:
+            raise BoardImportError('Invalid board data format')
+
+        def tasks():
+            pending = [first_task] if first_task else []
+            for line_number, record in chain(pending, lines):
+                if record.get('type') != 'task':
+                    continue
+                if record.get('column') not in column_indexes:
+                    raise BoardImportError(f"Unknown column '{record.get('column')}' on line {line_number}")
+                yield column_indexes[record['column']], record
+
+        return board_data, columns, tasks(), None
+
+    def import_file(self, upload, filename=None):
+        """
+        Import an uploaded export file
+
+        Args:
+            upload: File object (Django upload or open file)
+            filename: Name used to pick the format; defaults to upload.name
+
+        Returns:
+            The new Board
+        """
+        filename = (filename or getattr(upload, 'name', '') or '').lower()
+        if filename.endswith('.ndjson'):
+            reader = self._read_ndjson
+            upload = _decoded_lines(upload)
+        elif filename.endswith('.json'):
+            reader = self._read_json
+        else:
+            raise BoardImportError('Only JSON and NDJSON files are supported for import')
+
+        with transaction.atomic():
+            board_data, columns, tasks, total = reader(upload)
+            return self.create_board(board_data, columns, tasks, total)
+
+    def create_board(self, board_data, columns_data, tasks: Iterator[Tuple[int, Dict[str, Any]]], total=None):
+        """Create the board, its columns and its tasks (call inside a transaction)"""
+        from kanban.models import Board, Column
+        from kanban.utils.task_search_service import TaskSearchService
+
+        board = Board.objects.create(
+            name=board_data.get('name', 'Imported Board'),
+            description=board_data.get('description', ''),
+            organization=self.organization,
+            created_by=self.user
+        )
+        board.members.add(self.user)
+
+        columns = Column.objects.bulk_create([
+            Column(
+                name=column_data.get('name', f'Column {col_index+1}'),
+                board=board,
+                position=column_data.get('position', col_index),
+                # bulk_create skips Column.save, which infers this for new columns
+                is_terminal=Column.is_terminal_name(column_data.get('name', f'Column {col_index+1}'))
+            )
+            for col_index, column_data in enumerate(columns_data)
+        ])
+
+        processed = 0
+        self._report(processed, total)
+        while True:
+            batch = list(islice(tasks, self.BATCH_SIZE))
+            if not batch:
+                break
+            self._create_tasks(board, columns, batch)
+            processed += len(batch)
+            self._report(processed, total)
+
+        # Bulk inserts skip the Task signals that maintain the search index
+        TaskSearchService.rebuild(board_id=board.id)
+        return board
+
+    def _report(self, processed, total):
+        if self.progress:
+            self.progress(processed, total)
+
+    def _resolve_users(self, usernames):
+        """Map new usernames to users of the organization (None when not found)"""
+        from django.contrib.auth.models import User
+
+        missing = {name for name in usernames if name and name not in self._users}
+        if not missing:
+            return
+        found = User.objects.filter(username__in=missing, profile__organization=self.organization)
+        self._users.update({user.username: user for user in found})
+        self._users.update({name: None for name in missing if name not in self._users})
+
+    def _resolve_labels(self, board, names):
+        """Create the board's labels the first time a task uses them"""
+        from kanban.models import TaskLabel
+
+        missing = [name for name in dict.fromkeys(names) if name not in self._labels]
+        if not missing:
+            return
+        created = TaskLabel.objects.bulk_create([
+            TaskLabel(name=name, board=board, color=self.DEFAULT_LABEL_COLOR) for name in missing
+        ])
+        self._labels.update({label.name: label for label in created})
+
+    def _create_tasks(self, board, columns: List, batch):
+        from kanban.models import Task
+
+        self._resolve_users(task_data.get('assigned_to') for _, task_data in batch)
+        self._resolve_labels(board, [name for _, task_data in batch for name in task_data.get('labels') or []])
+
+        now = timezone.now()
+        tasks = []
+        for col_index, task_data in batch:
+            column = columns[col_index]
+            tasks.append(Task(
+                title=task_data.get('title', 'Untitled task'),
+                description=task_data.get('description', ''),
+                column=column,
+                position=task_data.get('position', 0),
+                created_by=self.user,
+                assigned_to=self._users.get(task_data.get('assigned_to')),
+                priority=task_data.get('priority', 'medium'),
+                progress=task_data.get('progress', 0),
+                # bulk_create skips Task.save, which keeps these in step with the column
+                is_done=column.is_terminal,
+                completed_at=now if column.is_terminal else None
+            ))
+        Task.objects.bulk_create(tasks)
+
+        TaskLabels = Task.labels.through
+        TaskLabels.objects.bulk_create([
+            TaskLabels(task_id=task.id, tasklabel_id=self._labels[name].id)
+            for task, (_, task_data) in zip(tasks, batch)
+            for name in dict.fromkeys(task_data.get('labels') or [])
+        ])
+
+
+def _decoded_lines(upload):
+    for line in upload:
+        yield line.decode('utf-8') if isinstance(line, bytes) else line
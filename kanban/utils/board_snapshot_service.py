@@ -0,0 +1,137 @@
+"""
+Board Snapshot Service for TaskFlow
+Loads everything the board page shows (columns, cards, labels, assignees,
+comment/file counts and members) in a fixed number of queries and returns
+one plain structure shared by the board template and the snapshot API
+"""
+
+from typing import Dict, Any, List, Optional
+from django.db.models import Count, IntegerField, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+
+class BoardSnapshotService:
+    """
+    Service for building a board snapshot
+    The number of queries does not depend on how many cards the board has:
+    columns, tasks (with assignee, profile and counts), task labels, board
+    labels and members are one query each
+    """
+
+    # Task columns the board page needs; the large AI/analysis JSON fields are skipped
+    TASK_FIELDS = (
+        'id', 'title', 'description', 'position', 'priority', 'progress',
+        'is_done', 'due_date', 'column_id',
+        'assigned_to__id', 'assigned_to__username', 'assigned_to__profile__profile_picture',
+    )
+
+    def __init__(self, board, tasks=None):
+        """
+        Args:
+            board: Board to snapshot
+            tasks: Optional filtered Task queryset (board search); defaults to all tasks
+        """
+        self.board = board
+        self.tasks = tasks
+
+    @staticmethod
+    def _count_per_task(related):
+        """Correlated count of a related queryset's rows for each task"""
+        counts = related.filter(task=OuterRef('pk')).order_by().values('task').annotate(count=Count('pk')).values('count')
+        return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+    def _task_queryset(self):
+        from kanban.models import Comment, Task, TaskFile, TaskLabel
+
+        tasks = self.tasks if self.tasks is not None else Task.objects.filter(column__board=self.board)
+        return (
+            tasks
+            .select_related('assigned_to__profile')
+            .only(*self.TASK_FIELDS)
+            # Counted in separate subqueries; joining both relations would
+            # multiply each task's rows by comments x attachments
+            .annotate(
+                comment_count=self._count_per_task(Comment.objects.all()),
+                file_count=self._count_per_task(TaskFile.objects.filter(deleted_at__isnull=True)),
+            )
+            .prefetch_related(Prefetch('labels', queryset=TaskLabel.objects.only('id', 'name', 'color', 'category')))
+            .order_by('position', 'id')
+        )
+
+    @staticmethod
+    def _avatar_url(user) -> Optional[str]:
+        profile = getattr(user, 'profile', None) if user else None
+        if profile and profile.profile_picture:
+            return profile.profile_picture.url
+        return None
+
+    @classmethod
+    def serialize_task(cls, task) -> Dict[str, Any]:
+        """Compact card data for a task loaded by _task_queryset"""
+        assignee = task.assigned_to
+        return {
+            'id': task.id,
+            'title': task.title,
+            'description': task.description or '',
+            'column_id': task.column_id,
+            'position': task.position,
+            'priority': task.priority,
+            'progress': task.progress,
+            'is_done': task.is_done,
+            'due_date': task.due_date,
+            'assigned_to': {
+                'id': assignee.id,
+                'username': assignee.username,
+                'avatar_url': cls._avatar_url(assignee),
+            } if assignee else None,
+            'labels': [
+                {'id': label.id, 'name': label.name, 'color': label.color, 'category': label.category}
+                for label in task.labels.all()
+            ],
+            'comment_count': task.comment_count,
+            'file_count': task.file_count,
+        }
+
+    def build(self) -> Dict[str, Any]:
+        """
+        Build the snapshot
+
+        Returns:
+            Dict with the board, its columns in order (each with its cards in
+            order), the board's labels and its members
+        """
+        columns: List[Dict[str, Any]] = [
+            {
+                'id': column.id,
+                'name': column.name,
+                'position': column.position,
+                'is_terminal': column.is_terminal,
+                'is_todo': column.name.lower() in ('to do', 'todo'),
+                'tasks': [],
+            }
+            for column in self.board.columns.order_by('position', 'id')
+        ]
+        by_column = {column['id']: column for column in columns}
+
+        for task in self._task_queryset():
+            column = by_column.get(task.column_id)
+            if column is not None:
+                column['tasks'].append(self.serialize_task(task))
+
+        members = [
+            {'id': member.id, 'username': member.username, 'avatar_url': self._avatar_url(member)}
+            for member in self.board.members.select_related('profile').order_by('username')
+        ]
+
+        return {
+            'board': {
+                'id': self.board.id,
+                'name': self.board.name,
+                'description': self.board.description or '',
+                'created_by_id': self.board.created_by_id,
+            },
+            'columns': columns,
+            'labels': list(self.board.labels.values('id', 'name', 'color', 'category')),
+            'members': members,
+            'task_count': sum(len(column['tasks']) for column in columns),
+        }
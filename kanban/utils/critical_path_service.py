@@ -0,0 +1,238 @@
+"""
+Critical Path Service for TaskFlow
+Deterministic critical path method (CPM) over a board's task graph. Edges come
+from Task.dependencies (a prerequisite must finish before its dependent
+starts) and parent_task (a parent cannot finish before its subtasks), and
+durations from start_date/due_date. One topological pass computes earliest
+starts, a reverse pass latest starts, so a board costs O(tasks + edges);
+tasks caught in a dependency cycle are reported instead of scheduled.
+"""
+
+from collections import defaultdict, deque
+from datetime import timedelta
+from typing import Dict, Any, Iterable, List, Tuple
+from django.utils import timezone
+
+
+class CriticalPathService:
+    """
+    Service for scheduling a board with the critical path method
+    Times are whole days from the project start (the earliest task start
+    date). A task never starts before its own start_date, and undated tasks
+    take no time.
+    """
+
+    HOURS_PER_DAY = 8  # Working hours per scheduled day, for the hour figures of the analysis report
+
+    def __init__(self, board):
+        self.board = board
+
+    @staticmethod
+    def schedule(durations: Dict[int, int], edges: Iterable[Tuple[int, int]],
+                 release: Dict[int, int] = None) -> Dict[str, Any]:
+        """
+        Run the forward and backward CPM passes
+
+        Args:
+            durations: Days each node takes
+            edges: (before, after) pairs; after cannot start until before finishes
+            release: Earliest day each node may start (default 0)
+
+        Returns:
+            Dict with the topological order, per-node earliest_start,
+            latest_start and slack, the project finish day, the critical
+            path in order and the nodes left unscheduled by cycles
+        """
+        release = release or {}
+        successors = defaultdict(list)
+        predecessors = defaultdict(list)
+        indegree = dict.fromkeys(durations, 0)
+        for before, after in edges:
+            if before in durations and after in durations and before != after:
+                successors[before].append(after)
+                predecessors[after].append(before)
+                indegree[after] += 1
+
+        # Forward pass in topological order (Kahn)
+        earliest = {node: release.get(node, 0) for node in durations}
+        queue = deque(node for node, degree in indegree.items() if degree == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            finish = earliest[node] + durations[node]
+            for after in successors[node]:
+                if finish > earliest[after]:
+                    earliest[after] = finish
+                indegree[after] -= 1
+                if indegree[after] == 0:
+                    queue.append(after)
+        # Whatever still has unmet prerequisites is in a cycle or behind one
+        cyclic = [node for node, degree in indegree.items() if degree > 0]
+
+        project_finish = max((earliest[node] + durations[node] for node in order), default=0)
+
+        # Backward pass
+        latest = {}
+        for node in reversed(order):
+            latest_finish = min(
+                (latest[after] for after in successors[node] if after in latest), default=project_finish
+            )
+            latest[node] = latest_finish - durations[node]
+        slack = {node: latest[node] - earliest[node] for node in order}
+
+        # Walk back from a critical node finishing last through critical predecessors
+        critical_path = []
+        node = next((node for node in order
+                     if slack[node] == 0 and earliest[node] + durations[node] == project_finish), None)
+        while node is not None:
+            critical_path.append(node)
+            node = next((before for before in predecessors[node]
+                         if slack.get(before) == 0 and earliest[before] + durations[before] == earliest[node]), None)
+        critical_path.reverse()
+
+        return {
+            'order': order,
+            'earliest_start': {node: earliest[node] for node in order},
+            'latest_start': latest,
+            'slack': slack,
+            'project_finish': project_finish,
+            'critical_path': critical_path,
+            'cyclic': cyclic,
+        }
+
+    def load(self) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int]]]:
+        """The board's tasks and (before, after) edges, in two queries"""
+        from kanban.models import Task
+
+        tasks = list(Task.objects.filter(column__board=self.board).order_by('id').values(
+            'id', 'title', 'start_date', 'due_date', 'parent_task_id', 'is_done', 'progress', 'priority'
+        ))
+        task_ids = {task['id'] for task in tasks}
+
+        Dependencies = Task.dependencies.through
+        edges = [
+            (prerequisite_id, task_id)
+            for task_id, prerequisite_id in Dependencies.objects.filter(
+                from_task__column__board=self.board
+            ).values_list('from_task_id', 'to_task_id')
+            if prerequisite_id in task_ids
+        ]
+        edges.extend(
+            (task['id'], task['parent_task_id']) for task in tasks if task['parent_task_id'] in task_ids
+        )
+        return tasks, edges
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        Schedule the board
+
+        Returns:
+            The schedule (see schedule) with the board's tasks by id and the
+            calendar date of day 0
+        """
+        tasks, edges = self.load()
+        dated = [task for task in tasks if task['start_date'] and task['due_date']]
+        project_start = min((task['start_date'] for task in dated), default=timezone.localdate())
+
+        durations = {}
+        release = {}
+        for task in tasks:
+            durations[task['id']] = 0
+            if task['start_date'] and task['due_date']:
+                durations[task['id']] = max((_due_day(task) - task['start_date']).days, 0)
+            if task['start_date']:
+                release[task['id']] = max((task['start_date'] - project_start).days, 0)
+
+        result = self.schedule(durations, edges, release)
+        result.update({
+            'tasks': {task['id']: task for task in tasks},
+            'durations': durations,
+            'project_start': project_start,
+        })
+        return result
+
+    def report(self) -> Dict[str, Any]:
+        """Critical path analysis in the shape the analytics page and AI job return"""
+        result = self.analyze()
+        start = result['project_start']
+        durations = result['durations']
+        tasks = result['tasks']
+
+        def day(offset):
+            return (start + timedelta(days=offset)).isoformat()
+
+        task_analysis = []
+        late_tasks = 0
+        for task_id in result['order']:
+            task = tasks[task_id]
+            earliest = result['earliest_start'][task_id]
+            latest = result['latest_start'][task_id]
+            slack = result['slack'][task_id]
+            due = _due_day(task)
+            is_late = (due is not None and not task['is_done']
+                       and start + timedelta(days=earliest + durations[task_id]) > due)
+            late_tasks += is_late
+
+            risk_factors = []
+            if is_late:
+                risk_factors.append('Cannot finish by its due date after its prerequisites')
+            if slack == 0 and not task['is_done']:
+                risk_factors.append('Any delay moves the project finish')
+            task_analysis.append({
+                'task_id': str(task_id),
+                'task_title': task['title'],
+                'earliest_start': day(earliest),
+                'earliest_finish': day(earliest + durations[task_id]),
+                'latest_start': day(latest),
+                'latest_finish': day(latest + durations[task_id]),
+                'slack_days': slack,
+                'slack_hours': slack * self.HOURS_PER_DAY,
+                'is_critical': slack == 0,
+                'risk_level': 'high' if is_late else 'medium' if risk_factors else 'low',
+                'risk_factors': risk_factors,
+            })
+        task_analysis.extend({
+            'task_id': str(task_id),
+            'task_title': tasks[task_id]['title'],
+            'is_critical': False,
+            'risk_level': 'high',
+            'risk_factors': ['Part of a dependency cycle, so it cannot be scheduled'],
+        } for task_id in result['cyclic'])
+
+        due_dates = [_due_day(task) for task in tasks.values() if task['due_date']]
+        finish = start + timedelta(days=result['project_finish'])
+        buffer_days = max((max(due_dates) - finish).days, 0) if due_dates else 0
+
+        return {
+            'critical_path': [
+                {
+                    'task_id': str(task_id),
+                    'task_title': tasks[task_id]['title'],
+                    'position_in_path': index + 1,
+                    'duration_days': durations[task_id],
+                    'duration_hours': durations[task_id] * self.HOURS_PER_DAY,
+                    'earliest_start': day(result['earliest_start'][task_id]),
+                    'earliest_finish': day(result['earliest_start'][task_id] + durations[task_id]),
+                }
+                for index, task_id in enumerate(result['critical_path'])
+            ],
+            'task_analysis': task_analysis,
+            'project_insights': {
+                'total_duration_hours': sum(durations.values()) * self.HOURS_PER_DAY,
+                'project_start_date': start.isoformat(),
+                'project_completion_date': finish.isoformat(),
+                'critical_path_duration': result['project_finish'] * self.HOURS_PER_DAY,
+                'schedule_buffer_hours': buffer_days * self.HOURS_PER_DAY,
+                'high_risk_tasks': late_tasks + len(result['cyclic']),
+                'cyclic_task_ids': [str(task_id) for task_id in result['cyclic']],
+                'resource_conflicts': [],
+            },
+            'recommendations': [],
+        }
+
+
+def _due_day(task):
+    """Calendar day of a task's due date (due_date is a datetime)"""
+    due = task['due_date']
+    return due.date() if hasattr(due, 'date') else due
@@ -0,0 +1,191 @@
+"""
+Cycle Time Service for TaskFlow
+Keeps a TaskFlowTime row per completed task with its lead time (created to
+done) and cycle time (first move out of the board's first column to done),
+and summarizes them as percentiles per board, assignee and label. Rows are
+computed in one pass over the tasks' move activities ordered by task, and
+move_task refreshes the moved tasks as it records their activity.
+"""
+
+from collections import defaultdict
+from datetime import timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, Any, Iterable, Optional
+from django.db import transaction
+from django.utils import timezone
+
+
+def percentile(values, p) -> Optional[float]:
+    """p-th percentile of sorted values, interpolating between closest ranks"""
+    if not values:
+        return None
+    rank = (len(values) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
+
+
+class CycleTimeService:
+    """
+    Service for task lead and cycle times
+    A task created outside the first column counts as started when created.
+    Completion is the task's completed_at (the last time it entered a
+    completion column).
+    """
+
+    PERCENTILES = (50, 85, 95)
+    BATCH_SIZE = 1000
+
+    # Computing rows
+
+    @classmethod
+    def _flow_times(cls, tasks):
+        """TaskFlowTime rows for the completed tasks of a Task queryset"""
+        from kanban.models import Column, Task, TaskActivity, TaskFlowTime
+
+        tasks = tasks.filter(is_done=True, completed_at__isnull=False)
+
+        first_columns = {}
+        for column_id, board_id in Column.objects.filter(
+                board_id__in=tasks.values('column__board_id')
+        ).order_by('board_id', 'position', 'id').values_list('id', 'board_id'):
+            first_columns.setdefault(board_id, column_id)
+
+        moves = TaskActivity.objects.filter(
+            activity_type='moved',
+            task__in=tasks,
+            to_column__isnull=False,
+        ).order_by('task_id', 'created_at', 'id').values_list('task_id', 'created_at', 'from_column_id', 'to_column_id')
+        groups = groupby(moves.iterator(chunk_size=cls.BATCH_SIZE), key=itemgetter(0))
+        group = next(groups, None)
+
+        rows = tasks.order_by('id').values_list('id', 'column__board_id', 'column_id', 'created_at', 'completed_at')
+        for task_id, board_id, column_id, created_at, completed_at in rows.iterator(chunk_size=cls.BATCH_SIZE):
+            # Both sides are ordered by task id, so the matching moves are the current group
+            while group is not None and group[0] < task_id:
+                group = next(groups, None)
+            task_moves = [row[1:] for row in group[1]] if group is not None and group[0] == task_id else []
+
+            first_column = first_columns.get(board_id)
+            initial_column = task_moves[0][1] if task_moves and task_moves[0][1] is not None else column_id
+            if initial_column != first_column:
+                started_at = created_at
+            else:
+                started_at = next(
+                    (at for at, from_id, to_id in task_moves if from_id == first_column and to_id != first_column),
+                    None
+                )
+
+            yield TaskFlowTime(
+                task_id=task_id,
+                board_id=board_id,
+                started_at=started_at,
+                completed_at=completed_at,
+                lead_time_hours=_hours(completed_at - created_at),
+                cycle_time_hours=_hours(completed_at - started_at) if started_at else None,
+            )
+
+    @classmethod
+    def _replace(cls, scope, tasks) -> int:
+        """Swap the TaskFlowTime rows in scope for freshly computed ones"""
+        from kanban.models import TaskFlowTime
+
+        written = 0
+        with transaction.atomic():
+            scope.delete()
+            batch = []
+            for flow_time in cls._flow_times(tasks):
+                batch.append(flow_time)
+                if len(batch) >= cls.BATCH_SIZE:
+                    TaskFlowTime.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                TaskFlowTime.objects.bulk_create(batch)
+                written += len(batch)
+        return written
+
+    @classmethod
+    def rebuild(cls, board_id=None) -> int:
+        """
+        Recompute the rows of every completed task, or of one board's
+
+        Returns:
+            Number of completed tasks
+        """
+        from kanban.models import Task, TaskFlowTime
+
+        scope = TaskFlowTime.objects.all()
+        tasks = Task.objects.all()
+        if board_id is not None:
+            scope = scope.filter(board_id=board_id)
+            tasks = tasks.filter(column__board_id=board_id)
+        return cls._replace(scope, tasks)
+
+    @classmethod
+    def update_tasks(cls, task_ids: Iterable[int]):
+        """Refresh the rows of tasks that just moved (drops them if no longer done)"""
+        from kanban.models import Task, TaskFlowTime
+
+        task_ids = list(task_ids)
+        if task_ids:
+            cls._replace(TaskFlowTime.objects.filter(task_id__in=task_ids), Task.objects.filter(id__in=task_ids))
+
+    # Summaries
+
+    @classmethod
+    def _stats(cls, rows) -> Dict[str, Any]:
+        lead_times = sorted(lead for lead, _ in rows)
+        cycle_times = sorted(cycle for _, cycle in rows if cycle is not None)
+        return {
+            'count': len(rows),
+            'lead_time': {f'p{p}': _round(percentile(lead_times, p)) for p in cls.PERCENTILES},
+            'cycle_time': {f'p{p}': _round(percentile(cycle_times, p)) for p in cls.PERCENTILES},
+        }
+
+    @classmethod
+    def summary(cls, board, days=None) -> Dict[str, Any]:
+        """
+        Lead and cycle time percentiles (hours) for the board, each assignee and each label
+
+        Args:
+            board: Board to summarize
+            days: Only include tasks completed in this many most recent days
+        """
+        from kanban.models import Task, TaskFlowTime
+
+        flow_times = TaskFlowTime.objects.filter(board=board)
+        if days:
+            flow_times = flow_times.filter(completed_at__gte=timezone.now() - timedelta(days=days))
+
+        rows = {}
+        by_assignee = defaultdict(list)
+        for task_id, username, lead, cycle in flow_times.values_list(
+                'task_id', 'task__assigned_to__username', 'lead_time_hours', 'cycle_time_hours'):
+            rows[task_id] = (lead, cycle)
+            by_assignee[username or 'Unassigned'].append((lead, cycle))
+
+        by_label = defaultdict(list)
+        TaskLabels = Task.labels.through
+        for task_id, name in TaskLabels.objects.filter(task_id__in=flow_times.values('task_id')).values_list(
+                'task_id', 'tasklabel__name'):
+            by_label[name].append(rows[task_id])
+
+        return {
+            'board': cls._stats(list(rows.values())),
+            'assignees': [
+                {'username': username, **cls._stats(values)} for username, values in sorted(by_assignee.items())
+            ],
+            'labels': [
+                {'name': name, **cls._stats(values)} for name, values in sorted(by_label.items())
+            ],
+        }
+
+
+def _hours(delta: timedelta) -> float:
+    return max(delta.total_seconds(), 0) / 3600
+
+
+def _round(value):
+    return round(value, 1) if value is not None else None
@@ -0,0 +1,142 @@
+"""
+Dashboard Statistics Service for TaskFlow
+Computes every dashboard counter in a single aggregate query and serves the
+metric modal task lists page by page instead of rendering them inline
+"""
+
+from datetime import timedelta
+from typing import Dict, Any
+from django.core.paginator import Paginator
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.timesince import timesince, timeuntil
+
+
+class DashboardStatsService:
+    """
+    Service for computing dashboard statistics over a user's boards
+    All counters come from one conditional-aggregation query; the modal task
+    lists are loaded lazily through a paginated JSON endpoint
+    """
+
+    DUE_SOON_DAYS = 3  # "Due soon" window shown on the dashboard
+    MODAL_PAGE_SIZE = 25  # Tasks per page in the metric modals
+    TASK_LISTS = ('all', 'completed', 'overdue', 'due_soon')
+
+    def __init__(self, user, boards, now=None):
+        self.user = user
+        self.boards = boards
+        self.now = now or timezone.now()
+
+    def _board_tasks(self):
+        """Base queryset of all tasks on the user's boards"""
+        from kanban.models import Task
+
+        return Task.objects.filter(column__board__in=self.boards)
+
+    def _completed_q(self):
+        return Q(is_done=True)
+
+    def _due_soon_q(self):
+        return Q(due_date__range=[self.now, self.now + timedelta(days=self.DUE_SOON_DAYS)])
+
+    def _overdue_q(self):
+        return Q(due_date__lt=self.now) & ~self._completed_q()
+
+    def get_counts(self) -> Dict[str, Any]:
+        """
+        Compute all dashboard counters in one query
+
+        Returns:
+            Dict with task_count, completed_count, due_soon, overdue_count,
+            my_tasks_count, remaining_tasks and completion_rate
+        """
+        stats = self._board_tasks().aggregate(
+            task_count=Count('id'),
+            completed_count=Count('id', filter=self._completed_q()),
+            due_soon=Count('id', filter=self._due_soon_q()),
+            overdue_count=Count('id', filter=self._overdue_q()),
+            my_tasks_count=Count('id', filter=Q(assigned_to=self.user) & ~self._completed_q()),
+        )
+
+        completion_rate = 0
+        if stats['task_count'] > 0:
+            completion_rate = (stats['completed_count'] / stats['task_count']) * 100
+
+        stats['completion_rate'] = round(completion_rate, 1)
+        stats['remaining_tasks'] = stats['task_count'] - stats['completed_count']
+        return stats
+
+    def get_task_list(self, list_name):
+        """
+        Get the queryset behind one of the metric modals
+
+        Args:
+            list_name: One of TASK_LISTS
+
+        Returns:
+            Ordered Task queryset with board, column and assignee preloaded
+        """
+        if list_name not in self.TASK_LISTS:
+            raise ValueError(f"Unknown dashboard task list: {list_name}")
+
+        tasks = self._board_tasks().select_related('column', 'column__board', 'assigned_to')
+
+        if list_name == 'completed':
+            return tasks.filter(self._completed_q()).order_by('-completed_at', 'id')
+        if list_name == 'overdue':
+            return tasks.filter(self._overdue_q()).order_by('due_date', 'id')
+        if list_name == 'due_soon':
+            return tasks.filter(self._due_soon_q()).order_by('due_date', 'id')
+        return tasks.order_by('column__board__name', 'column__position', 'position', 'id')
+
+    def get_task_page(self, list_name, page_number=1, per_page=None) -> Dict[str, Any]:
+        """
+        Get one page of a metric modal task list, serialized for JSON
+
+        Args:
+            list_name: One of TASK_LISTS
+            page_number: 1-based page number (out of range values are clamped)
+            per_page: Page size (default MODAL_PAGE_SIZE)
+
+        Returns:
+            Dict with serialized tasks and pagination info
+        """
+        paginator = Paginator(self.get_task_list(list_name), per_page or self.MODAL_PAGE_SIZE)
+        page = paginator.get_page(page_number)
+
+        return {
+            'list': list_name,
+            'tasks': [self.serialize_task(task) for task in page.object_list],
+            'page': page.number,
+            'num_pages': paginator.num_pages,
+            'total': paginator.count,
+            'has_next': page.has_next(),
+        }
+
+    def serialize_task(self, task) -> Dict[str, Any]:
+        """Serialize a task row for the dashboard modals"""
+        due_relative = None
+        if task.due_date:
+            if task.due_date < self.now:
+                due_relative = f"{timesince(task.due_date, self.now)} ago"
+            else:
+                due_relative = timeuntil(task.due_date, self.now)
+
+        return {
+            'id': task.id,
+            'title': task.title,
+            'board': task.column.board.name,
+            'column': task.column.name,
+            'priority': task.priority,
+            'priority_display': task.get_priority_display(),
+            'progress': task.progress,
+            'assigned_to': task.assigned_to.username if task.assigned_to else None,
+            'due_date': task.due_date.isoformat() if task.due_date else None,
+            'due_date_display': task.due_date.strftime('%b %d, %Y') if task.due_date else None,
+            'due_relative': due_relative,
+            'updated_at_display': task.updated_at.strftime('%b %d, %Y'),
+            'completed_at_display': task.completed_at.strftime('%b %d, %Y') if task.completed_at else None,
+            'url': reverse('task_detail', args=[task.id]),
+        }
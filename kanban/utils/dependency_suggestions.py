@@ -6,6 +6,7 @@ Analyzes task descriptions to suggest parent-child relationships and task depend
 
 import json
 import logging
+from collections import defaultdict
 from typing import List, Dict, Optional
 from django.utils import timezone
 from kanban.models import Task
@@ -16,7 +17,7 @@ logger = logging.getLogger(__name__)
 class DependencyAnalyzer:
     """
     Analyzes task descriptions to suggest dependencies
-    Uses NLP and keyword matching to find related tasks
+    Uses the board's TF-IDF similarity index and keyword matching to find related tasks
     """
     
     # Keywords that indicate parent-child relationships
@@ -37,6 +38,8 @@ class DependencyAnalyzer:
         Returns:
             Dictionary with suggested dependencies and confidence scores
         """
+        from kanban.utils.task_similarity_service import TaskSimilarityService
+        
         if not task.description:
             return {
                 'parent_suggestions': [],
@@ -47,86 +50,16 @@ class DependencyAnalyzer:
             }
         
         try:
-            # Tokenize and prepare text
-            description_lower = task.description.lower()
-            
-            # Find similar tasks in the same column or board
+            # Compared against the other tasks of the board, or else of the same column
             if board:
-                other_tasks = Task.objects.filter(column__board=board).exclude(id=task.id)
+                index = TaskSimilarityService.for_board(board)
             else:
-                other_tasks = Task.objects.filter(column=task.column).exclude(id=task.id)
-            
-            parent_suggestions = []
-            related_suggestions = []
-            blocking_suggestions = []
-            
-            # Analyze each other task
-            for other_task in other_tasks:
-                if not other_task.description:
-                    continue
-                
-                other_desc_lower = other_task.description.lower()
-                
-                # Check for parent-child relationships
-                parent_score = DependencyAnalyzer._calculate_parent_relationship_score(
-                    description_lower, other_desc_lower, task, other_task
-                )
-                
-                if parent_score > 0.5:
-                    parent_suggestions.append({
-                        'task_id': other_task.id,
-                        'task_title': other_task.title,
-                        'confidence': round(parent_score, 2),
-                        'reason': 'Task appears to be a prerequisite'
-                    })
-                
-                # Check for related tasks
-                related_score = DependencyAnalyzer._calculate_relatedness_score(
-                    description_lower, other_desc_lower
-                )
-                
-                if related_score > 0.6:
-                    related_suggestions.append({
-                        'task_id': other_task.id,
-                        'task_title': other_task.title,
-                        'confidence': round(related_score, 2),
-                        'reason': 'Tasks share similar context or requirements'
-                    })
-                
-                # Check for blocking relationships
-                blocking_score = DependencyAnalyzer._calculate_blocking_score(
-                    description_lower, other_desc_lower
-                )
-                
-                if blocking_score > 0.6:
-                    blocking_suggestions.append({
-                        'task_id': other_task.id,
-                        'task_title': other_task.title,
-                        'confidence': round(blocking_score, 2),
-                        'reason': 'This task may be blocked by or block the other task'
-                    })
-            
-            # Sort by confidence and limit results
-            parent_suggestions.sort(key=lambda x: x['confidence'], reverse=True)
-            related_suggestions.sort(key=lambda x: x['confidence'], reverse=True)
-            blocking_suggestions.sort(key=lambda x: x['confidence'], reverse=True)
+                index = TaskSimilarityService.for_column(task.column)
             
-            overall_confidence = max(
-                [s['confidence'] for s in parent_suggestions] +
-                [s['confidence'] for s in related_suggestions] +
-                [s['confidence'] for s in blocking_suggestions] +
-                [0]
-            )
-            
-            return {
-                'parent_suggestions': parent_suggestions[:3],  # Top 3 suggestions
-                'related_suggestions': related_suggestions[:3],
-                'blocking_suggestions': blocking_suggestions[:3],
-                'confidence': round(overall_confidence, 2),
-                'analysis': f"Found {len(parent_suggestions)} potential parent tasks, "
-                          f"{len(related_suggestions)} related tasks, and "
-                          f"{len(blocking_suggestions)} potentially blocking tasks"
-            }
+            result = index.suggestions(task.id)
+            if result is None:
+                raise ValueError('Task is not part of the analyzed board')
+            return result
         
         except Exception as e:
             logger.error(f"Error analyzing task dependencies: {str(e)}")
@@ -137,58 +70,143 @@ class DependencyAnalyzer:
                 'confidence': 0,
                 'analysis': f'Error during analysis: {str(e)}'
             }
+
+
+class TaskGraph:
+    """
+    A board's task relationships loaded in three queries: the tasks (with
+    their column and assignee names), the related-task rows and the
+    dependency rows. Levels and subtrees are then worked out in memory, so
+    deep hierarchies cost no extra queries.
+    """
     
-    @staticmethod
-    def _calculate_parent_relationship_score(desc1: str, desc2: str, task1: Task, task2: Task) -> float:
-        """Calculate probability that task2 is a parent of task1"""
-        score = 0
-        
-        # Check if desc1 contains parent keywords and desc2 contains child keywords
-        task1_has_child_keywords = any(keyword in desc1 for keyword in DependencyAnalyzer.CHILD_KEYWORDS)
-        task2_has_parent_keywords = any(keyword in desc2 for keyword in DependencyAnalyzer.PARENT_KEYWORDS)
-        
-        if task1_has_child_keywords and task2_has_parent_keywords:
-            score += 0.4
-        
-        # Check for explicit dependency mentions
-        for keyword in DependencyAnalyzer.DEPENDENCY_KEYWORDS:
-            if keyword in desc1 and task2.title.lower() in desc1:
-                score += 0.3
-        
-        # Check column position (earlier columns might indicate parent tasks)
-        if task2.column and task1.column:
-            if task2.column.position < task1.column.position:
-                score += 0.2
-        
-        return min(score, 1.0)
+    def __init__(self, tasks: List[Dict], related: List[tuple], dependencies: List[tuple]):
+        self.tasks = {task['id']: task for task in tasks}
+        self.order = [task['id'] for task in tasks]
+        self.children = defaultdict(list)
+        for task in tasks:
+            if task['parent_task_id'] in self.tasks:
+                self.children[task['parent_task_id']].append(task['id'])
+        self.related = defaultdict(list)
+        for task_id, related_id in related:
+            self.related[task_id].append(related_id)
+        # (dependent, prerequisite) pairs from Task.dependencies
+        self.dependencies = dependencies
+        self._levels = {}
     
-    @staticmethod
-    def _calculate_relatedness_score(desc1: str, desc2: str) -> float:
-        """Calculate how related two tasks are based on descriptions"""
-        score = 0
-        
-        # Simple word overlap scoring
-        words1 = set(desc1.split())
-        words2 = set(desc2.split())
+    @classmethod
+    def load(cls, board) -> 'TaskGraph':
+        board_id = getattr(board, 'id', board)
+        tasks = list(Task.objects.filter(column__board_id=board_id).order_by('position', 'id').values(
+            'id', 'title', 'description', 'priority', 'parent_task_id', 'column__name', 'assigned_to__username'
+        ))
+        Related = Task.related_tasks.through
+        related = list(Related.objects.filter(from_task__column__board_id=board_id).order_by('id').values_list(
+            'from_task_id', 'to_task_id'
+        ))
+        Dependencies = Task.dependencies.through
+        dependencies = list(Dependencies.objects.filter(from_task__column__board_id=board_id).order_by('id').values_list(
+            'from_task_id', 'to_task_id'
+        ))
+        return cls(tasks, related, dependencies)
+    
+    def level(self, task_id) -> int:
+        """Number of parent hops above a task (a parent on another board counts as one)"""
+        if task_id in self._levels:
+            return self._levels[task_id]
         
-        if len(words1) > 0 and len(words2) > 0:
-            overlap = len(words1.intersection(words2))
-            total = len(words1.union(words2))
-            score = overlap / total if total > 0 else 0
+        # Climb until a task with a known level (or the top), then fill in on the way down
+        path = []
+        seen = set()
+        current = task_id
+        while current in self.tasks and current not in self._levels and current not in seen:
+            seen.add(current)
+            path.append(current)
+            current = self.tasks[current]['parent_task_id']
+        if current in self._levels:
+            base = self._levels[current] + 1
+        else:
+            # Top reached: no parent (0), a parent off the board (1) or a parent cycle (0)
+            base = 1 if current is not None and current not in self.tasks else 0
+        for offset, node in enumerate(reversed(path)):
+            self._levels[node] = base + offset
+        return self._levels[task_id]
+    
+    def title(self, task_id) -> Optional[str]:
+        task = self.tasks.get(task_id)
+        return task['title'] if task else None
+    
+    def tree(self, task_id, include_subtasks: bool = True, include_related: bool = False) -> Dict:
+        """Nested tree below a task, built without recursion"""
+        def node(node_id):
+            task = self.tasks[node_id]
+            parent_id = task['parent_task_id']
+            return {
+                'id': node_id,
+                'title': task['title'],
+                'description': task['description'][:100] if task['description'] else '',
+                'status': task['column__name'] or 'Unknown',
+                'assigned_to': task['assigned_to__username'] or 'Unassigned',
+                'priority': task['priority'],
+                'level': self.level(node_id),
+                'children': [],
+                'related': [
+                    {'id': related_id, 'title': self.title(related_id)} for related_id in self.related[node_id]
+                ] if include_related else [],
+                'parent': {'id': parent_id, 'title': self.title(parent_id)} if parent_id else None
+            }
         
-        return score
+        root = node(task_id)
+        stack = [(task_id, root)]
+        visited = {task_id}
+        while include_subtasks and stack:
+            node_id, tree_node = stack.pop()
+            for child_id in self.children[node_id]:
+                if child_id in visited:
+                    continue
+                visited.add(child_id)
+                child = node(child_id)
+                tree_node['children'].append(child)
+                stack.append((child_id, child))
+        return root
     
-    @staticmethod
-    def _calculate_blocking_score(desc1: str, desc2: str) -> float:
-        """Calculate if one task blocks the other"""
-        score = 0
+    def graph(self) -> Dict:
+        """Nodes with their levels and parent-child, related and dependency edges"""
+        nodes = []
+        edges = []
+        for task_id in self.order:
+            task = self.tasks[task_id]
+            nodes.append({
+                'id': task_id,
+                'label': f"{task['title'][:30]}...",
+                'full_title': task['title'],
+                'priority': task['priority'],
+                'status': task['column__name'] or 'Unknown',
+                'level': self.level(task_id)
+            })
         
-        # Check for explicit blocking keywords
-        for keyword in DependencyAnalyzer.BLOCKING_KEYWORDS:
-            if keyword in desc1:
-                score += 0.3
+        for task_id in self.order:
+            parent_id = self.tasks[task_id]['parent_task_id']
+            if parent_id:
+                edges.append({
+                    'from': parent_id,
+                    'to': task_id,
+                    'type': 'parent-child'
+                })
+            
+            for related_id in self.related[task_id]:
+                edges.append({
+                    'from': task_id,
+                    'to': related_id,
+                    'type': 'related'
+                })
         
-        return min(score, 1.0)
+        # Prerequisite first, like the Gantt chart arrows
+        edges.extend(
+            {'from': prerequisite_id, 'to': task_id, 'type': 'dependency'}
+            for task_id, prerequisite_id in self.dependencies
+        )
+        return {'nodes': nodes, 'edges': edges}
 
 
 class DependencyGraphGenerator:
@@ -210,42 +228,17 @@ class DependencyGraphGenerator:
         Returns:
             Dictionary representing the dependency tree
         """
-        tree_node = {
-            'id': task.id,
-            'title': task.title,
-            'description': task.description[:100] if task.description else '',
-            'status': task.column.name if task.column else 'Unknown',
-            'assigned_to': task.assigned_to.username if task.assigned_to else 'Unassigned',
-            'priority': task.priority,
-            'level': task.get_dependency_level(),
-            'children': [],
-            'related': [],
-            'parent': None
-        }
-        
-        # Add parent reference
-        if task.parent_task:
-            tree_node['parent'] = {
-                'id': task.parent_task.id,
-                'title': task.parent_task.title
-            }
+        graph = TaskGraph.load(task.column.board_id)
+        tree = graph.tree(task.id, include_subtasks, include_related)
         
-        # Add subtasks
-        if include_subtasks:
-            for subtask in task.subtasks.all():
-                tree_node['children'].append(
-                    DependencyGraphGenerator.generate_dependency_tree(subtask, include_subtasks, include_related)
-                )
-        
-        # Add related tasks
-        if include_related:
-            for related in task.related_tasks.all():
-                tree_node['related'].append({
-                    'id': related.id,
-                    'title': related.title
-                })
-        
-        return tree_node
+        # Parents and related tasks on other boards are not loaded
+        missing = {item['id'] for item in [tree['parent'], *tree['related']] if item and item['title'] is None}
+        if missing:
+            titles = dict(Task.objects.filter(id__in=missing).values_list('id', 'title'))
+            for item in [tree['parent'], *tree['related']]:
+                if item and item['title'] is None:
+                    item['title'] = titles.get(item['id'])
+        return tree
     
     @staticmethod
     def generate_dependency_graph(board, root_task_id: Optional[int] = None) -> Dict:
@@ -259,44 +252,24 @@ class DependencyGraphGenerator:
         Returns:
             Dictionary representing the full dependency graph
         """
-        nodes = []
-        edges = []
-        
-        tasks = Task.objects.filter(column__board=board)
-        
-        # Create nodes
-        for task in tasks:
-            nodes.append({
-                'id': task.id,
-                'label': f"{task.title[:30]}...",
-                'full_title': task.title,
-                'priority': task.priority,
-                'status': task.column.name if task.column else 'Unknown',
-                'level': task.get_dependency_level()
-            })
-        
-        # Create edges for parent-child relationships
-        for task in tasks:
-            if task.parent_task:
-                edges.append({
-                    'from': task.parent_task.id,
-                    'to': task.id,
-                    'type': 'parent-child'
-                })
-            
-            # Add related task edges
-            for related in task.related_tasks.all():
-                edges.append({
-                    'from': task.id,
-                    'to': related.id,
-                    'type': 'related'
-                })
-        
-        return {
-            'nodes': nodes,
-            'edges': edges,
-            'root_id': root_task_id
-        }
+        graph = TaskGraph.load(board).graph()
+        graph['root_id'] = root_task_id
+        return graph
+
+
+def _store_suggestions(task: Task, result: Dict, analyzed_at) -> None:
+    task.suggested_dependencies = {
+        'analysis_timestamp': analyzed_at.isoformat(),
+        'suggestions': result
+    }
+    task.last_dependency_analysis = analyzed_at
+
+
+def _top_parent_id(result: Dict) -> Optional[int]:
+    """Id of the parent suggestion confident enough to auto-link, if any"""
+    if result['parent_suggestions'] and result['parent_suggestions'][0]['confidence'] > 0.7:
+        return result['parent_suggestions'][0]['task_id']
+    return None
 
 
 def analyze_and_suggest_dependencies(task: Task, board=None, auto_link: bool = False) -> Dict:
@@ -315,22 +288,122 @@ def analyze_and_suggest_dependencies(task: Task, board=None, auto_link: bool = F
     result = analyzer.analyze_task_description(task, board)
     
     # Store suggestions on task
-    task.suggested_dependencies = {
-        'analysis_timestamp': timezone.now().isoformat(),
-        'suggestions': result
-    }
-    task.last_dependency_analysis = timezone.now()
+    _store_suggestions(task, result, timezone.now())
     
     # Optionally auto-link top parent suggestion
-    if auto_link and result['parent_suggestions']:
-        top_parent = result['parent_suggestions'][0]
-        if top_parent['confidence'] > 0.7:
-            try:
-                parent_task = Task.objects.get(id=top_parent['task_id'])
-                if not task.has_circular_dependency(parent_task):
-                    task.parent_task = parent_task
-            except Task.DoesNotExist:
-                logger.warning(f"Suggested parent task {top_parent['task_id']} not found")
+    parent_id = _top_parent_id(result) if auto_link else None
+    if parent_id:
+        try:
+            parent_task = Task.objects.get(id=parent_id)
+            if not task.has_circular_dependency(parent_task):
+                task.parent_task = parent_task
+        except Task.DoesNotExist:
+            logger.warning(f"Suggested parent task {parent_id} not found")
     
-    task.save()
+    # Leaves the board's similarity index valid for the next task, and updated_at
+    # untouched so incremental runs only pick the task up again once it is edited
+    task.save(update_fields=['suggested_dependencies', 'last_dependency_analysis', 'parent_task'])
     return result
+
+
+def _would_create_cycle(task_id: int, parent_id: int, linked: Dict[int, int]) -> bool:
+    """
+    Whether parent_id can reach task_id through parent links, where linked
+    holds new links not yet written (they replace the stored parent)
+    """
+    from kanban.utils.task_hierarchy_service import TaskHierarchyService
+    
+    node = parent_id
+    seen = set()
+    while node is not None and node not in seen:
+        if node == task_id:
+            return True
+        seen.add(node)
+        if node in linked:
+            node = linked[node]
+            continue
+        # Stored parents, nearest first, until one has a pending link
+        for ancestor_id in TaskHierarchyService.ancestor_ids(node):
+            if ancestor_id == task_id:
+                return True
+            if ancestor_id in linked:
+                node = linked[ancestor_id]
+                break
+        else:
+            return False
+    return False
+
+
+def analyze_board_dependencies(board_id: int, task_ids: Optional[List[int]] = None,
+                               incremental: bool = False, auto_link: bool = False,
+                               batch_size: int = 500) -> Dict:
+    """
+    Analyze a board's tasks against one similarity index, writing results back in bulk
+    
+    Args:
+        board_id: Board to analyze
+        task_ids: Only analyze these tasks (optional)
+        incremental: Skip tasks not edited since their last analysis
+        auto_link: Whether to automatically create links to top suggestions
+        batch_size: Tasks written per bulk update
+        
+    Returns:
+        Counts of analyzed, skipped, linked and failed tasks
+    """
+    from django.db.models import F, Q
+    from kanban.models import Board
+    from kanban.utils.board_analytics_service import BoardAnalyticsService
+    
+    # Taken before loading, so edits made during the run are picked up next time
+    analyzed_at = timezone.now()
+    board = Board.objects.get(id=board_id)
+    tasks = Task.objects.filter(column__board=board)
+    if task_ids is not None:
+        tasks = tasks.filter(id__in=task_ids)
+    total = tasks.count()
+    if incremental:
+        tasks = tasks.filter(
+            Q(last_dependency_analysis__isnull=True) | Q(updated_at__gt=F('last_dependency_analysis'))
+        )
+    
+    counts = {'board_id': board.id, 'board_name': board.name, 'analyzed': 0, 'skipped': 0, 'linked': 0, 'errors': 0}
+    
+    def flush(batch):
+        parents = {}
+        existing = set()
+        if auto_link:
+            # Suggestions come from a cached index, so check the parents still exist
+            parents = {task.id: _top_parent_id(result) for task, result in batch}
+            existing = set(Task.objects.filter(id__in=set(parents.values()) - {None}).values_list('id', flat=True))
+        linked = {}
+        updated = []
+        for task, result in batch:
+            parent_id = parents.get(task.id)
+            if (parent_id in existing and parent_id != task.parent_task_id
+                    and not _would_create_cycle(task.id, parent_id, linked)):
+                task.parent_task_id = parent_id
+                linked[task.id] = parent_id
+                counts['linked'] += 1
+            _store_suggestions(task, result, analyzed_at)
+            updated.append(task)
+        Task.objects.bulk_update(updated, ['suggested_dependencies', 'last_dependency_analysis', 'parent_task'])
+        counts['analyzed'] += len(updated)
+    
+    batch = []
+    for task in tasks.only('id', 'description', 'parent_task_id').order_by('id').iterator(chunk_size=batch_size):
+        try:
+            batch.append((task, DependencyAnalyzer.analyze_task_description(task, board)))
+        except Exception as e:
+            logger.error(f"Error analyzing task {task.id}: {str(e)}")
+            counts['errors'] += 1
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+    
+    counts['skipped'] = total - counts['analyzed'] - counts['errors']
+    if counts['linked']:
+        # Bulk updates send no signals
+        BoardAnalyticsService.mark_stale(board.id)
+    return counts
@@ -0,0 +1,246 @@
+"""
+Flow Metrics Service for TaskFlow
+Maintains daily BoardFlowDay / ColumnFlowDay rows (end-of-day task counts per
+board and column) and serves cumulative flow, burndown/burnup and throughput
+series from them. Rows are rebuilt by walking back from the board's current
+state and undoing each day's moves and creations, using per-day aggregates of
+the activity log, so the work depends on the number of days and columns and
+not on the number of activity rows.
+"""
+
+import re
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, Any, Optional
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# "Moved task '<title>' from '<column>' to '<column>'" as written by move_task and bulk moves
+MOVE_DESCRIPTION = re.compile(r".* from '(?P<from_name>.*?)' to '(?P<to_name>.*)'$", re.DOTALL)
+
+
+class FlowMetricsService:
+    """
+    Service for a board's historical flow metrics
+    Deleted tasks take their activity with them, so history only describes
+    tasks that still exist
+    """
+
+    LINK_BATCH_SIZE = 1000
+
+    def __init__(self, board, today=None):
+        self.board = board
+        self.today = today or timezone.localdate()
+
+    # Linking historical activity
+
+    @classmethod
+    def link_move_activities(cls, board_id=None) -> int:
+        """
+        Fill from_column/to_column on 'moved' activities recorded before they existed
+
+        Column names are parsed from the activity description and matched
+        against the task's board. Unmatched names are left empty.
+
+        Returns:
+            Number of activities linked
+        """
+        from kanban.models import Column, TaskActivity
+
+        activities = TaskActivity.objects.filter(activity_type='moved', to_column__isnull=True)
+        if board_id is not None:
+            activities = activities.filter(task__column__board_id=board_id)
+
+        columns_by_board = defaultdict(dict)
+        for column_id, column_board_id, name in Column.objects.order_by('-position', '-id').values_list(
+                'id', 'board_id', 'name'):
+            columns_by_board[column_board_id][name] = column_id  # First column of a duplicate name wins
+
+        linked = 0
+        batch = []
+        rows = activities.values_list('id', 'task__column__board_id', 'description').order_by('id')
+        for activity_id, activity_board_id, description in rows.iterator(chunk_size=cls.LINK_BATCH_SIZE):
+            match = MOVE_DESCRIPTION.match(description or '')
+            if not match:
+                continue
+            names = columns_by_board.get(activity_board_id, {})
+            to_column_id = names.get(match.group('to_name'))
+            if to_column_id is None:
+                continue
+            batch.append(TaskActivity(
+                id=activity_id,
+                from_column_id=names.get(match.group('from_name')),
+                to_column_id=to_column_id
+            ))
+            if len(batch) >= cls.LINK_BATCH_SIZE:
+                TaskActivity.objects.bulk_update(batch, ['from_column', 'to_column'])
+                linked += len(batch)
+                batch = []
+        if batch:
+            TaskActivity.objects.bulk_update(batch, ['from_column', 'to_column'])
+            linked += len(batch)
+        return linked
+
+    # Rebuilding daily rows
+
+    def first_day(self):
+        """Creation day of the board's oldest task (or today for an empty board)"""
+        from kanban.models import Task
+
+        first = Task.objects.filter(column__board=self.board).order_by('created_at').values_list(
+            'created_at', flat=True).first()
+        return timezone.localdate(first) if first else self.today
+
+    def rebuild(self, start=None) -> int:
+        """
+        Recompute the daily rows from start (default: the first task's creation day) to today
+
+        Returns:
+            Number of days written
+        """
+        from kanban.models import BoardFlowDay, ColumnFlowDay, Task, TaskActivity
+
+        start = min(start or self.first_day(), self.today)
+        columns = dict(self.board.columns.values_list('id', 'is_terminal'))
+        tasks = Task.objects.filter(column__board=self.board)
+
+        # Current end state: tasks per column
+        counts = defaultdict(int, tasks.values_list('column_id').annotate(n=Count('id')))
+
+        # Moves after start, aggregated per day and column pair
+        moves = defaultdict(list)
+        move_rows = TaskActivity.objects.filter(
+            activity_type='moved',
+            task__column__board=self.board,
+            created_at__date__gte=start,
+            to_column__isnull=False,
+        ).values_list('created_at__date', 'from_column_id', 'to_column_id').annotate(n=Count('id'))
+        for day, from_id, to_id, n in move_rows:
+            moves[day].append((from_id, to_id, n))
+
+        # Creations after start, per day and the column the task started in
+        first_move_from = TaskActivity.objects.filter(
+            task=OuterRef('pk'), activity_type='moved', from_column__isnull=False
+        ).order_by('created_at', 'id').values('from_column_id')[:1]
+        creations = defaultdict(list)
+        creation_rows = tasks.filter(created_at__date__gte=start).annotate(
+            initial_column=Coalesce(
+                Subquery(first_move_from), 'column_id', output_field=IntegerField()
+            )
+        ).values_list('created_at__date', 'initial_column').annotate(n=Count('id'))
+        for day, column_id, n in creation_rows:
+            creations[day].append((column_id, n))
+
+        board_days = []
+        column_days = []
+        day = self.today
+        while day >= start:
+            created_count = sum(n for _, n in creations[day])
+            completed_count = sum(n for column_id, n in creations[day] if columns.get(column_id))
+            completed_count += sum(
+                n for from_id, to_id, n in moves[day] if columns.get(to_id) and not columns.get(from_id)
+            )
+            board_days.append(BoardFlowDay(
+                board=self.board,
+                date=day,
+                total_tasks=sum(max(counts[column_id], 0) for column_id in columns),
+                done_tasks=sum(max(counts[column_id], 0) for column_id, terminal in columns.items() if terminal),
+                created_count=created_count,
+                completed_count=completed_count,
+            ))
+            column_days.extend(
+                ColumnFlowDay(board=self.board, column_id=column_id, date=day, task_count=max(counts[column_id], 0))
+                for column_id in columns
+            )
+
+            # Step back to the end of the previous day
+            for from_id, to_id, n in moves[day]:
+                counts[to_id] -= n
+                if from_id is not None:
+                    counts[from_id] += n
+            for column_id, n in creations[day]:
+                counts[column_id] -= n
+            day -= timedelta(days=1)
+
+        with transaction.atomic():
+            BoardFlowDay.objects.filter(board=self.board, date__gte=start).delete()
+            ColumnFlowDay.objects.filter(board=self.board, date__gte=start).delete()
+            BoardFlowDay.objects.bulk_create(board_days, batch_size=1000)
+            ColumnFlowDay.objects.bulk_create(column_days, batch_size=1000)
+        return len(board_days)
+
+    def record_recent(self, days=2) -> int:
+        """Refresh the last few days (run daily by the periodic job)"""
+        return self.rebuild(start=self.today - timedelta(days=days - 1))
+
+    # Series served by the API
+
+    def _range(self, days):
+        return self.today - timedelta(days=days - 1)
+
+    def cumulative_flow(self, days=90) -> Dict[str, Any]:
+        """Tasks per column at the end of each day, columns in board order"""
+        from kanban.models import ColumnFlowDay
+
+        start = self._range(days)
+        rows = list(ColumnFlowDay.objects.filter(board=self.board, date__gte=start).values_list(
+            'date', 'column_id', 'task_count'))
+        dates = sorted({row[0] for row in rows})
+        index = {day: i for i, day in enumerate(dates)}
+
+        series = {column_id: [0] * len(dates) for column_id in self.board.columns.values_list('id', flat=True)}
+        for day, column_id, task_count in rows:
+            if column_id in series:
+                series[column_id][index[day]] = task_count
+
+        return {
+            'dates': [day.isoformat() for day in dates],
+            'columns': [
+                {'id': column.id, 'name': column.name, 'is_terminal': column.is_terminal, 'counts': series[column.id]}
+                for column in self.board.columns.order_by('position', 'id')
+            ],
+        }
+
+    def burndown(self, days=90) -> Dict[str, Any]:
+        """Scope, done and remaining task counts at the end of each day"""
+        from kanban.models import BoardFlowDay
+
+        rows = list(BoardFlowDay.objects.filter(board=self.board, date__gte=self._range(days)).order_by('date').values_list(
+            'date', 'total_tasks', 'done_tasks'))
+        return {
+            'dates': [row[0].isoformat() for row in rows],
+            'scope': [row[1] for row in rows],
+            'done': [row[2] for row in rows],
+            'remaining': [row[1] - row[2] for row in rows],
+        }
+
+    def throughput(self, weeks=12) -> Dict[str, Any]:
+        """Tasks completed per week (weeks start on Monday)"""
+        from kanban.models import BoardFlowDay
+
+        first_monday = self.today - timedelta(days=self.today.weekday(), weeks=weeks - 1)
+        completed = defaultdict(int)
+        for day, count in BoardFlowDay.objects.filter(board=self.board, date__gte=first_monday).values_list(
+                'date', 'completed_count'):
+            completed[day - timedelta(days=day.weekday())] += count
+
+        week_starts = [first_monday + timedelta(weeks=i) for i in range(weeks)]
+        return {
+            'weeks': [
+                {'week_start': week_start.isoformat(), 'completed': completed[week_start]}
+                for week_start in week_starts
+            ],
+        }
+
+    @staticmethod
+    def parse_window(value, default, maximum) -> Optional[int]:
+        """Validate a ?days= / ?weeks= query parameter (None when invalid)"""
+        if value in (None, ''):
+            return default
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return None
+        return min(max(value, 1), maximum)
@@ -3,13 +3,17 @@ Resource Demand Forecasting Service for TaskFlow
 Adapted from ResourcePro with simplified 2-3 week forecasting and workload distribution
 """
 
+from collections import defaultdict
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Any
 from django.utils import timezone
+from django.db import transaction
 from django.db.models import Sum, Count, Q, F, Avg
 import statistics
 
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
 
 class DemandForecastingService:
     """
@@ -36,7 +40,7 @@ class DemandForecastingService:
             Dict with forecast data and alerts
         """
         from kanban.models import ResourceDemandForecast, Task, TeamCapacityAlert
-        from accounts.models import Organization
+        from accounts.models import UserProfile
         
         if days_ahead < 7 or days_ahead > 30:
             days_ahead = 21
@@ -44,21 +48,43 @@ class DemandForecastingService:
         period_start = timezone.now().date()
         period_end = period_start + timedelta(days=days_ahead)
         
-        # Get all board members
-        team_members = board.members.all()
+        # Open, high-priority and historical task counts for every member in one grouped query
+        team_members = list(board.members.all())
+        task_counts = {
+            row['assigned_to']: row
+            for row in Task.objects.filter(
+                column__board=board, assigned_to__in=team_members
+            ).values('assigned_to').annotate(
+                open_tasks=Count('id', filter=Q(is_done=False)),
+                high_priority_tasks=Count('id', filter=Q(is_done=False, priority__in=['high', 'urgent'])),
+                history=Count('id'),
+            )
+        }
+        
+        # Availability calendars, and arrival/completion trends fitted from task activity
+        profiles = {
+            profile['user_id']: profile
+            for profile in UserProfile.objects.filter(user__in=team_members).values(
+                'user_id', 'availability_schedule', 'weekly_capacity_hours'
+            )
+        }
+        trends = ThroughputForecaster(board, team_members, today=period_start).forecast(period_start, period_end)
+        
         forecasts = []
         alerts = []
         
         for member in team_members:
-            # Calculate current and predicted workload
-            current_workload = self._calculate_current_workload(member, board, period_start, period_end)
-            available_capacity = self._calculate_available_capacity(member, period_start, period_end)
-            predicted_workload = self._predict_future_workload(member, board, period_start, period_end)
-            
-            # Generate forecast
-            confidence = self._calculate_confidence_score(member, board)
+            counts = task_counts.get(member.id, {})
+            current_workload = self._calculate_current_workload(
+                counts.get('open_tasks', 0), counts.get('high_priority_tasks', 0)
+            )
+            available_capacity = self._calculate_available_capacity(
+                profiles.get(member.id), period_start, period_end
+            )
+            predicted_workload = self._predict_future_workload(current_workload, trends[member.id])
+            confidence = self._calculate_confidence_score(counts.get('history', 0))
             
-            forecast = ResourceDemandForecast.objects.create(
+            forecast = ResourceDemandForecast(
                 board=board,
                 resource_user=member,
                 resource_role=self._get_user_role(member),
@@ -75,14 +101,14 @@ class DemandForecastingService:
                 utilization = forecast.utilization_percentage
                 
                 # Create alert
-                if utilization >= 100:
+                if utilization >= 100 or not forecast.available_capacity_hours:  # No hours available at all
                     alert_level = 'critical'
                     alert_message = f"{member.get_full_name() or member.username} is critically overloaded ({utilization:.0f}% capacity)"
                 else:
                     alert_level = 'warning'
                     alert_message = f"{member.get_full_name() or member.username} is near capacity ({utilization:.0f}%)"
                 
-                alert = TeamCapacityAlert.objects.create(
+                alerts.append(TeamCapacityAlert(
                     board=board,
                     forecast=forecast,
                     alert_type='individual',
@@ -91,8 +117,7 @@ class DemandForecastingService:
                     resource_user=member,
                     message=alert_message,
                     workload_percentage=int(utilization)
-                )
-                alerts.append(alert)
+                ))
         
         # Calculate team-wide metrics
         total_capacity = sum(f.available_capacity_hours for f in forecasts)
@@ -101,25 +126,28 @@ class DemandForecastingService:
         
         # Check for team-wide overload
         if team_utilization >= 100:
-            team_alert = TeamCapacityAlert.objects.create(
+            alerts.append(TeamCapacityAlert(
                 board=board,
                 alert_type='team',
                 alert_level='critical',
                 status='active',
                 message=f"Team is critically overloaded ({team_utilization:.0f}% total capacity)",
                 workload_percentage=int(team_utilization)
-            )
-            alerts.append(team_alert)
+            ))
         elif team_utilization >= 80:
-            team_alert = TeamCapacityAlert.objects.create(
+            alerts.append(TeamCapacityAlert(
                 board=board,
                 alert_type='team',
                 alert_level='warning',
                 status='active',
                 message=f"Team is near capacity ({team_utilization:.0f}% total capacity)",
                 workload_percentage=int(team_utilization)
-            )
-            alerts.append(team_alert)
+            ))
+        
+        # Forecasts first, so the alerts can point at their primary keys
+        with transaction.atomic():
+            ResourceDemandForecast.objects.bulk_create(forecasts)
+            TeamCapacityAlert.objects.bulk_create(alerts)
         
         return {
             'forecasts': forecasts,
@@ -128,7 +156,8 @@ class DemandForecastingService:
             'period_start': period_start,
             'period_end': period_end,
             'total_capacity': total_capacity,
-            'total_predicted_workload': total_predicted
+            'total_predicted_workload': total_predicted,
+            'trends': trends
         }
     
     def generate_workload_distribution_recommendations(self, board, period_days=21):
@@ -167,7 +196,7 @@ class DemandForecastingService:
         # Get unassigned and low-priority tasks
         active_tasks = Task.objects.filter(
             column__board=board,
-            column__name__in=['To Do', 'In Progress']
+            is_done=False
         ).order_by('priority', 'due_date')
         
         # For each overloaded member, suggest reassignments or deferrals
@@ -232,68 +261,43 @@ class DemandForecastingService:
         
         return recommendations
     
-    def _calculate_current_workload(self, user, board, start_date, end_date):
-        """Calculate current workload for a user in given period"""
-        from kanban.models import Task
-        
-        tasks = Task.objects.filter(
-            assigned_to=user,
-            column__board=board,
-            column__name__in=['To Do', 'In Progress', 'In Review']
-        )
-        
+    def _calculate_current_workload(self, open_tasks, high_priority_tasks):
+        """Calculate current workload from a user's open and high-priority task counts"""
         # Estimate 8 hours per task as base
         # Can be enhanced with actual time tracking
-        base_hours = len(tasks) * 8
+        base_hours = open_tasks * 8
         
         # Add any high-priority overhead
-        high_priority = tasks.filter(priority__in=['high', 'urgent']).count()
-        additional_hours = high_priority * 4
+        additional_hours = high_priority_tasks * 4
         
         return Decimal(str(base_hours + additional_hours))
     
-    def _calculate_available_capacity(self, user, start_date, end_date):
-        """Calculate available capacity (working hours) for a user"""
-        # Calculate working days (excluding weekends)
-        days_count = (end_date - start_date).days
-        weeks = days_count / 7
-        working_days = weeks * 5  # 5 working days per week
+    def _calculate_available_capacity(self, profile, start_date, end_date):
+        """
+        Calculate available capacity (working hours) for a user from their availability calendar
         
-        # Assume 8 hours per working day, adjustable
-        hours_per_day = 8
-        total_available = working_days * hours_per_day
+        Args:
+            profile: The user's availability_schedule and weekly_capacity_hours, or None without a profile
+        """
+        hours_by_weekday = _weekday_hours(profile)
+        days_count = (end_date - start_date).days
+        total_available = sum(
+            hours_by_weekday[(start_date + timedelta(days=offset)).weekday()] for offset in range(days_count)
+        )
         
-        return Decimal(str(total_available))
+        return Decimal(str(round(total_available, 2)))
     
-    def _predict_future_workload(self, user, board, start_date, end_date):
-        """Predict future workload based on current tasks and trends"""
-        from kanban.models import Task
-        
-        # Get pending and in-progress tasks
-        current_workload = self._calculate_current_workload(user, board, start_date, end_date)
-        
-        # Look at historical patterns
-        all_tasks = Task.objects.filter(
-            assigned_to=user,
-            column__board=board
-        ).order_by('-created_at')
-        
-        # Add buffer for new tasks (20% increase expected)
-        trend_multiplier = 1.2
-        predicted = current_workload * Decimal(str(trend_multiplier))
+    def _predict_future_workload(self, current_workload, trend):
+        """Predict future workload from current tasks plus the tasks expected to arrive"""
+        if not trend['history_days']:
+            # No arrivals on record: add a buffer for new tasks (20% increase expected)
+            return current_workload * Decimal('1.2')
         
+        predicted = current_workload + Decimal(str(round(trend['arrivals'] * ThroughputForecaster.HOURS_PER_TASK, 2)))
         return predicted
     
-    def _calculate_confidence_score(self, user, board):
+    def _calculate_confidence_score(self, task_count):
         """Calculate confidence score based on historical data quality"""
-        from kanban.models import Task
-        
-        # More tasks = higher confidence
-        task_count = Task.objects.filter(
-            assigned_to=user,
-            column__board=board
-        ).count()
-        
         # Base confidence increases with task history
         if task_count < 5:
             confidence = Decimal('0.50')  # Low confidence
@@ -354,6 +358,119 @@ class DemandForecastingService:
         }
 
 
+class ThroughputForecaster:
+    """
+    Forecast how many tasks each member will receive and complete in a period
+    Daily arrival (task created) and completion (moved into a completion
+    column) series are built for all members from two grouped queries over
+    TaskActivity, keyed by each task's current assignee. Each series is fitted
+    with simple exponential smoothing on weekday-adjusted values, and the
+    forecast for a day is the smoothed level times that weekday's factor.
+    """
+    
+    HISTORY_DAYS = 56  # 8 weeks, so every weekday factor averages 8 observations
+    SMOOTHING = 0.3
+    HOURS_PER_TASK = 8  # Matches the base estimate of current workload
+    
+    def __init__(self, board, users, today=None):
+        self.board = board
+        self.user_ids = [user.id for user in users]
+        self.today = today or timezone.localdate()
+        self.history_start = self.today - timedelta(days=self.HISTORY_DAYS)
+    
+    def _series(self, activities) -> Dict[int, List[int]]:
+        """Per-user daily counts of the given activities over the history window"""
+        series = {user_id: [0] * self.HISTORY_DAYS for user_id in self.user_ids}
+        for user_id, day, count in activities.values_list(
+                'task__assigned_to', 'created_at__date').annotate(n=Count('id')):
+            offset = (day - self.history_start).days
+            if 0 <= offset < self.HISTORY_DAYS:
+                series[user_id][offset] += count
+        return series
+    
+    def load(self):
+        """Arrival and completion series for every user, in two queries"""
+        from kanban.models import TaskActivity
+        
+        activities = TaskActivity.objects.filter(
+            task__column__board=self.board,
+            task__assigned_to__in=self.user_ids,
+            created_at__date__gte=self.history_start,
+            created_at__date__lt=self.today,
+        )
+        arrivals = self._series(activities.filter(activity_type='created'))
+        completions = self._series(activities.filter(
+            activity_type='moved', to_column__is_terminal=True
+        ).exclude(from_column__is_terminal=True))
+        return arrivals, completions
+    
+    @classmethod
+    def smoothed_total(cls, series, first_day, start, days) -> float:
+        """
+        Expected total over days days from start, given a daily series beginning on first_day
+        """
+        if not any(series):
+            return 0.0
+        mean = sum(series) / len(series)
+        
+        by_weekday = defaultdict(list)
+        for offset, value in enumerate(series):
+            by_weekday[(first_day + timedelta(days=offset)).weekday()].append(value)
+        seasonal = {weekday: sum(values) / len(values) / mean for weekday, values in by_weekday.items()}
+        
+        level = mean
+        for offset, value in enumerate(series):
+            factor = seasonal[(first_day + timedelta(days=offset)).weekday()]
+            if factor:  # Weekdays with no activity at all say nothing about the level
+                level += cls.SMOOTHING * (value / factor - level)
+        
+        return sum(
+            level * seasonal.get((start + timedelta(days=offset)).weekday(), 1.0) for offset in range(days)
+        )
+    
+    def forecast(self, start_date, end_date) -> Dict[int, Dict[str, Any]]:
+        """
+        Expected arrivals and completions per user between start_date and end_date
+        
+        Returns:
+            Dict of user id to arrivals, completions and history_days (days with an arrival on record)
+        """
+        arrivals, completions = self.load()
+        days = (end_date - start_date).days
+        return {
+            user_id: {
+                'arrivals': round(self.smoothed_total(arrivals[user_id], self.history_start, start_date, days), 2),
+                'completions': round(self.smoothed_total(completions[user_id], self.history_start, start_date, days), 2),
+                'history_days': sum(1 for value in arrivals[user_id] if value),
+            }
+            for user_id in self.user_ids
+        }
+
+
+def _weekday_hours(profile) -> List[float]:
+    """
+    Working hours for each weekday (Monday first) from an availability schedule
+    
+    Without a schedule, weekly_capacity_hours (default 40) is spread over Monday to Friday.
+    """
+    weekly_hours = (profile or {}).get('weekly_capacity_hours') or 40
+    schedule = (profile or {}).get('availability_schedule') or {}
+    if not isinstance(schedule, dict) or not schedule:
+        return [weekly_hours / 5] * 5 + [0, 0]
+    
+    hours = []
+    for name in WEEKDAYS:
+        window = schedule.get(name) or {}
+        try:
+            start = datetime.strptime(window['start'], '%H:%M')
+            end = datetime.strptime(window['end'], '%H:%M')
+        except (KeyError, TypeError, ValueError):
+            hours.append(0)  # Days missing from a schedule are days off
+            continue
+        hours.append(max((end - start).total_seconds() / 3600, 0))
+    return hours
+
+
 class WorkloadAnalyzer:
     """Analyze and optimize workload distribution"""
     
@@ -0,0 +1,143 @@
+"""
+Task Position Service for TaskFlow
+Keeps task positions spaced out so a drag-and-drop move writes a single row,
+renumbering a column only when two neighbours run out of room between them
+"""
+
+import logging
+from typing import Optional
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPositionService:
+    """
+    Service for ordering tasks inside columns using gapped integer positions
+    A move takes the midpoint between its new neighbours; when no integer is
+    left between them the column is rebalanced back to evenly spaced slots
+    """
+
+    POSITION_GAP = 1024  # Spacing between neighbouring tasks after a rebalance
+    MIN_GAP = 2  # Schedule a background rebalance once a gap gets this small
+
+    def __init__(self, column):
+        self.column = column
+
+    def _ordered_positions(self, exclude_task_id=None):
+        """Positions of the column's tasks in display order"""
+        from kanban.models import Task
+
+        tasks = Task.objects.filter(column=self.column)
+        if exclude_task_id is not None:
+            tasks = tasks.exclude(id=exclude_task_id)
+        return tasks.order_by('position', 'id').values_list('position', flat=True)
+
+    def append_position(self) -> int:
+        """Position for a task added at the end of the column"""
+        last = self._ordered_positions().reverse().first()
+        return (last + self.POSITION_GAP) if last is not None else self.POSITION_GAP
+
+    def _slot(self, index, exclude_task_id=None):
+        """Position for a display index plus the gap it was split from (None when appending)"""
+        index = max(int(index or 0), 0)
+        positions = self._ordered_positions(exclude_task_id)
+
+        if index == 0:
+            after = positions.first()
+            return ((after - self.POSITION_GAP) if after is not None else self.POSITION_GAP), None
+
+        # Only the two neighbours around the insertion point are fetched
+        neighbours = list(positions[index - 1:index + 1])
+        if not neighbours:
+            last = positions.reverse().first()
+            return ((last + self.POSITION_GAP) if last is not None else self.POSITION_GAP), None
+        if len(neighbours) == 1:
+            return neighbours[0] + self.POSITION_GAP, None
+
+        before, after = neighbours
+        if after - before < 2:
+            return None, after - before
+        return (before + after) // 2, after - before
+
+    def position_for_index(self, index, exclude_task_id=None) -> Optional[int]:
+        """
+        Compute the position that places a task at a display index
+
+        Args:
+            index: 0-based index among the column's other tasks
+            exclude_task_id: The task being moved, if it is already in the column
+
+        Returns:
+            Integer position, or None if the neighbours have no room between them
+        """
+        return self._slot(index, exclude_task_id)[0]
+
+    def move(self, task, index, update_fields=None):
+        """
+        Place a task in this column at a display index
+
+        Normally writes only the moved row. If the neighbours have no room left
+        the column is rebalanced first (one bulk UPDATE) and the move retried.
+
+        Args:
+            task: Task instance to move
+            index: 0-based index among the column's other tasks
+            update_fields: Extra fields changed on the task to save with the move
+
+        Returns:
+            The new position
+        """
+        position, gap = self._slot(index, exclude_task_id=task.id)
+        if position is None:
+            with transaction.atomic():
+                self.rebalance(exclude_task_id=task.id)
+                position, gap = self._slot(index, exclude_task_id=task.id)
+
+        task.column = self.column
+        task.position = position
+        task.save(update_fields=['column', 'position', 'updated_at', *(update_fields or [])])
+
+        if gap is not None and gap <= 2 * self.MIN_GAP:
+            self.schedule_rebalance()
+        return position
+
+    def rebalance(self, exclude_task_id=None) -> int:
+        """
+        Renumber the column's tasks to evenly spaced positions
+
+        Args:
+            exclude_task_id: Leave this task out (used while it is being moved)
+
+        Returns:
+            Number of tasks whose position changed
+        """
+        from kanban.models import Task
+
+        tasks = Task.objects.filter(column=self.column)
+        if exclude_task_id is not None:
+            tasks = tasks.exclude(id=exclude_task_id)
+
+        changed = []
+        for i, task in enumerate(tasks.only('id', 'position').order_by('position', 'id'), start=1):
+            position = i * self.POSITION_GAP
+            if task.position != position:
+                task.position = position
+                changed.append(task)
+
+        # bulk_update skips auto_now, so rebalancing does not bump updated_at
+        Task.objects.bulk_update(changed, ['position'], batch_size=500)
+        return len(changed)
+
+    def schedule_rebalance(self):
+        """Queue a background rebalance of this column once the current transaction commits"""
+        from kanban.tasks import rebalance_column_positions
+
+        def enqueue():
+            try:
+                rebalance_column_positions.delay(self.column.id)
+            except Exception as e:
+                # Moves still work without the worker; a crowded column is rebalanced inline
+                logger.warning(f"Could not queue position rebalance for column {self.column.id}: {e}")
+
+        transaction.on_commit(enqueue)
@@ -0,0 +1,128 @@
+"""
+Task Hierarchy Service for TaskFlow
+Ancestor, descendant, depth and cycle queries over Task.parent_task. Each is
+a single recursive CTE that follows the indexed parent_task_id column, so a
+deep epic costs one query instead of one per level. The walk stops at
+MAX_DEPTH, which also bounds it if bad data ever forms a parent cycle.
+"""
+
+from typing import List, Optional
+from django.db import connection
+
+ANCESTORS_CTE = (
+    "WITH RECURSIVE hierarchy(id, parent_task_id, depth) AS ("
+    "SELECT id, parent_task_id, 0 FROM {table} WHERE id = %s "
+    "UNION ALL "
+    "SELECT t.id, t.parent_task_id, h.depth + 1 FROM {table} t "
+    "JOIN hierarchy h ON t.id = h.parent_task_id WHERE h.depth < %s"
+    ") "
+)
+
+DESCENDANTS_CTE = (
+    "WITH RECURSIVE hierarchy(id, parent_task_id, depth) AS ("
+    "SELECT id, parent_task_id, 0 FROM {table} WHERE id = %s "
+    "UNION ALL "
+    "SELECT t.id, t.parent_task_id, h.depth + 1 FROM {table} t "
+    "JOIN hierarchy h ON t.parent_task_id = h.id WHERE h.depth < %s"
+    ") "
+)
+
+
+class TaskHierarchyService:
+    """
+    Service for parent/subtask hierarchy queries
+    Ancestors come nearest first; descendants level by level, in board
+    order within a level
+    """
+
+    MAX_DEPTH = 1000
+
+    @staticmethod
+    def _table():
+        from kanban.models import Task
+        return Task._meta.db_table
+
+    @classmethod
+    def _ids(cls, cte, task_id, select, params=()) -> List:
+        with connection.cursor() as cursor:
+            cursor.execute(cte.format(table=cls._table()) + select, [task_id, cls.MAX_DEPTH, *params])
+            return cursor.fetchall()
+
+    @classmethod
+    def ancestor_ids(cls, task_id) -> List[int]:
+        """Ids of a task's parents, nearest first"""
+        rows = cls._ids(ANCESTORS_CTE, task_id, "SELECT id FROM hierarchy WHERE depth > 0 ORDER BY depth")
+        return [row[0] for row in rows]
+
+    @classmethod
+    def ancestors(cls, task) -> List:
+        """A task's parents, nearest first"""
+        from kanban.models import Task
+
+        table = cls._table()
+        return list(Task.objects.raw(
+            ANCESTORS_CTE.format(table=table) +
+            f"SELECT t.* FROM {table} t JOIN hierarchy h ON h.id = t.id WHERE h.depth > 0 ORDER BY h.depth",
+            [task.id, cls.MAX_DEPTH]
+        ))
+
+    @classmethod
+    def descendants(cls, task) -> List:
+        """All subtasks below a task, level by level"""
+        from kanban.models import Task
+
+        table = cls._table()
+        return list(Task.objects.raw(
+            DESCENDANTS_CTE.format(table=table) +
+            f"SELECT t.* FROM {table} t JOIN hierarchy h ON h.id = t.id WHERE h.depth > 0 "
+            "ORDER BY h.depth, t.position, t.id",
+            [task.id, cls.MAX_DEPTH]
+        ))
+
+    @classmethod
+    def depth(cls, task) -> int:
+        """Number of parents above a task"""
+        if task.parent_task_id is None:
+            return 0
+        rows = cls._ids(ANCESTORS_CTE, task.id, "SELECT COUNT(*) FROM hierarchy WHERE depth > 0")
+        return rows[0][0]
+
+    @classmethod
+    def would_create_cycle(cls, task, parent) -> bool:
+        """Whether making parent the parent of task would close a loop"""
+        if parent is None:
+            return False
+        if parent.id == task.id:
+            return True
+        # A loop forms exactly when the task is already above the new parent
+        return bool(cls._ids(ANCESTORS_CTE, parent.id, "SELECT 1 FROM hierarchy WHERE id = %s", [task.id]))
+
+    @classmethod
+    def chain(cls, parent_id: Optional[int], task_id) -> List[int]:
+        """Dependency chain (root first) of a task with the given parent"""
+        if parent_id is None:
+            return [task_id]
+        return list(reversed(cls.ancestor_ids(parent_id))) + [parent_id, task_id]
+
+    @classmethod
+    def update_descendant_chains(cls, task) -> int:
+        """
+        Rebuild dependency_chain for every subtask below a task from the task's own chain
+
+        Returns:
+            Number of subtasks updated
+        """
+        from kanban.models import Task
+
+        chains = {task.id: list(task.dependency_chain)}
+        subtasks = []
+        rows = cls._ids(
+            DESCENDANTS_CTE, task.id,
+            "SELECT id, parent_task_id FROM hierarchy WHERE depth > 0 ORDER BY depth"
+        )
+        for subtask_id, parent_id in rows:
+            # Parents come a level earlier, so their chain is known
+            chains[subtask_id] = chains[parent_id] + [subtask_id]
+            subtasks.append(Task(id=subtask_id, dependency_chain=chains[subtask_id]))
+        Task.objects.bulk_update(subtasks, ['dependency_chain'], batch_size=500)
+        return len(subtasks)
@@ -0,0 +1,220 @@
+"""
+Task Search Service for TaskFlow
+Full-text search over task titles and descriptions. On SQLite the index is an
+FTS5 table, on PostgreSQL a table of weighted tsvectors with a GIN index. Both
+are keyed by task id, carry the task's board id and are kept current by the
+Task save/delete signals. Other databases fall back to substring matching.
+"""
+
+import re
+from typing import List, Optional
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, When
+from django.db.models.expressions import RawSQL
+
+INDEX_TABLE = 'kanban_task_fts'
+
+# Fill the index from the task table (board id comes from the task's column)
+POPULATE_SQL = {
+    'sqlite': (
+        f"INSERT INTO {INDEX_TABLE} (rowid, board_id, title, description) "
+        "SELECT t.id, c.board_id, t.title, COALESCE(t.description, '') "
+        "FROM kanban_task t JOIN kanban_column c ON c.id = t.column_id"
+    ),
+    'postgresql': (
+        f"INSERT INTO {INDEX_TABLE} (task_id, board_id, document) "
+        "SELECT t.id, c.board_id, "
+        "setweight(to_tsvector('simple', t.title), 'A') || "
+        "setweight(to_tsvector('simple', COALESCE(t.description, '')), 'B') "
+        "FROM kanban_task t JOIN kanban_column c ON c.id = t.column_id"
+    ),
+}
+
+CREATE_SQL = {
+    'sqlite': [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {INDEX_TABLE} USING fts5("
+        "board_id UNINDEXED, title, description, tokenize = 'unicode61 remove_diacritics 2')",
+    ],
+    'postgresql': [
+        f"CREATE TABLE IF NOT EXISTS {INDEX_TABLE} ("
+        "task_id integer PRIMARY KEY, board_id integer NOT NULL, document tsvector NOT NULL)",
+        f"CREATE INDEX IF NOT EXISTS {INDEX_TABLE}_document ON {INDEX_TABLE} USING GIN (document)",
+        f"CREATE INDEX IF NOT EXISTS {INDEX_TABLE}_board ON {INDEX_TABLE} (board_id)",
+    ],
+}
+
+
+class TaskSearchService:
+    """
+    Service for the task full-text index
+    Search terms are split into words and every word must match as a prefix,
+    so "deploy api" finds "Deployment of the API gateway". Title matches rank
+    above description matches.
+    """
+
+    TITLE_WEIGHT = 10.0
+    DESCRIPTION_WEIGHT = 1.0
+    INDEXED_FIELDS = {'title', 'description', 'column', 'column_id'}
+    # Ranked results are ordered by a CASE over their ids, which must stay
+    # within the database's bound-parameter limit
+    MAX_RANKED_RESULTS = 200
+
+    @staticmethod
+    def backend(conn=None) -> Optional[str]:
+        """Index flavour for the database, or None when only substring search is available"""
+        vendor = (conn or connection).vendor
+        return vendor if vendor in CREATE_SQL else None
+
+    @staticmethod
+    def tokenize(term) -> List[str]:
+        return re.findall(r'\w+', term or '')
+
+    @classmethod
+    def create_index(cls, conn=None):
+        """Create the index table if it is missing (used by the rebuild command)"""
+        conn = conn or connection
+        backend = cls.backend(conn)
+        if backend is None:
+            return
+        with conn.cursor() as cursor:
+            for sql in CREATE_SQL[backend]:
+                cursor.execute(sql)
+
+    @classmethod
+    def rebuild(cls, board_id=None) -> int:
+        """
+        Re-index every task, or only the tasks of one board
+
+        Returns:
+            Number of tasks indexed
+        """
+        backend = cls.backend()
+        if backend is None:
+            return 0
+
+        cls.create_index()
+        key_column = 'rowid' if backend == 'sqlite' else 'task_id'
+        populate = POPULATE_SQL[backend]
+        params = []
+        with connection.cursor() as cursor:
+            if board_id is None:
+                cursor.execute(f"DELETE FROM {INDEX_TABLE}")
+            else:
+                # Also drop rows of tasks that moved off the board
+                cursor.execute(
+                    f"DELETE FROM {INDEX_TABLE} WHERE board_id = %s OR {key_column} IN "
+                    "(SELECT t.id FROM kanban_task t JOIN kanban_column c ON c.id = t.column_id WHERE c.board_id = %s)",
+                    [board_id, board_id]
+                )
+                populate += " WHERE c.board_id = %s"
+                params = [board_id]
+            cursor.execute(populate, params)
+            return cursor.rowcount
+
+    @classmethod
+    def index_task(cls, task):
+        """Add or refresh one task in the index"""
+        backend = cls.backend()
+        if backend is None:
+            return
+        board_id = task.column.board_id
+        with connection.cursor() as cursor:
+            if backend == 'sqlite':
+                cursor.execute(f"DELETE FROM {INDEX_TABLE} WHERE rowid = %s", [task.id])
+                cursor.execute(
+                    f"INSERT INTO {INDEX_TABLE} (rowid, board_id, title, description) VALUES (%s, %s, %s, %s)",
+                    [task.id, board_id, task.title, task.description or '']
+                )
+            else:
+                cursor.execute(
+                    f"INSERT INTO {INDEX_TABLE} (task_id, board_id, document) VALUES (%s, %s, "
+                    "setweight(to_tsvector('simple', %s), 'A') || setweight(to_tsvector('simple', %s), 'B')) "
+                    "ON CONFLICT (task_id) DO UPDATE SET board_id = EXCLUDED.board_id, document = EXCLUDED.document",
+                    [task.id, board_id, task.title, task.description or '']
+                )
+
+    @classmethod
+    def remove_task(cls, task_id):
+        backend = cls.backend()
+        if backend is None:
+            return
+        key_column = 'rowid' if backend == 'sqlite' else 'task_id'
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {INDEX_TABLE} WHERE {key_column} = %s", [task_id])
+
+    @classmethod
+    def _match_sql(cls, backend, board_id, words, ranked=True):
+        """SELECT of matching task ids (best first when ranked) and its parameters"""
+        if backend == 'sqlite':
+            match = ' '.join(f'"{word}"*' for word in words)
+            sql = f"SELECT rowid FROM {INDEX_TABLE} WHERE {INDEX_TABLE} MATCH %s AND board_id = %s"
+            params = [match, board_id]
+            if ranked:
+                sql += f" ORDER BY bm25({INDEX_TABLE}, 0, %s, %s), rowid"
+                params += [cls.TITLE_WEIGHT, cls.DESCRIPTION_WEIGHT]
+        else:
+            # Words are \w+ runs, so they cannot carry tsquery operators
+            query = ' & '.join(f"{word}:*" for word in words)
+            sql = f"SELECT task_id FROM {INDEX_TABLE} WHERE board_id = %s AND document @@ to_tsquery('simple', %s)"
+            params = [board_id, query]
+            if ranked:
+                sql += " ORDER BY ts_rank(document, to_tsquery('simple', %s)) DESC, task_id"
+                params.append(query)
+        return sql, params
+
+    @classmethod
+    def search(cls, board, term, limit=None) -> Optional[List[int]]:
+        """
+        Ids of the board's tasks matching a search term, best match first
+
+        Returns:
+            List of task ids, or None when the database has no full-text index
+        """
+        backend = cls.backend()
+        if backend is None:
+            return None
+        words = cls.tokenize(term)
+        if not words:
+            return []
+
+        sql, params = cls._match_sql(backend, getattr(board, 'id', board), words)
+        if limit:
+            sql += " LIMIT %s"
+            params.append(limit)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return [row[0] for row in cursor.fetchall()]
+
+    @classmethod
+    def filter_queryset(cls, tasks, board, term, ranked=False, limit=None):
+        """
+        Restrict a Task queryset to search matches
+
+        Args:
+            tasks: Task queryset to filter
+            board: Board being searched
+            term: Raw search input
+            ranked: Order the result by relevance instead of leaving the ordering alone
+                    (keeps the best MAX_RANKED_RESULTS matches at most)
+            limit: Keep only the best matches
+        """
+        backend = cls.backend()
+        if backend is None:
+            return tasks.filter(Q(title__icontains=term) | Q(description__icontains=term))
+        words = cls.tokenize(term)
+        if not words:
+            return tasks.none()
+
+        if not ranked and not limit:
+            # Joined in SQL, so large boards never build a long list of ids
+            sql, params = cls._match_sql(backend, getattr(board, 'id', board), words, ranked=False)
+            return tasks.filter(id__in=RawSQL(sql, params))
+
+        task_ids = cls.search(board, term, limit=min(limit or cls.MAX_RANKED_RESULTS, cls.MAX_RANKED_RESULTS))
+        tasks = tasks.filter(id__in=task_ids)
+        if ranked and task_ids:
+            tasks = tasks.order_by(Case(
+                *[When(id=task_id, then=rank) for rank, task_id in enumerate(task_ids)],
+                output_field=IntegerField()
+            ))
+        return tasks
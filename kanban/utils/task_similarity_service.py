@@ -0,0 +1,303 @@
+"""
+Task Similarity Service for TaskFlow
+Board-level index behind DependencyAnalyzer. Descriptions are tokenized once
+into L2-normalized TF-IDF vectors, and tasks scoring above the related
+threshold are found through an inverted index (term -> postings) of each
+row's rarer terms, so only pairs that can pass the threshold are scored.
+Keyword flags and title mentions are worked out per task in the same pass.
+The built index is cached until a task or column of the board changes
+(signals bump a per-board version; a per-process cache also keys on the
+tasks' latest edit, which other processes' changes do reach).
+"""
+
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Dict, Any, List, Optional
+from django.core.cache import cache
+from django.db.models import Count, F, Max
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or that the this to was were will with'.split()
+)
+
+
+def tokenize(text) -> List[str]:
+    return re.findall(r'\w+', (text or '').lower())
+
+
+class TaskSimilarityService:
+    """
+    Service holding the similarity index of a set of tasks (a board or a column)
+    Only tasks with a description are indexed, as the analyzer ignores the rest
+    """
+
+    CACHE_TIMEOUT = 60 * 60  # Bounds staleness after bulk writes, which send no signals
+    INDEXED_FIELDS = {'title', 'description', 'column', 'position'}
+    RELATED_THRESHOLD = 0.6
+    SUGGESTION_LIMIT = 3
+    # Terms indexed by more than sqrt(tasks) rows (and at least this many) are
+    # left out of the pair search, keeping large boards close to linear
+    MIN_MAX_POSTINGS = 50
+
+    def __init__(self, tasks: List[Dict[str, Any]]):
+        """
+        Args:
+            tasks: Dicts with id, title, description and column position, in board order
+        """
+        from kanban.utils.dependency_suggestions import DependencyAnalyzer
+
+        tasks = [task for task in tasks if task['description']]
+        self.ids = [task['id'] for task in tasks]
+        self.index = {task_id: i for i, task_id in enumerate(self.ids)}
+        self.titles = [task['title'] for task in tasks]
+        self.positions = [task['column_position'] for task in tasks]
+
+        texts = [task['description'].lower() for task in tasks]
+        # Substring checks, as the analyzer has always matched keywords
+        self.child_keywords = [any(k in text for k in DependencyAnalyzer.CHILD_KEYWORDS) for text in texts]
+        self.parent_keywords = [any(k in text for k in DependencyAnalyzer.PARENT_KEYWORDS) for text in texts]
+        self.dependency_keywords = [sum(k in text for k in DependencyAnalyzer.DEPENDENCY_KEYWORDS) for text in texts]
+        self.blocking_keywords = [sum(k in text for k in DependencyAnalyzer.BLOCKING_KEYWORDS) for text in texts]
+
+        tokens = [tokenize(text) for text in texts]
+        self.mentions = self._title_mentions(tokens)
+        self.related = self._related(tokens)
+
+        # Tasks with parent keywords, in board order, and their column positions sorted
+        self.parent_candidates = [i for i, flag in enumerate(self.parent_keywords) if flag]
+        self.parent_positions = sorted(self.positions[i] for i in self.parent_candidates)
+
+    # Building
+
+    def _title_mentions(self, tokens) -> List[List[int]]:
+        """For each description, the tasks whose title appears in it as a phrase"""
+        titles = defaultdict(list)
+        for i, title in enumerate(self.titles):
+            title_tokens = tuple(tokenize(title))
+            if title_tokens:
+                titles[title_tokens].append(i)
+        lengths = sorted({len(phrase) for phrase in titles})
+
+        mentions = []
+        for i, words in enumerate(tokens):
+            found = set()
+            for length in lengths:
+                for start in range(len(words) - length + 1):
+                    found.update(titles.get(tuple(words[start:start + length]), ()))
+            found.discard(i)
+            mentions.append(sorted(found))
+        return mentions
+
+    def _related(self, tokens):
+        """Per task: how many tasks pass RELATED_THRESHOLD and the closest few"""
+        count = len(tokens)
+        threshold = self.RELATED_THRESHOLD
+        term_counts = [Counter(word for word in words if word not in STOP_WORDS) for words in tokens]
+        document_frequency = Counter(term for counts in term_counts for term in counts)
+
+        # Smoothed inverse document frequency, then L2-normalized rows
+        vectors = []
+        for counts in term_counts:
+            weights = {
+                term: tf * (math.log((1 + count) / (1 + document_frequency[term])) + 1) for term, tf in counts.items()
+            }
+            norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            vectors.append({term: weight / norm for term, weight in weights.items()} if norm else {})
+
+        # Prefix filtering: the most common terms of a row, up to a norm of the
+        # threshold, stay out of the inverted index. A row can only score above
+        # the threshold against rows sharing one of its indexed terms, so
+        # common words no longer pair every task with every other.
+        postings = defaultdict(list)
+        for i, vector in enumerate(vectors):
+            norm = 0.0
+            for term in sorted(vector, key=lambda term: (-document_frequency[term], term)):
+                weight = vector[term]
+                if math.sqrt(norm + weight * weight) < threshold:
+                    norm += weight * weight
+                else:
+                    postings[term].append((i, weight))
+
+        # Terms still indexed by many rows are dropped, bounding the work at
+        # about rows x terms x MAX_POSTINGS (pairs sharing only those are missed)
+        max_postings = max(self.MIN_MAX_POSTINGS, math.isqrt(count))
+        postings = {term: entries for term, entries in postings.items() if len(entries) <= max_postings}
+
+        # Norm of each row's terms outside the remaining postings (unindexed or
+        # dropped), which bounds how much they can add to a partial score
+        outside = [sum(weight * weight for weight in vector.values()) for vector in vectors]
+        for entries in postings.values():
+            for j, weight in entries:
+                outside[j] -= weight * weight
+        outside = [math.sqrt(max(norm, 0.0)) for norm in outside]
+
+        related = []
+        self.candidate_pairs = 0
+        for i, vector in enumerate(vectors):
+            partial = defaultdict(float)
+            for term, weight in vector.items():
+                for j, weight_j in postings.get(term, ()):
+                    partial[j] += weight * weight_j
+            partial.pop(i, None)
+            self.candidate_pairs += len(partial)
+
+            matches = []
+            for j, score in partial.items():
+                if score + outside[j] <= threshold:  # Even the terms outside the postings cannot lift it over
+                    continue
+                vector_j = vectors[j]
+                score = sum(weight * vector_j.get(term, 0.0) for term, weight in vector.items())
+                if score > threshold:
+                    matches.append((j, score))
+            closest = heapq.nsmallest(self.SUGGESTION_LIMIT, matches, key=lambda match: (-match[1], match[0]))
+            related.append((len(matches), [(j, round(score, 2)) for j, score in closest]))
+        return related
+
+    # Loading and caching
+
+    @staticmethod
+    def _version_key(board_id):
+        return f'task_similarity:{board_id}:version'
+
+    @classmethod
+    def invalidate(cls, board_id):
+        """Drop the cached indexes of a board (and of its columns)"""
+        if board_id is None:
+            return
+        key = cls._version_key(board_id)
+        if not cache.add(key, 2, None):
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, 2, None)
+
+    @classmethod
+    def for_board(cls, board) -> 'TaskSimilarityService':
+        from kanban.models import Task
+        return cls._cached(board.id, 'board', board.id, Task.objects.filter(column__board=board))
+
+    @classmethod
+    def for_column(cls, column) -> 'TaskSimilarityService':
+        from kanban.models import Task
+        return cls._cached(column.board_id, 'column', column.id, Task.objects.filter(column=column))
+
+    @classmethod
+    def _cached(cls, board_id, scope, scope_id, tasks):
+        from kanban.utils.board_access_service import BoardAccessService
+
+        version = cache.get(cls._version_key(board_id)) or 1
+        if BoardAccessService.cache_is_shared():
+            # The task count also catches bulk inserts and deletes
+            state = tasks.count()
+        else:
+            # Version bumps made by other processes never reach a per-process
+            # cache, so the key also follows the tasks' latest edit
+            state = tasks.aggregate(count=Count('id'), edited=Max('updated_at'))
+            state = f"{state['count']}:{state['edited'].timestamp() if state['edited'] else 0}"
+        key = f'task_similarity:{board_id}:v{version}:{scope}:{scope_id}:{state}'
+
+        index = cache.get(key)
+        if index is None:
+            index = cls(list(tasks.order_by('position', 'id').values(
+                'id', 'title', 'description', column_position=F('column__position')
+            )))
+            cache.set(key, index, cls.CACHE_TIMEOUT)
+        return index
+
+    # Suggestions
+
+    def _suggestion(self, j, confidence, reason) -> Dict[str, Any]:
+        return {
+            'task_id': self.ids[j],
+            'task_title': self.titles[j],
+            'confidence': round(confidence, 2),
+            'reason': reason,
+        }
+
+    def _parent_suggestions(self, i):
+        """Other tasks scoring above 0.5 as a prerequisite of task i, best first, and their count"""
+        position = self.positions[i]
+        # Keyword pair (0.4) plus earlier column (0.2): every such task scores 0.6
+        earlier = self.child_keywords[i] and bisect_left(self.parent_positions, position) > 0
+
+        mentioned = []
+        for j in self.mentions[i]:
+            score = 0
+            if self.child_keywords[i] and self.parent_keywords[j]:
+                score += 0.4
+            score += 0.3 * self.dependency_keywords[i]
+            if self.positions[j] < position:
+                score += 0.2
+            score = min(score, 1.0)
+            if score > 0.5:
+                mentioned.append((j, score))
+        mentioned_ids = {j for j, _ in mentioned}
+
+        total = len(mentioned)
+        if earlier:
+            in_earlier = bisect_left(self.parent_positions, position)
+            total += in_earlier - sum(
+                1 for j in mentioned_ids if self.parent_keywords[j] and self.positions[j] < position
+            )
+
+        candidates = list(mentioned)
+        if earlier:
+            # The first few in board order are enough: the rest can only tie with them
+            found = 0
+            for j in self.parent_candidates:
+                if found >= self.SUGGESTION_LIMIT:
+                    break
+                if j not in mentioned_ids and self.positions[j] < position:
+                    candidates.append((j, 0.6))
+                    found += 1
+        # Ties keep board order, as the analyzer's stable sort did
+        candidates.sort(key=lambda match: (-match[1], match[0]))
+        return candidates[:self.SUGGESTION_LIMIT], total
+
+    def suggestions(self, task_id) -> Optional[Dict[str, Any]]:
+        """
+        Parent, related and blocking suggestions for an indexed task
+
+        Returns:
+            The analyzer's result dict, or None if the task is not indexed
+        """
+        i = self.index.get(task_id)
+        if i is None:
+            return None
+
+        parents, parent_count = self._parent_suggestions(i)
+        parent_suggestions = [
+            self._suggestion(j, score, 'Task appears to be a prerequisite') for j, score in parents
+        ]
+
+        related_count, related = self.related[i]
+        related_suggestions = [
+            self._suggestion(j, score, 'Tasks share similar context or requirements') for j, score in related
+        ]
+
+        # Blocking keywords only look at this task's own text, so they flag every other task alike
+        blocking_score = min(0.3 * self.blocking_keywords[i], 1.0)
+        blocking_suggestions = []
+        blocking_count = 0
+        if blocking_score > 0.6:
+            blocking_count = len(self.ids) - 1
+            blocking_suggestions = [
+                self._suggestion(j, blocking_score, 'This task may be blocked by or block the other task')
+                for j in [j for j in range(len(self.ids)) if j != i][:self.SUGGESTION_LIMIT]
+            ]
+
+        overall_confidence = max(
+            [s['confidence'] for s in parent_suggestions + related_suggestions + blocking_suggestions] + [0]
+        )
+        return {
+            'parent_suggestions': parent_suggestions,
+            'related_suggestions': related_suggestions,
+            'blocking_suggestions': blocking_suggestions,
+            'confidence': round(overall_confidence, 2),
+            'analysis': f"Found {parent_count} potential parent tasks, "
+                        f"{related_count} related tasks, and "
+                        f"{blocking_count} potentially blocking tasks"
+        }
@@ -1,14 +1,15 @@
 import logging
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse, HttpResponseForbidden, HttpResponse, FileResponse
+from django.http import JsonResponse, HttpResponseForbidden, HttpResponse, FileResponse, StreamingHttpResponse
 from django.contrib import messages
+from django.db import transaction
 from django.db.models import Count, Q, Case, When, IntegerField, Max
 from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 from datetime import timedelta
 import json
-import csv
+import re
 from django.contrib.auth.models import User
 from django.core.management import call_command
 
@@ -19,6 +20,17 @@ from .models import Board, Column, Task, TaskLabel, Comment, TaskActivity, TaskF
 from .forms import BoardForm, ColumnForm, TaskForm, TaskLabelForm, CommentForm, TaskMoveForm, TaskSearchForm, TaskFileForm
 from accounts.models import UserProfile
 from .stakeholder_models import StakeholderTaskInvolvement
+from .utils.dashboard_service import DashboardStatsService
+from .utils.position_service import TaskPositionService
+from .utils.board_snapshot_service import BoardSnapshotService
+from .utils.board_export_service import BoardExportService
+from .utils.board_import_service import BoardImportService, BoardImportError
+from .utils.board_analytics_service import BoardAnalyticsService
+from .utils.board_access_service import BoardAccessService
+from .utils.task_search_service import TaskSearchService
+from .utils.cycle_time_service import CycleTimeService
+from .utils.critical_path_service import CriticalPathService
+from .utils.board_events import broadcast_board_event, broadcast_board_events, task_payload, columns_payload
 
 @login_required
 def dashboard(request):
@@ -48,46 +60,8 @@ def dashboard(request):
             (Q(created_by=request.user) | Q(members=request.user))
         ).distinct()
         
-        # Get analytics data
-        task_count = Task.objects.filter(column__board__in=boards).count()
-        completed_count = Task.objects.filter(
-            column__board__in=boards, 
-            column__name__icontains='done'
-        ).count()
-        
-        # Get completion rate
-        completion_rate = 0
-        if task_count > 0:
-            completion_rate = (completed_count / task_count) * 100
-          # Get tasks due soon (next 3 days)
-        due_soon = Task.objects.filter(
-            column__board__in=boards,
-            due_date__range=[timezone.now(), timezone.now() + timedelta(days=3)]
-        ).count()
-          # Get overdue tasks (due date in the past and not in done columns)
-        overdue_count = Task.objects.filter(
-            column__board__in=boards,
-            due_date__lt=timezone.now()
-        ).exclude(
-            column__name__icontains='done'
-        ).count()
-        
-        # Get detailed task data for modals
-        all_tasks = Task.objects.filter(column__board__in=boards).select_related('column', 'assigned_to', 'column__board')
-        completed_tasks = Task.objects.filter(
-            column__board__in=boards, 
-            column__name__icontains='done'
-        ).select_related('column', 'assigned_to', 'column__board')
-        overdue_tasks = Task.objects.filter(
-            column__board__in=boards,
-            due_date__lt=timezone.now()
-        ).exclude(
-            column__name__icontains='done'
-        ).select_related('column', 'assigned_to', 'column__board')
-        due_soon_tasks = Task.objects.filter(
-            column__board__in=boards,
-            due_date__range=[timezone.now(), timezone.now() + timedelta(days=3)]
-        ).select_related('column', 'assigned_to', 'column__board')
+        # Get analytics data (all counters in a single aggregate query)
+        stats = DashboardStatsService(request.user, boards).get_counts()
         
         # Get sort preference from request (default to 'urgency')
         sort_by = request.GET.get('sort_tasks', 'urgency')
@@ -95,9 +69,8 @@ def dashboard(request):
         # Base query for My Tasks
         my_tasks_query = Task.objects.filter(
             column__board__in=boards,
-            assigned_to=request.user
-        ).exclude(
-            column__name__icontains='done'
+            assigned_to=request.user,
+            is_done=False
         ).select_related('column', 'column__board', 'assigned_to')
         
         # Apply sorting based on user preference
@@ -165,33 +138,44 @@ def dashboard(request):
                 }
             ).order_by('-is_overdue', 'priority_order', 'due_date', 'created_at')[:8]
         
-        # Count of my tasks (for stats)
-        my_tasks_count = Task.objects.filter(
-            column__board__in=boards,
-            assigned_to=request.user
-        ).exclude(
-            column__name__icontains='done'
-        ).count()        
         return render(request, 'kanban/dashboard.html', {
             'boards': boards,
-            'task_count': task_count,
-            'completed_count': completed_count,
-            'completion_rate': round(completion_rate, 1),
-            'due_soon': due_soon,
-            'overdue_count': overdue_count,
-            'all_tasks': all_tasks,
-            'completed_tasks': completed_tasks,
-            'overdue_tasks': overdue_tasks,
-            'due_soon_tasks': due_soon_tasks,
-            'remaining_tasks': task_count - completed_count,
+            'task_count': stats['task_count'],
+            'completed_count': stats['completed_count'],
+            'completion_rate': stats['completion_rate'],
+            'due_soon': stats['due_soon'],
+            'overdue_count': stats['overdue_count'],
+            'remaining_tasks': stats['remaining_tasks'],
             'my_tasks': my_tasks,
-            'my_tasks_count': my_tasks_count,
+            'my_tasks_count': stats['my_tasks_count'],
             'my_tasks_sort_by': sort_by,  # Current sort preference
             'now': timezone.now(),  # For comparing dates in the template
         })
     except UserProfile.DoesNotExist:
         return redirect('create_organization')
 
+@login_required
+@require_http_methods(["GET"])
+def dashboard_tasks_api(request, list_name):
+    """Get one page of a dashboard metric modal task list (JSON API)"""
+    if list_name not in DashboardStatsService.TASK_LISTS:
+        return JsonResponse({'error': 'Unknown task list'}, status=404)
+    
+    try:
+        organization = request.user.profile.organization
+    except UserProfile.DoesNotExist:
+        return JsonResponse({'error': 'User profile not found'}, status=404)
+    
+    boards = Board.objects.filter(
+        Q(organization=organization) & 
+        (Q(created_by=request.user) | Q(members=request.user))
+    ).distinct()
+    
+    service = DashboardStatsService(request.user, boards)
+    data = service.get_task_page(list_name, request.GET.get('page', 1))
+    data['success'] = True
+    return JsonResponse(data)
+
 @login_required
 def board_list(request):
     try:
@@ -207,7 +191,8 @@ def board_list(request):
         
         return render(request, 'kanban/board_list.html', {
             'boards': boards,
-            'form': form
+            'form': form,
+            'import_progress_available': BoardImportService.progress_available(),
         })
     except UserProfile.DoesNotExist:
         return redirect('create_organization')
@@ -269,7 +254,7 @@ def board_detail(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     columns = Column.objects.filter(board=board)
     
@@ -339,29 +324,26 @@ def board_detail(request, board_id):
         if search_form.cleaned_data.get('assignee'):
             tasks = tasks.filter(assigned_to=search_form.cleaned_data['assignee'])
         
-        # Filter by search term (in title or description)
+        # Filter by search term (full-text, prefix match on title or description)
         if search_form.cleaned_data.get('search_term'):
-            search_term = search_form.cleaned_data['search_term']
-            tasks = tasks.filter(
-                Q(title__icontains=search_term) | 
-                Q(description__icontains=search_term)
-            )
+            tasks = TaskSearchService.filter_queryset(tasks, board, search_form.cleaned_data['search_term'])
     
-    # Get all labels for this board
-    labels = TaskLabel.objects.filter(board=board)
+    # Columns, cards, labels and members in a fixed number of queries
+    snapshot = BoardSnapshotService(board, tasks).build()
     
     # Get all organization members for the member dropdown
     try:
         organization = request.user.profile.organization
-        organization_members = UserProfile.objects.filter(organization=organization)
+        organization_members = UserProfile.objects.filter(organization=organization).select_related('user')
     except UserProfile.DoesNotExist:
         organization_members = []
     
     return render(request, 'kanban/board_detail.html', {
         'board': board,
-        'columns': columns,
-        'tasks': tasks,
-        'labels': labels,
+        'columns': snapshot['columns'],
+        'labels': snapshot['labels'],
+        'members': snapshot['members'],
+        'member_ids': {member['id'] for member in snapshot['members']},
         'organization_members': organization_members,
         'now': timezone.now(),  # Used for due date comparison
         'search_form': search_form,  # Add the search form to the context
@@ -374,7 +356,7 @@ def task_detail(request, task_id):
     board = task.column.board
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this task.")
     
     if request.method == 'POST':
@@ -439,7 +421,7 @@ def create_task(request, board_id, column_id=None):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     if column_id:
         column = get_object_or_404(Column, id=column_id, board=board)
@@ -466,11 +448,14 @@ def create_task(request, board_id, column_id=None):
             task.column = column
             task.created_by = request.user
             # Set position to be at the end of the column
-            last_position = Task.objects.filter(column=column).order_by('-position').first()
-            task.position = (last_position.position + 1) if last_position else 0
+            task.position = TaskPositionService(column).append_position()
             task.save()
             # Save many-to-many relationships
             form.save_m2m()
+            broadcast_board_event(board.id, 'task_created', dict(
+                task_payload(task, 'title', 'position', 'priority', 'progress', 'is_done', 'due_date'),
+                assigned_to=task.assigned_to.username if task.assigned_to else None
+            ), user=request.user)
             
             # Record activity
             TaskActivity.objects.create(
@@ -497,7 +482,7 @@ def delete_task(request, task_id):
     board = task.column.board
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this task.")
     
     if request.method == 'POST':
@@ -513,7 +498,7 @@ def create_column(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
     if request.method == 'POST':
@@ -540,7 +525,7 @@ def create_label(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
     if request.method == 'POST':
@@ -566,7 +551,7 @@ def delete_label(request, label_id):
     board = label.board
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
     # Delete the label
@@ -581,111 +566,13 @@ def board_analytics(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
-    # Get columns for this board
-    columns = Column.objects.filter(board=board)
-    
-    # Get tasks by column
-    tasks_by_column = []
-    for column in columns:
-        count = Task.objects.filter(column=column).count()
-        tasks_by_column.append({
-            'name': column.name,
-            'count': count
-        })
-    
-    # Get tasks by priority - convert QuerySet to list of dictionaries
-    priority_queryset = Task.objects.filter(column__board=board).values('priority').annotate(
-        count=Count('id')
-    ).order_by('priority')
-    
-    tasks_by_priority = []
-    for item in priority_queryset:
-        # Convert priority codes to readable names
-        priority_name = dict(Task.PRIORITY_CHOICES).get(item['priority'], item['priority'])
-        tasks_by_priority.append({
-            'priority': priority_name,
-            'count': item['count']
-        })
-    
-    # Get tasks by assigned user - convert QuerySet to list of dictionaries
-    user_queryset = Task.objects.filter(column__board=board).values(
-        'assigned_to__username'
-    ).annotate(
-        count=Count('id')
-    ).order_by('-count')
-    
-    tasks_by_user = []
-    for item in user_queryset:
-        username = item['assigned_to__username'] or 'Unassigned'
-        # Count completed tasks for this user
-        completed_user_tasks = Task.objects.filter(
-            column__board=board,
-            assigned_to__username=item['assigned_to__username'],
-            column__name__icontains='done'
-        ).count()
-        
-        # Calculate completion percentage
-        user_completion_rate = 0
-        if item['count'] > 0:
-            user_completion_rate = (completed_user_tasks / item['count']) * 100
-            
-        tasks_by_user.append({
-            'username': username,
-            'count': item['count'],
-            'completed': completed_user_tasks,
-            'completion_rate': int(user_completion_rate)
-        })
-    
-    # Get completion rate over time (last 30 days)
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    completed_tasks_queryset = TaskActivity.objects.filter(
-        task__column__board=board,
-        activity_type='moved',
-        description__contains='Done',
-        created_at__gte=thirty_days_ago
-    ).values('created_at__date').annotate(
-        count=Count('id')
-    ).order_by('created_at__date')
-    
-    completed_tasks = []
-    for item in completed_tasks_queryset:
-        completed_tasks.append({
-            'date': item['created_at__date'].strftime('%Y-%m-%d'),
-            'count': item['count']
-        })
-    
-    # Calculate productivity based on task progress
-    total_tasks = Task.objects.filter(column__board=board).count()
-    
-    # Get all tasks and their progress values
-    all_tasks = Task.objects.filter(column__board=board)
+    # Counters and chart series come from the board's precomputed snapshot
+    analytics = BoardAnalyticsService(board).get()
     
-    # Sum of completed tasks (100% progress or in Done column)
-    done_column_tasks = Task.objects.filter(
-        column__board=board, 
-        column__name__icontains='done'
-    )
-    completed_count = done_column_tasks.count() # Count completed tasks for this board
-    
-    # Set tasks in Done column to 100% progress for calculation
-    total_progress_percentage = 0
-    for task in all_tasks:
-        # If task is in Done column, count as 100%
-        if task.column.name.lower().find('done') >= 0:
-            progress = 100
-        else:
-            # Handle None progress values by defaulting to 0
-            progress = task.progress if task.progress is not None else 0
-        
-        total_progress_percentage += progress
-    
-    # Calculate overall productivity based on progress of all tasks
-    productivity = 0
-    if total_tasks > 0:
-        productivity = (total_progress_percentage / (total_tasks * 100)) * 100      # Get tasks due soon (next 7 days)
+    # Task lists stay lazy querysets; they are only evaluated if the template iterates them
     today = timezone.now().date()
     upcoming_tasks = Task.objects.filter(
         column__board=board,
@@ -697,65 +584,30 @@ def board_analytics(request, board_id):
     # Get overdue tasks (due date in the past and not in done columns)
     overdue_tasks = Task.objects.filter(
         column__board=board,
+        is_done=False,
         due_date__isnull=False,
         due_date__date__lt=today
-    ).exclude(
-        column__name__icontains='done'
     ).order_by('due_date')
     
-    # Get count of overdue tasks
-    overdue_count = overdue_tasks.count()
-    
-    # Lean Six Sigma Metrics
-    # Get tasks by value added category
-    value_added_count = Task.objects.filter(
-        column__board=board, 
-        labels__name='Value-Added', 
-        labels__category='lean'
-    ).count()
-    
-    necessary_nva_count = Task.objects.filter(
-        column__board=board, 
-        labels__name='Necessary NVA', 
-        labels__category='lean'
-    ).count()
-    
-    waste_count = Task.objects.filter(
-        column__board=board, 
-        labels__name='Waste/Eliminate', 
-        labels__category='lean'
-    ).count()
-    
-    # Calculate value-added percentage
-    total_categorized = value_added_count + necessary_nva_count + waste_count
-    value_added_percentage = 0
-    if total_categorized > 0:
-        value_added_percentage = (value_added_count / total_categorized) * 100
-      # Tasks by Lean Six Sigma category
-    tasks_by_lean_category = [
-        {'name': 'Value-Added', 'count': value_added_count, 'color': '#28a745'},
-        {'name': 'Necessary NVA', 'count': necessary_nva_count, 'color': '#ffc107'},
-        {'name': 'Waste/Eliminate', 'count': waste_count, 'color': '#dc3545'}
-    ]
     return render(request, 'kanban/board_analytics.html', {
         'board': board,
-        'columns': columns,
-        'tasks': all_tasks,  # Add all tasks to the template context
-        'tasks_by_column': tasks_by_column,  # Raw data for JSON encoding in template
-        'tasks_by_priority': tasks_by_priority,  # Raw data for JSON encoding in template
-        'tasks_by_user': tasks_by_user,  # Raw data for JSON encoding in template
-        'completed_tasks': completed_tasks,  # Raw data for JSON encoding in template
-        'tasks_by_lean_category': tasks_by_lean_category, # Raw data for JSON encoding in template
-        'productivity': round(productivity, 1),
+        'columns': Column.objects.filter(board=board),
+        'tasks': Task.objects.filter(column__board=board),
+        'tasks_by_column': analytics['tasks_by_column'],  # Raw data for JSON encoding in template
+        'tasks_by_priority': analytics['tasks_by_priority'],  # Raw data for JSON encoding in template
+        'tasks_by_user': analytics['tasks_by_user'],  # Raw data for JSON encoding in template
+        'completed_tasks': analytics['completed_tasks'],  # Raw data for JSON encoding in template
+        'tasks_by_lean_category': analytics['tasks_by_lean_category'], # Raw data for JSON encoding in template
+        'productivity': analytics['productivity'],
         'upcoming_tasks': upcoming_tasks,
-        'overdue_tasks': overdue_tasks,  # Add overdue tasks
-        'overdue_count': overdue_count,  # Add overdue count
-        'total_tasks': total_tasks,
-        'completed_count': completed_count,
+        'overdue_tasks': overdue_tasks,
+        'overdue_count': analytics['overdue_count'],
+        'total_tasks': analytics['total_tasks'],
+        'completed_count': analytics['completed_count'],
         'now': timezone.now(),  # For comparing dates in the template
         # Lean Six Sigma metrics
-        'value_added_percentage': round(value_added_percentage, 1),
-        'total_categorized': total_categorized,
+        'value_added_percentage': analytics['value_added_percentage'],
+        'total_categorized': analytics['total_categorized'],
     })
 
 @login_required
@@ -764,7 +616,7 @@ def gantt_chart(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
     # Get all tasks for this board with dates
@@ -774,9 +626,17 @@ def gantt_chart(request, board_id):
         due_date__isnull=False
     ).select_related('assigned_to', 'column').prefetch_related('dependencies')
     
+    # Slack and the critical path are scheduled over every task on the board
+    schedule = CriticalPathService(board).analyze()
+    critical = set(schedule['critical_path'])
+    for task in tasks:
+        task.slack_days = schedule['slack'].get(task.id)
+        task.is_critical = task.id in critical
+    
     context = {
         'board': board,
         'tasks': tasks,
+        'cyclic_task_count': len(schedule['cyclic']),
     }
     
     return render(request, 'kanban/gantt_chart.html', context)
@@ -794,29 +654,37 @@ def move_task(request):
         
         # Check if user has access to this board
         board = new_column.board
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': "You don't have access to this board."}, status=403)
         
         old_column = task.column
-        task.column = new_column
-        task.position = position
+        changed_fields = []
         
-        # Auto-update progress to 100% when moved to a "Done" column
-        if new_column.name.lower().find('done') >= 0:
+        # Auto-update progress to 100% when moved to a completion column
+        if new_column.is_terminal:
             task.progress = 100
+            changed_fields.append('progress')
         
-        task.save()
+        # Gapped positions: only the moved task is written
+        TaskPositionService(new_column).move(task, position, update_fields=changed_fields)
+        broadcast_board_event(board.id, 'task_moved', task_payload(task, 'position', 'progress', 'is_done'), user=request.user)
         
         # Record activity
         TaskActivity.objects.create(
             task=task,
             user=request.user,
             activity_type='moved',
-            description=f"Moved task '{task.title}' from '{old_column.name}' to '{new_column.name}'"
+            description=f"Moved task '{task.title}' from '{old_column.name}' to '{new_column.name}'",
+            from_column=old_column,
+            to_column=new_column
         )
         
+        # Moves between columns can start or finish the task's cycle
+        if old_column.id != new_column.id:
+            CycleTimeService.update_tasks([task.id])
+        
         # If progress was set to 100% automatically, record that too
-        if new_column.name.lower().find('done') >= 0 and task.progress == 100:
+        if new_column.is_terminal and task.progress == 100:
             TaskActivity.objects.create(
                 task=task,
                 user=request.user,
@@ -824,15 +692,6 @@ def move_task(request):
                 description=f"Automatically updated progress for '{task.title}' to 100% (Done)"
             )
         
-        # Reorder tasks in the column
-        tasks_to_reorder = Task.objects.filter(column=new_column).exclude(id=task_id)
-        for i, t in enumerate(tasks_to_reorder):
-            new_position = i
-            if i >= position:
-                new_position = i + 1
-            t.position = new_position
-            t.save()
-        
         return JsonResponse({'success': True})
     
     return JsonResponse({'error': 'Invalid request'}, status=400)
@@ -842,9 +701,8 @@ def add_board_member(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user is the board creator, superuser, or has access to the board
-    if not (board.created_by == request.user or 
-            request.user.is_superuser or 
-            request.user in board.members.all()):
+    if not (request.user.is_superuser or
+            BoardAccessService.can_access(request.user, board)):
         return HttpResponseForbidden("You don't have permission to add members to this board.")
     
     if request.method == 'POST':
@@ -855,7 +713,7 @@ def add_board_member(request, board_id):
                 # Check if user is in the same organization
                 if user.profile.organization == request.user.profile.organization:
                     # Add user to board members if not already a member
-                    if user not in board.members.all():
+                    if not BoardAccessService.is_member(user, board):
                         board.members.add(user)
                         messages.success(request, f'{user.username} added to the board successfully!')
                     else:
@@ -884,7 +742,7 @@ def delete_board(request, board_id):
     has_permission = (
         board.created_by == request.user or  # Board creator
         (user_profile and user_profile.is_admin and 
-         (request.user in board.members.all() or board.created_by == request.user)) or  # Organization admin with board access
+         BoardAccessService.can_access(request.user, board)) or  # Organization admin with board access
         (user_profile and request.user == board.organization.created_by)  # Organization creator
     )
     
@@ -942,7 +800,7 @@ def join_board(request, board_id):
         return redirect('organization_choice')
     
     # Check if user is already a member
-    if request.user in board.members.all() or board.created_by == request.user:
+    if BoardAccessService.can_access(request.user, board):
         messages.info(request, f"You are already a member of the board '{board.name}'.")
     else:
         # Add user to board members
@@ -960,7 +818,7 @@ def move_column(request, column_id, direction):
     board = column.board
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
     # Get all columns in order of position
@@ -995,6 +853,7 @@ def move_column(request, column_id, direction):
             if col.position != i:
                 col.position = i
                 col.save()
+        broadcast_board_event(board.id, 'columns_reordered', columns_payload(columns), user=request.user)
         
         messages.success(request, f"Column '{column.name}' moved {direction}.")
     
@@ -1013,7 +872,7 @@ def reorder_columns(request):
         board = get_object_or_404(Board, id=board_id)
         
         # Check if user has access to this board
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return JsonResponse({'error': "You don't have access to this board."}, status=403)
         
         # Get all columns in order
@@ -1034,6 +893,7 @@ def reorder_columns(request):
             if col.position != i:
                 col.position = i
                 col.save()
+        broadcast_board_event(board.id, 'columns_reordered', columns_payload(columns), user=request.user)
         
         return JsonResponse({'success': True})
     
@@ -1051,7 +911,7 @@ def reorder_multiple_columns(request):
             board = get_object_or_404(Board, id=board_id)
             
             # Check if user has access to this board
-            if not (board.created_by == request.user or request.user in board.members.all()):
+            if not BoardAccessService.can_access(request.user, board):
                 return JsonResponse({'error': "You don't have access to this board."}, status=403)
             
             # Create a dictionary to map column_id to position
@@ -1070,6 +930,7 @@ def reorder_multiple_columns(request):
             for index, column in enumerate(sorted_columns):
                 column.position = index
                 column.save()
+            broadcast_board_event(board.id, 'columns_reordered', columns_payload(sorted_columns), user=request.user)
             
             return JsonResponse({
                 'success': True,
@@ -1083,6 +944,77 @@ def reorder_multiple_columns(request):
     
     return JsonResponse({'error': 'Invalid request'}, status=400)
 
+@login_required
+def reorder_multiple_tasks(request):
+    """Handle AJAX request to move several tasks at once (e.g. a multi-select drag)"""
+    if request.method == 'POST' and request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        try:
+            data = json.loads(request.body)
+            moves = data.get('tasks', [])
+            board_id = data.get('boardId')
+            
+            board = get_object_or_404(Board, id=board_id)
+            
+            # Check if user has access to this board
+            if not BoardAccessService.can_access(request.user, board):
+                return JsonResponse({'error': "You don't have access to this board."}, status=403)
+            
+            columns = Column.objects.in_bulk([item['columnId'] for item in moves])
+            tasks = Task.objects.select_related('column').filter(column__board=board).in_bulk(
+                [item['taskId'] for item in moves]
+            )
+            
+            # Validate every move before writing anything
+            for item in moves:
+                column = columns.get(int(item['columnId']))
+                if int(item['taskId']) not in tasks or column is None or column.board_id != board.id:
+                    return JsonResponse({'error': 'Task or column not found on this board'}, status=400)
+            
+            activities = []
+            results = []
+            events = []
+            with transaction.atomic():
+                # Moves are applied in the order sent, so later indexes see earlier moves
+                for item in moves:
+                    task = tasks[int(item['taskId'])]
+                    column = columns[int(item['columnId'])]
+                    old_column = task.column
+                    changed_fields = []
+                    if column.is_terminal and task.progress != 100:
+                        task.progress = 100
+                        changed_fields.append('progress')
+                    
+                    position = TaskPositionService(column).move(task, item.get('position', 0), update_fields=changed_fields)
+                    results.append({'taskId': task.id, 'columnId': column.id, 'position': position})
+                    events.append(('task_moved', task_payload(task, 'position', 'progress', 'is_done')))
+                    
+                    if old_column.id != column.id:
+                        activities.append(TaskActivity(
+                            task=task,
+                            user=request.user,
+                            activity_type='moved',
+                            description=f"Moved task '{task.title}' from '{old_column.name}' to '{column.name}'",
+                            from_column=old_column,
+                            to_column=column
+                        ))
+                
+                TaskActivity.objects.bulk_create(activities)
+                CycleTimeService.update_tasks({activity.task_id for activity in activities})
+                # One frame for the whole batch, sent after commit
+                broadcast_board_events(board.id, events, user=request.user)
+            
+            return JsonResponse({
+                'success': True,
+                'tasks': results
+            })
+            
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        except Exception as e:
+            return JsonResponse({'error': str(e)}, status=500)
+    
+    return JsonResponse({'error': 'Invalid request'}, status=400)
+
 @login_required
 def delete_column(request, column_id):
     """Delete a column and all of its tasks"""
@@ -1090,7 +1022,7 @@ def delete_column(request, column_id):
     board = column.board
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
     # Prevent deletion of "To Do" column as it's required for task creation
@@ -1133,7 +1065,7 @@ def update_task_progress(request, task_id):
             board = task.column.board
             
             # Check if user has access to this board
-            if not (board.created_by == request.user or request.user in board.members.all()):
+            if not BoardAccessService.can_access(request.user, board):
                 return JsonResponse({'error': "You don't have access to this task."}, status=403)
             
             data = json.loads(request.body)
@@ -1151,6 +1083,7 @@ def update_task_progress(request, task_id):
             
             # Save the updated task
             task.save()
+            broadcast_board_event(board.id, 'task_progress', task_payload(task, 'progress'), user=request.user)
             
             # Record activity
             TaskActivity.objects.create(
@@ -1185,98 +1118,28 @@ def get_progress_color_class(progress):
 
 @login_required
 def export_board(request, board_id):
-    """Export a board's data to JSON or CSV format"""
+    """Export a board's data to JSON, CSV or NDJSON format"""
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
     export_format = request.GET.get('format', 'json')
     
-    # Get all columns for this board
-    columns = Column.objects.filter(board=board).order_by('position')
-    
-    # Build the board data structure
-    board_data = {
-        'board': {
-            'name': board.name,
-            'description': board.description,
-            'created_at': board.created_at.isoformat(),
-        },
-        'columns': []
-    }
-    
-    # Add columns and tasks
-    for column in columns:
-        column_data = {
-            'name': column.name,
-            'position': column.position,
-            'tasks': []
-        }
-        
-        tasks = Task.objects.filter(column=column).order_by('position')
-        
-        for task in tasks:
-            # Get task labels
-            labels = list(task.labels.values_list('name', flat=True))
-            
-            task_data = {
-                'title': task.title,
-                'description': task.description,
-                'position': task.position,
-                'created_at': task.created_at.isoformat(),
-                'updated_at': task.updated_at.isoformat(),
-                'due_date': task.due_date.isoformat() if task.due_date else None,
-                'assigned_to': task.assigned_to.username if task.assigned_to else None,
-                'created_by': task.created_by.username,
-                'labels': labels,
-                'priority': task.priority,
-                'progress': task.progress,
-            }
-            column_data['tasks'].append(task_data)
-        
-        board_data['columns'].append(column_data)
-    
-    if export_format == 'json':
-        response = HttpResponse(json.dumps(board_data, indent=2), content_type='application/json')
-        response['Content-Disposition'] = f'attachment; filename="{board.name}_export.json"'
-        return response
-    elif export_format == 'csv':
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{board.name}_export.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow(['Column', 'Task Title', 'Description', 'Position', 'Created At', 'Updated At', 
-                         'Due Date', 'Assigned To', 'Created By', 'Labels', 'Priority', 'Progress'])
-        
-        for column in columns:
-            tasks = Task.objects.filter(column=column).order_by('position')
-            for task in tasks:
-                labels = ", ".join(list(task.labels.values_list('name', flat=True)))
-                writer.writerow([
-                    column.name,
-                    task.title,
-                    task.description,
-                    task.position,
-                    task.created_at,
-                    task.updated_at,
-                    task.due_date if task.due_date else '',
-                    task.assigned_to.username if task.assigned_to else '',
-                    task.created_by.username,
-                    labels,
-                    task.priority,
-                    task.progress
-                ])
-        
-        return response
-    else:
+    if export_format not in BoardExportService.FORMATS:
         messages.error(request, "Unsupported export format specified")
         return redirect('board_detail', board_id=board.id)
+    
+    # Stream the document so large boards are never held in memory
+    content_type, extension = BoardExportService.FORMATS[export_format]
+    response = StreamingHttpResponse(BoardExportService(board).stream(export_format), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{board.name}_export.{extension}"'
+    return response
 
 @login_required
 def import_board(request):
-    """Import a board from a JSON file"""
+    """Import a board from a JSON or NDJSON export"""
     if request.method != 'POST':
         return redirect('board_list')
     
@@ -1295,81 +1158,24 @@ def import_board(request):
         
     import_file = request.FILES['import_file']
     
-    # Check file extension
-    if not import_file.name.endswith('.json'):
-        messages.error(request, "Only JSON files are supported for import")
-        return redirect('board_list')
+    # Clients pass an id to poll import_progress_api while a large file is processed
+    import_id = request.POST.get('import_id', '')
+    progress = None
+    if re.fullmatch(r'[-\w]{1,64}', import_id) and BoardImportService.progress_available():
+        progress = BoardImportService.cache_progress(request.user.id, import_id)
     
-    # Try to parse the JSON file
+    # Everything is created in one transaction, so a failed import leaves nothing behind
     try:
-        imported_data = json.load(import_file)
-        
-        # Basic validation of imported data structure
-        if 'board' not in imported_data or 'columns' not in imported_data:
-            messages.error(request, "Invalid board data format")
-            return redirect('board_list')
-            
-        # Create the new board
-        board_data = imported_data['board']
-        new_board = Board.objects.create(
-            name=board_data.get('name', 'Imported Board'),
-            description=board_data.get('description', ''),
-            organization=organization,
-            created_by=request.user
-        )
-        new_board.members.add(request.user)
-        
-        # Create columns
-        for col_index, column_data in enumerate(imported_data['columns']):
-            column = Column.objects.create(
-                name=column_data.get('name', f'Column {col_index+1}'),
-                board=new_board,
-                position=column_data.get('position', col_index)
-            )
-            
-            # Create tasks for this column
-            for task_index, task_data in enumerate(column_data.get('tasks', [])):
-                # Create the task
-                new_task = Task.objects.create(
-                    title=task_data.get('title', f'Task {task_index+1}'),
-                    description=task_data.get('description', ''),
-                    column=column,
-                    position=task_data.get('position', task_index),
-                    created_by=request.user,
-                    priority=task_data.get('priority', 'medium'),
-                    progress=task_data.get('progress', 0)
-                )
-                
-                # Handle assigned_to if provided
-                assigned_username = task_data.get('assigned_to')
-                if assigned_username:
-                    try:
-                        assigned_user = User.objects.get(username=assigned_username)
-                        # Only set if user is in the same organization
-                        if hasattr(assigned_user, 'profile') and assigned_user.profile.organization == organization:
-                            new_task.assigned_to = assigned_user
-                            new_task.save()
-                    except User.DoesNotExist:
-                        pass  # Skip if user doesn't exist
-                
-                # Handle labels if provided
-                label_names = task_data.get('labels', [])
-                for label_name in label_names:
-                    # Try to find an existing label with this name, or create a new one
-                    label, created = TaskLabel.objects.get_or_create(
-                        name=label_name,
-                        board=new_board,
-                        defaults={'color': '#FF5733'}  # Default color for new labels
-                    )
-                    new_task.labels.add(label)
+        new_board = BoardImportService(request.user, organization, progress=progress).import_file(import_file)
         
         messages.success(request, f"Board '{new_board.name}' imported successfully!")
         return redirect('board_detail', board_id=new_board.id)
         
-    except json.JSONDecodeError:
-        messages.error(request, "Invalid JSON file")
+    except BoardImportError as e:
+        messages.error(request, str(e))
         return redirect('board_list')
     except Exception as e:
+        logger.error(f"Error importing board: {str(e)}")
         messages.error(request, f"Error importing board: {str(e)}")
         return redirect('board_list')
 
@@ -1378,7 +1184,7 @@ def add_lean_labels(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user has access to this board
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have access to this board.")
     
     if request.method == 'POST':
@@ -1413,7 +1219,7 @@ def test_ai_features(request):
 def edit_board(request, board_id):
     board = get_object_or_404(Board, id=board_id)
       # Check if user is the board creator or a member
-    if not (board.created_by == request.user or request.user in board.members.all()):
+    if not BoardAccessService.can_access(request.user, board):
         return HttpResponseForbidden("You don't have permission to edit this board.")
     
     if request.method == 'POST':
@@ -1438,7 +1244,7 @@ def meeting_transcript_extraction(request, board_id):
     try:
         # Verify board access
         board = get_object_or_404(Board, id=board_id)
-        if not (board.created_by == request.user or request.user in board.members.all()):
+        if not BoardAccessService.can_access(request.user, board):
             return HttpResponseForbidden("You don't have access to this board.")
         
         # Get previous meeting transcripts for this board (if model exists)
@@ -1604,7 +1410,7 @@ def wizard_create_task(request):
             
             # Get the board and verify access
             board = get_object_or_404(Board, id=board_id)
-            if not (board.created_by == request.user or request.user in board.members.all()):
+            if not BoardAccessService.can_access(request.user, board):
                 return JsonResponse({'error': 'Access denied'}, status=403)
             
             # Get the first column (To Do column)
@@ -1687,7 +1493,7 @@ def view_dependency_tree(request, task_id):
         task = get_object_or_404(Task, id=task_id)
         
         # Check access permission
-        if request.user not in task.column.board.members.all() and task.column.board.created_by != request.user:
+        if not BoardAccessService.can_access(request.user, task.column.board):
             return HttpResponseForbidden("You don't have access to this board")
         
         # Get all relationships
@@ -1721,7 +1527,7 @@ def board_dependency_graph(request, board_id):
         board = get_object_or_404(Board, id=board_id)
         
         # Check access permission
-        if request.user not in board.members.all() and board.created_by != request.user:
+        if not BoardAccessService.can_access(request.user, board):
             return HttpResponseForbidden("You don't have access to this board")
         
         # Get all tasks with dependencies
@@ -1760,7 +1566,7 @@ def upload_task_file(request, task_id):
     board = task.column.board
     
     # Check if user is board member
-    if request.user not in board.members.all() and board.created_by != request.user:
+    if not BoardAccessService.can_access(request.user, board):
         messages.error(request, 'You do not have access to this task.')
         return redirect('board_list')
     
@@ -1805,7 +1611,7 @@ def download_task_file(request, file_id):
     board = file_obj.task.column.board
     
     # Check if user is board member
-    if request.user not in board.members.all() and board.created_by != request.user:
+    if not BoardAccessService.can_access(request.user, board):
         messages.error(request, 'You do not have access to this file.')
         return redirect('board_list')
     
@@ -1852,7 +1658,7 @@ def list_task_files(request, task_id):
     board = task.column.board
     
     # Check if user is board member
-    if request.user not in board.members.all() and board.created_by != request.user:
+    if not BoardAccessService.can_access(request.user, board):
         return JsonResponse({'error': 'Access denied'}, status=403)
     
     # Get non-deleted files
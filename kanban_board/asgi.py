@@ -18,12 +18,13 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'kanban_board.settings')
 django.setup()
 
 from messaging.routing import websocket_urlpatterns
+from kanban.routing import websocket_urlpatterns as kanban_websocket_urlpatterns
 
 application = ProtocolTypeRouter({
     "http": get_asgi_application(),
     "websocket": AuthMiddlewareStack(
         URLRouter(
-            websocket_urlpatterns
+            websocket_urlpatterns + kanban_websocket_urlpatterns
         )
     ),
 })
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 from dotenv import load_dotenv
+from celery.schedules import crontab
 
 # Load environment variables from .env file
 load_dotenv()
@@ -273,6 +274,8 @@ AI_ASSISTANT_CONFIG = {
     'DEFAULT_MODEL': 'gemini',  # 'gemini' or 'openai'
     'MAX_HISTORY_LENGTH': 50,
     'RESPONSE_TIMEOUT': 30,  # seconds
+    'MAX_CONCURRENT_REQUESTS': 8,  # in-flight Gemini calls per event loop, and per process for sync calls
+    'MAX_RETRIES': 2,  # retries for rate-limited or timed-out calls
     'ENABLE_WEB_SEARCH': ENABLE_WEB_SEARCH,
     'KB_REFRESH_INTERVAL': 3600,  # 1 hour
     'CACHE_TTL': 3600,  # 1 hour
@@ -335,6 +338,22 @@ CACHES = {
         'OPTIONS': {
             'MAX_ENTRIES': 1000
         }
+    },
+    # Per-user unread counters pushed to the navbar badges. Set COUNTER_CACHE_URL
+    # (e.g. redis://127.0.0.1:6379/1, the channel layer's Redis) so the ASGI and
+    # HTTP processes share one count. Without it each process keeps its own
+    # counts, so they expire after a minute and are recounted from the database.
+    'counters': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('COUNTER_CACHE_URL'),
+        'TIMEOUT': 60 * 60 * 24,
+    } if os.getenv('COUNTER_CACHE_URL') else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'unread-counters',
+        'TIMEOUT': 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 50000
+        }
     }
 }
 
@@ -352,4 +371,13 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60  # 30 minutes
+# Run tasks in-process without a broker (tests, local development without Redis)
+CELERY_TASK_ALWAYS_EAGER = os.getenv('CELERY_TASK_ALWAYS_EAGER', 'False').lower() == 'true'
+# Periodic jobs (run with `celery -A kanban_board beat`)
+CELERY_BEAT_SCHEDULE = {
+    'record-flow-metrics': {
+        'task': 'kanban.tasks.record_flow_metrics',
+        'schedule': crontab(hour=23, minute=50),
+    },
+}
 
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class MessagingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'messaging'
+    
+    def ready(self):
+        """Perform app initialization"""
+        import messaging.signals  # noqa
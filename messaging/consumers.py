@@ -2,9 +2,10 @@ import json
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth.models import User
-from .models import ChatMessage, ChatRoom, TaskThreadComment, UserTypingStatus, Notification
+from .models import ChatMessage, ChatRoom, TaskThreadComment, UserTypingStatus, Notification, RoomReadState
 from kanban.models import Task
-from datetime import datetime
+from .utils.read_receipts import read_event
+from .utils.unread_counters import UnreadCounterStore, notification_group_name
 
 
 class ChatRoomConsumer(AsyncWebsocketConsumer):
@@ -156,23 +157,12 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
         if not message_id:
             return
         
-        # Mark message as read in database
-        result = await self.mark_message_as_read(message_id)
-        
-        if result:
-            # Broadcast read status to all members
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'message_marked_read',
-                    'message_id': message_id,
-                    'username': self.user.username,
-                    'user_id': self.user.id,
-                    'read_count': result['read_count'],
-                    'total_members': result['total_members'],
-                    'all_read': result['all_read']
-                }
-            )
+        # Mark message (and everything before it) as read in database
+        event = await self.mark_message_as_read(message_id)
+        
+        if event:
+            # One event covers every message the read watermark passed
+            await self.channel_layer.group_send(self.room_group_name, event)
     
     # Message handlers for group_send
     async def chat_message_send(self, event):
@@ -234,11 +224,12 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
         await self.send(text_data=json.dumps({
             'type': 'message_marked_read',
             'message_id': event['message_id'],
+            'previous_read_id': event['previous_read_id'],
+            'last_read_id': event['last_read_id'],
+            'all_read_ids': event['all_read_ids'],
             'username': event['username'],
             'user_id': event['user_id'],
-            'read_count': event['read_count'],
-            'total_members': event['total_members'],
-            'all_read': event['all_read']
+            'total_members': event['total_members']
         }))
     
     async def notify_mentioned_users_async(self, message_obj):
@@ -284,8 +275,8 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
                 content=message_text
             )
             
-            # Auto-mark sender's message as read for themselves
-            message.read_by.add(self.user)
+            # Posting means the sender has read the room up to their own message
+            RoomReadState.advance(self.user, chat_room.id, message.id)
             
             # Extract and add mentioned users
             # This is OPTIONAL - messages don't need mentions to be sent
@@ -347,27 +338,16 @@ class ChatRoomConsumer(AsyncWebsocketConsumer):
     
     @database_sync_to_async
     def mark_message_as_read(self, message_id):
-        """Mark a message as read by the current user"""
+        """Mark a message as read by the current user, returning the read event to broadcast"""
         try:
-            message = ChatMessage.objects.get(id=message_id)
-            message.read_by.add(self.user)
-            
-            total_members = message.chat_room.members.count()
-            read_count = message.read_by.count()
-            all_read = read_count >= total_members
-            
-            if all_read:
-                message.is_read = True
-                message.read_at = datetime.now()
-                message.save()
-            
-            return {
-                'read_count': read_count,
-                'total_members': total_members,
-                'all_read': all_read
-            }
+            message = ChatMessage.objects.select_related('chat_room').get(id=message_id, chat_room_id=self.room_id)
         except ChatMessage.DoesNotExist:
             return None
+        
+        result = message.chat_room.mark_read(self.user, message.id)
+        if not result:
+            return None
+        return read_event(message.chat_room, self.user, result)
 
 
 class TaskCommentConsumer(AsyncWebsocketConsumer):
@@ -507,3 +487,55 @@ class TaskCommentConsumer(AsyncWebsocketConsumer):
             }
         except Task.DoesNotExist:
             return {'id': None, 'timestamp': None, 'mentioned_users': []}
+
+
+class NotificationConsumer(AsyncWebsocketConsumer):
+    """WebSocket consumer that pushes unread counts and AI job completions to a user's tabs"""
+    
+    async def connect(self):
+        """Handle WebSocket connection"""
+        self.user = self.scope['user']
+        
+        if not self.user.is_authenticated:
+            await self.close()
+            return
+        
+        self.group_name = notification_group_name(self.user.id)
+        
+        # Join the user's personal group
+        await self.channel_layer.group_add(
+            self.group_name,
+            self.channel_name
+        )
+        
+        await self.accept()
+        
+        # Send the current counts so the badges are right without an HTTP request
+        await self.unread_counts({'counts': await self.get_counts()})
+    
+    async def disconnect(self, close_code):
+        """Handle WebSocket disconnection"""
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(
+                self.group_name,
+                self.channel_name
+            )
+    
+    async def unread_counts(self, event):
+        """Send updated counts to WebSocket"""
+        await self.send(text_data=json.dumps({
+            'type': 'unread_counts',
+            'counts': event['counts']
+        }))
+    
+    async def ai_job_update(self, event):
+        """Tell the user's tabs that one of their AI jobs finished"""
+        await self.send(text_data=json.dumps({
+            'type': 'ai_job',
+            'job': event['job']
+        }))
+    
+    @database_sync_to_async
+    def get_counts(self):
+        """Read the user's counts from the counter cache"""
+        return UnreadCounterStore(self.user.id).get_counts()
@@ -0,0 +1,71 @@
+# Generated by Django 5.2.3 on 2026-10-18 04:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def backfill_read_states(apps, schema_editor):
+    """Turn per-message read_by rows into one watermark per user per room"""
+    ChatMessage = apps.get_model('messaging', 'ChatMessage')
+    RoomReadState = apps.get_model('messaging', 'RoomReadState')
+    ReadBy = ChatMessage.read_by.through
+    
+    rows = ReadBy.objects.values('user_id', 'chatmessage__chat_room_id').annotate(
+        last_read=Max('chatmessage_id')
+    )
+    RoomReadState.objects.bulk_create([
+        RoomReadState(
+            user_id=row['user_id'],
+            chat_room_id=row['chatmessage__chat_room_id'],
+            last_read_message_id=row['last_read']
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+def restore_read_by(apps, schema_editor):
+    """Re-expand watermarks into read_by rows for every message up to the watermark"""
+    ChatMessage = apps.get_model('messaging', 'ChatMessage')
+    RoomReadState = apps.get_model('messaging', 'RoomReadState')
+    ReadBy = ChatMessage.read_by.through
+    
+    for state in RoomReadState.objects.all():
+        message_ids = ChatMessage.objects.filter(
+            chat_room_id=state.chat_room_id,
+            id__lte=state.last_read_message_id
+        ).values_list('id', flat=True)
+        ReadBy.objects.bulk_create([
+            ReadBy(chatmessage_id=message_id, user_id=state.user_id) for message_id in message_ids
+        ], batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('messaging', '0003_chatmessage_is_read_chatmessage_read_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomReadState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_read_message_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('chat_room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_states', to='messaging.chatroom')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='room_read_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['chat_room', 'last_read_message_id'], name='messaging_r_chat_ro_fda31f_idx')],
+                'unique_together': {('user', 'chat_room')},
+            },
+        ),
+        migrations.RunPython(backfill_read_states, restore_read_by),
+        migrations.RemoveField(
+            model_name='chatmessage',
+            name='read_by',
+        ),
+    ]
@@ -1,7 +1,7 @@
 from django.db import models
 from django.contrib.auth.models import User
 from kanban.models import Task, Board
-from django.db.models import Q
+from django.db.models import Count, OuterRef, Q, Subquery
 from django.utils import timezone
 
 
@@ -70,6 +70,45 @@ class ChatRoom(models.Model):
     def get_room_group_name(self):
         """Get the channel group name for WebSocket"""
         return f'chat_room_{self.id}'
+    
+    def mark_read(self, user, message_id):
+        """Mark every message up to message_id as read by a user
+        
+        Advances the user's read watermark and flags messages that are now
+        read by every member. Returns None if the watermark did not move,
+        otherwise a dict with the previous and new watermark and the ids of
+        the messages that became fully read.
+        """
+        previous_read_id = RoomReadState.last_read_id(user, self.id)
+        if not RoomReadState.advance(user, self.id, message_id):
+            return None
+        
+        return {
+            'previous_read_id': previous_read_id,
+            'last_read_id': message_id,
+            'all_read_ids': self.sync_read_flags(previous_read_id, message_id),
+        }
+    
+    def sync_read_flags(self, after_id, up_to_id):
+        """Set is_read/read_at on messages in (after_id, up_to_id] read by all members
+        
+        Only messages in the range a watermark just passed can change state,
+        so the check is one query and the flags are set with one UPDATE.
+        """
+        readers = RoomReadState.objects.filter(chat_room_id=self.id).filter(
+            Q(last_read_message_id__gte=OuterRef('id')) | Q(user_id=OuterRef('author_id'))
+        ).order_by().values('chat_room_id').annotate(count=Count('id')).values('count')
+        
+        all_read_ids = list(
+            self.messages.filter(id__gt=after_id, id__lte=up_to_id, is_read=False)
+            .annotate(read_count=Subquery(readers, output_field=models.IntegerField()))
+            .filter(read_count__gte=self.members.count())
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        if all_read_ids:
+            ChatMessage.objects.filter(id__in=all_read_ids).update(is_read=True, read_at=timezone.now())
+        return all_read_ids
 
 
 class ChatMessage(models.Model):
@@ -79,9 +118,8 @@ class ChatMessage(models.Model):
     content = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
     
-    # Message read status tracking
+    # Message read status tracking (per-user progress lives in RoomReadState)
     is_read = models.BooleanField(default=False)
-    read_by = models.ManyToManyField(User, related_name='read_messages', blank=True)
     read_at = models.DateTimeField(null=True, blank=True)
     
     # @mention support
@@ -103,16 +141,20 @@ class ChatMessage(models.Model):
         return list(set(mentions))  # Remove duplicates
     
     def mark_as_read(self, user):
-        """Mark message as read by a specific user"""
-        self.read_by.add(user)
-        if self.read_by.count() == self.chat_room.members.count():
-            self.is_read = True
-            self.read_at = timezone.now()
-            self.save()
+        """Mark message (and everything before it in the room) as read by a specific user"""
+        result = self.chat_room.mark_read(user, self.id)
+        if result and self.id in result['all_read_ids']:
+            self.refresh_from_db(fields=['is_read', 'read_at'])
+    
+    def get_read_count(self):
+        """Get number of users who have read this message (the author always has)"""
+        return RoomReadState.objects.filter(chat_room_id=self.chat_room_id).filter(
+            Q(last_read_message_id__gte=self.id) | Q(user_id=self.author_id)
+        ).count()
     
     def get_unread_count(self):
         """Get number of users who haven't read this message"""
-        return self.chat_room.members.count() - self.read_by.count()
+        return self.chat_room.members.count() - self.get_read_count()
     
     def notify_mentioned_users(self):
         """Create notifications for mentioned users"""
@@ -131,6 +173,62 @@ class ChatMessage(models.Model):
                 pass
 
 
+class RoomReadState(models.Model):
+    """How far each user has read in a chat room (a read watermark)
+    
+    Every message with an id up to last_read_message_id counts as read by the
+    user, so unread counts and read receipts come from one row per user per
+    room instead of one row per user per message.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='room_read_states')
+    chat_room = models.ForeignKey(ChatRoom, on_delete=models.CASCADE, related_name='read_states')
+    last_read_message_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        unique_together = ['user', 'chat_room']
+        indexes = [
+            models.Index(fields=['chat_room', 'last_read_message_id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user.username} read {self.chat_room.name} up to {self.last_read_message_id}"
+    
+    @classmethod
+    def advance(cls, user, chat_room_id, message_id):
+        """Move a user's watermark forward to message_id (never backwards)
+        
+        Returns True if the watermark moved, in which case the user's cached
+        unread count for the room is refreshed.
+        """
+        from .utils.unread_counters import room_read
+        
+        user_id = getattr(user, 'id', user)
+        moved = cls.objects.filter(
+            user_id=user_id,
+            chat_room_id=chat_room_id,
+            last_read_message_id__lt=message_id
+        ).update(last_read_message_id=message_id, updated_at=timezone.now())
+        if not moved:
+            _, moved = cls.objects.get_or_create(
+                user_id=user_id,
+                chat_room_id=chat_room_id,
+                defaults={'last_read_message_id': message_id}
+            )
+        
+        if moved:
+            room_read(user_id, chat_room_id)
+        return bool(moved)
+    
+    @classmethod
+    def last_read_id(cls, user, chat_room_id):
+        """Get a user's watermark in a room (0 if they never read it)"""
+        user_id = getattr(user, 'id', user)
+        return cls.objects.filter(user_id=user_id, chat_room_id=chat_room_id).values_list(
+            'last_read_message_id', flat=True
+        ).first() or 0
+
+
 class Notification(models.Model):
     """Notifications for mentions and activity"""
     NOTIFICATION_TYPES = [
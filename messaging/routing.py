@@ -4,4 +4,5 @@ from messaging import consumers
 websocket_urlpatterns = [
     path('ws/chat-room/<int:room_id>/', consumers.ChatRoomConsumer.as_asgi()),
     path('ws/task-comments/<int:task_id>/', consumers.TaskCommentConsumer.as_asgi()),
+    path('ws/notifications/', consumers.NotificationConsumer.as_asgi()),
 ]
@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, m2m_changed
+from django.dispatch import receiver
+from .models import ChatMessage, ChatRoom, Notification
+from .utils.unread_counters import UnreadCounterStore, message_created, refresh_message_counts
+
+
+@receiver(post_save, sender=ChatMessage)
+def count_new_chat_message(sender, instance, created, **kwargs):
+    """Bump unread counters of the room members when a message is posted"""
+    if created:
+        message_created(instance)
+
+
+@receiver(m2m_changed, sender=ChatRoom.members.through)
+def recount_room_members(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recount unread messages for users joining or leaving rooms"""
+    if action in ('post_add', 'post_remove'):
+        refresh_message_counts([instance.id] if reverse else pk_set)
+    elif action == 'pre_clear' and not reverse:
+        refresh_message_counts(list(instance.members.values_list('id', flat=True)))
+    elif action == 'post_clear' and reverse:
+        refresh_message_counts([instance.id])
+
+
+@receiver(post_save, sender=Notification)
+def count_notification(sender, instance, created, **kwargs):
+    """Keep the recipient's unread notification counter current"""
+    store = UnreadCounterStore(instance.recipient_id)
+    if created:
+        if not instance.is_read:
+            store.adjust_notifications(1)
+    else:
+        store.invalidate_notifications()
+    store.push()
@@ -1,3 +1,147 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import Organization
+from kanban.models import Board
+from .models import ChatRoom, ChatMessage, Notification, RoomReadState
+from .utils.unread_counters import UnreadCounterStore
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class UnreadCounterTestCase(TestCase):
+    """Test the cache-backed unread message and notification counters"""
+
+    def setUp(self):
+        caches['counters'].clear()
+
+        self.alice = User.objects.create_user(username='alice', password='pass123')
+        self.bob = User.objects.create_user(username='bob', password='pass123')
+        organization = Organization.objects.create(name='Chat Org', domain='chat.com', created_by=self.alice)
+        self.board = Board.objects.create(name='Chat Board', organization=organization, created_by=self.alice)
+        self.other_board = Board.objects.create(name='Other Board', organization=organization, created_by=self.alice)
+
+        self.room = ChatRoom.objects.create(board=self.board, name='General', created_by=self.alice)
+        self.room.members.add(self.alice, self.bob)
+        self.other_room = ChatRoom.objects.create(board=self.other_board, name='Random', created_by=self.alice)
+        self.other_room.members.add(self.alice, self.bob)
+
+        ChatMessage.objects.create(chat_room=self.room, author=self.alice, content='Hello')
+        ChatMessage.objects.create(chat_room=self.other_room, author=self.alice, content='Hi')
+
+    def test_counts_loaded_in_one_query(self):
+        """Test a cold load counts every room at once and later reads hit the cache"""
+        store = UnreadCounterStore(self.bob.id)
+        with self.assertNumQueries(2):
+            counts = store.get_counts()
+
+        self.assertEqual(counts['unread_messages'], 2)
+        self.assertEqual(counts['unread_messages_by_board'], {self.board.id: 1, self.other_board.id: 1})
+        self.assertEqual(counts['unread_notifications'], 0)
+        self.assertEqual(UnreadCounterStore(self.alice.id).get_counts()['unread_messages'], 0)
+
+        with self.assertNumQueries(0):
+            store.get_counts()
+
+    def test_counters_follow_new_and_read_messages(self):
+        """Test new messages and reads adjust the cached counts"""
+        store = UnreadCounterStore(self.bob.id)
+        store.get_counts()
+
+        message = ChatMessage.objects.create(chat_room=self.room, author=self.alice, content='Are you there?')
+        self.assertEqual(store.get_counts()['unread_messages'], 3)
+
+        message.mark_as_read(self.bob)
+        message.mark_as_read(self.bob)  # Reading twice only counts once
+        # The watermark covers the earlier message in the room too
+        self.assertEqual(store.get_counts()['unread_messages'], 1)
+        self.assertEqual(store.get_counts()['unread_messages_by_board'], {self.board.id: 0, self.other_board.id: 1})
+
+    def test_notification_counter(self):
+        """Test notifications are counted on create and recounted when read"""
+        store = UnreadCounterStore(self.bob.id)
+        self.assertEqual(store.get_notification_count(), 0)
+
+        notification = Notification.objects.create(
+            recipient=self.bob, sender=self.alice, notification_type='MENTION', text='@bob'
+        )
+        self.assertEqual(store.get_notification_count(), 1)
+
+        notification.mark_as_read()
+        self.assertEqual(store.get_notification_count(), 0)
+
+    def test_unread_count_endpoint(self):
+        """Test the badge endpoint serves cached counts, optionally per board"""
+        self.client.force_login(self.bob)
+
+        response = self.client.get(reverse('messaging:get_unread_message_count'))
+        self.assertEqual(response.json()['unread_count'], 2)
+
+        response = self.client.get(reverse('messaging:get_unread_message_count'), {'board_id': self.board.id})
+        self.assertEqual(response.json()['unread_count'], 1)
+
+
+@override_settings(SECURE_SSL_REDIRECT=False)
+class RoomReadStateTestCase(TestCase):
+    """Test per-user read watermarks for chat rooms"""
+
+    def setUp(self):
+        caches['counters'].clear()
+
+        self.alice = User.objects.create_user(username='alice', password='pass123')
+        self.bob = User.objects.create_user(username='bob', password='pass123')
+        self.carol = User.objects.create_user(username='carol', password='pass123')
+        organization = Organization.objects.create(name='Read Org', domain='read.com', created_by=self.alice)
+        board = Board.objects.create(name='Read Board', organization=organization, created_by=self.alice)
+        self.room = ChatRoom.objects.create(board=board, name='General', created_by=self.alice)
+        self.room.members.add(self.alice, self.bob, self.carol)
+        self.messages = [
+            ChatMessage.objects.create(chat_room=self.room, author=self.alice, content=f'Message {i}')
+            for i in range(3)
+        ]
+
+    def test_watermark_only_moves_forward(self):
+        """Test advancing is idempotent and never moves the watermark back"""
+        self.assertTrue(RoomReadState.advance(self.bob, self.room.id, self.messages[2].id))
+        self.assertFalse(RoomReadState.advance(self.bob, self.room.id, self.messages[0].id))
+        self.assertEqual(RoomReadState.last_read_id(self.bob, self.room.id), self.messages[2].id)
+        self.assertEqual(RoomReadState.objects.filter(user=self.bob).count(), 1)
+
+    def test_read_receipts_from_watermarks(self):
+        """Test a message's read count includes its author and users past it"""
+        RoomReadState.advance(self.bob, self.room.id, self.messages[1].id)
+
+        self.assertEqual(self.messages[0].get_read_count(), 1)  # bob (alice never opened the room)
+        self.messages[0].mark_as_read(self.carol)
+        self.messages[0].refresh_from_db()
+        self.assertEqual(self.messages[0].get_read_count(), 2)
+        self.assertEqual(self.messages[2].get_unread_count(), 3)
+
+    def test_mark_room_messages_read(self):
+        """Test marking a room read writes a single watermark row"""
+        self.client.force_login(self.bob)
+
+        response = self.client.post(
+            reverse('messaging:mark_room_messages_read', args=[self.room.id]),
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertEqual(response.json()['messages_marked_read'], 3)
+        self.assertEqual(RoomReadState.last_read_id(self.bob, self.room.id), self.messages[2].id)
+        self.assertEqual(UnreadCounterStore(self.bob.id).get_counts()['unread_messages'], 0)
+
+    def test_bulk_read_flags_fully_read_messages(self):
+        """Test the last reader flags every fully read message in one pass"""
+        RoomReadState.advance(self.alice, self.room.id, self.messages[2].id)
+        self.room.mark_read(self.bob, self.messages[2].id)
+
+        result = self.room.mark_read(self.carol, self.messages[1].id)
+
+        self.assertEqual(result['previous_read_id'], 0)
+        self.assertEqual(result['all_read_ids'], [self.messages[0].id, self.messages[1].id])
+        self.assertEqual(
+            list(ChatMessage.objects.filter(is_read=True, read_at__isnull=False).order_by('id').values_list('id', flat=True)),
+            result['all_read_ids']
+        )
+        self.assertIsNone(self.room.mark_read(self.carol, self.messages[0].id))
@@ -0,0 +1,51 @@
+"""
+Read Receipt Broadcasting for TaskFlow messaging
+Turns one advance of a user's read watermark into a single aggregated
+message_marked_read event for the chat room, however many messages it covers
+"""
+
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def read_event(chat_room, user, result):
+    """
+    Build the message_marked_read group event for a ChatRoom.mark_read result
+
+    Clients bump the read count of every message in
+    (previous_read_id, last_read_id] not written by the reader, and show
+    "Read by all" for the ids in all_read_ids.
+    """
+    return {
+        'type': 'message_marked_read',
+        'message_id': result['last_read_id'],
+        'previous_read_id': result['previous_read_id'],
+        'last_read_id': result['last_read_id'],
+        'all_read_ids': result['all_read_ids'],
+        'username': user.username,
+        'user_id': user.id,
+        'total_members': chat_room.members.count(),
+    }
+
+
+def broadcast_read_event(chat_room, user, result):
+    """Send the aggregated read event to the room once the transaction commits"""
+    if not result:
+        return
+
+    event = read_event(chat_room, user, result)
+
+    def send():
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(chat_room.get_room_group_name(), event)
+        except Exception as e:
+            logger.warning(f"Could not broadcast read receipts for room {chat_room.id}: {e}")
+
+    transaction.on_commit(send)
@@ -0,0 +1,197 @@
+"""
+Unread Counter Store for TaskFlow messaging
+Keeps per-user unread chat message and notification counts in the 'counters'
+cache and pushes the new totals to the user's notification WebSocket group,
+so open tabs never have to poll for badge counts
+"""
+
+import logging
+from typing import Dict, Any
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+logger = logging.getLogger(__name__)
+
+
+def notification_group_name(user_id):
+    """Channel group shared by every open tab of a user"""
+    return f'user_notifications_{user_id}'
+
+
+class UnreadCounterStore:
+    """
+    Cache-backed unread counters for one user
+
+    Counts are loaded from the database once (a single query for all rooms)
+    and then kept current with atomic cache increments as messages and
+    notifications are created or read. A missing key simply triggers a reload.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.cache = caches['counters']
+
+    @property
+    def rooms_key(self):
+        return f'unread:{self.user_id}:rooms'
+
+    @property
+    def notifications_key(self):
+        return f'unread:{self.user_id}:notifications'
+
+    def room_key(self, room_id):
+        return f'unread:{self.user_id}:room:{room_id}'
+
+    def _load_rooms(self) -> Dict[int, Dict[str, int]]:
+        """Count unread messages for every room of the user in one query"""
+        from messaging.models import ChatRoom, RoomReadState
+
+        last_read = RoomReadState.objects.filter(
+            chat_room=OuterRef('pk'),
+            user_id=self.user_id
+        ).values('last_read_message_id')[:1]
+
+        # Messages past the user's read watermark that someone else wrote
+        rows = ChatRoom.objects.filter(members__id=self.user_id).annotate(
+            last_read=Coalesce(Subquery(last_read, output_field=IntegerField()), 0)
+        ).annotate(
+            unread=Count('messages', filter=Q(messages__id__gt=F('last_read')) & ~Q(messages__author_id=self.user_id))
+        ).values_list('id', 'board_id', 'unread')
+
+        rooms = {}
+        values = {}
+        for room_id, board_id, count in rows:
+            rooms[room_id] = board_id
+            values[self.room_key(room_id)] = count
+        values[self.rooms_key] = rooms
+        self.cache.set_many(values)
+        return {room_id: {'board_id': rooms[room_id], 'unread': values[self.room_key(room_id)]} for room_id in rooms}
+
+    def _load_notifications(self) -> int:
+        from messaging.models import Notification
+
+        count = Notification.objects.filter(recipient_id=self.user_id, is_read=False).count()
+        self.cache.set(self.notifications_key, count)
+        return count
+
+    def get_rooms(self) -> Dict[int, Dict[str, int]]:
+        """Unread message count and board for each of the user's rooms"""
+        rooms = self.cache.get(self.rooms_key)
+        if rooms is None:
+            return self._load_rooms()
+
+        counts = self.cache.get_many([self.room_key(room_id) for room_id in rooms])
+        if len(counts) != len(rooms):
+            return self._load_rooms()
+        return {
+            room_id: {'board_id': board_id, 'unread': max(counts[self.room_key(room_id)], 0)}
+            for room_id, board_id in rooms.items()
+        }
+
+    def get_notification_count(self) -> int:
+        count = self.cache.get(self.notifications_key)
+        if count is None:
+            return self._load_notifications()
+        return max(count, 0)
+
+    def get_counts(self) -> Dict[str, Any]:
+        """
+        Get the badge counts for the user
+
+        Returns:
+            Dict with total unread messages, unread messages per board and
+            unread notifications
+        """
+        by_board = {}
+        for room in self.get_rooms().values():
+            by_board[room['board_id']] = by_board.get(room['board_id'], 0) + room['unread']
+
+        return {
+            'unread_messages': sum(by_board.values()),
+            'unread_messages_by_board': by_board,
+            'unread_notifications': self.get_notification_count(),
+        }
+
+    def adjust_room(self, room_id, delta):
+        """Add delta to a room's unread count if it is loaded (otherwise it is counted on next read)"""
+        try:
+            self.cache.incr(self.room_key(room_id), delta)
+        except ValueError:
+            pass
+
+    def recount_room(self, room_id):
+        """Recount one room after the user's read watermark moved (single indexed query)"""
+        from messaging.models import ChatMessage, RoomReadState
+
+        if self.cache.get(self.rooms_key) is None:
+            return
+        count = ChatMessage.objects.filter(
+            chat_room_id=room_id,
+            id__gt=RoomReadState.last_read_id(self.user_id, room_id)
+        ).exclude(author_id=self.user_id).count()
+        self.cache.set(self.room_key(room_id), count)
+
+    def adjust_notifications(self, delta):
+        try:
+            self.cache.incr(self.notifications_key, delta)
+        except ValueError:
+            pass
+
+    def invalidate_rooms(self):
+        """Forget message counts so they are recounted (membership or bulk changes)"""
+        rooms = self.cache.get(self.rooms_key) or {}
+        self.cache.delete_many([self.rooms_key] + [self.room_key(room_id) for room_id in rooms])
+
+    def invalidate_notifications(self):
+        self.cache.delete(self.notifications_key)
+
+    def push(self):
+        """Send the current counts to the user's open tabs once the transaction commits"""
+        def send():
+            channel_layer = get_channel_layer()
+            if channel_layer is None:
+                return
+            try:
+                async_to_sync(channel_layer.group_send)(notification_group_name(self.user_id), {
+                    'type': 'unread_counts',
+                    'counts': self.get_counts(),
+                })
+            except Exception as e:
+                logger.warning(f"Could not push unread counts to user {self.user_id}: {e}")
+
+        transaction.on_commit(send)
+
+
+def message_created(message):
+    """Count a new chat message as unread for every room member except its author"""
+    member_ids = message.chat_room.members.exclude(id=message.author_id).values_list('id', flat=True)
+    for user_id in member_ids:
+        store = UnreadCounterStore(user_id)
+        store.adjust_room(message.chat_room_id, 1)
+        store.push()
+
+
+def room_read(user_id, room_id):
+    """Update a user's counts after their read watermark in a room moved"""
+    store = UnreadCounterStore(user_id)
+    store.recount_room(room_id)
+    store.push()
+
+
+def refresh_message_counts(user_ids):
+    """Recount unread messages for users after membership or bulk changes"""
+    for user_id in user_ids:
+        store = UnreadCounterStore(user_id)
+        store.invalidate_rooms()
+        store.push()
+
+
+def refresh_notification_count(user_id):
+    """Recount unread notifications for a user after a bulk update"""
+    store = UnreadCounterStore(user_id)
+    store.invalidate_notifications()
+    store.push()
@@ -10,8 +10,11 @@ from django.utils import timezone
 import os
 
 from kanban.models import Board, Task
-from .models import ChatRoom, ChatMessage, TaskThreadComment, Notification, FileAttachment
+from kanban.utils.board_access_service import BoardAccessService
+from .models import ChatRoom, ChatMessage, TaskThreadComment, Notification, FileAttachment, RoomReadState
 from .forms import ChatRoomForm, ChatMessageForm, TaskThreadCommentForm, MentionForm, ChatRoomFileForm
+from .utils.read_receipts import broadcast_read_event
+from .utils.unread_counters import UnreadCounterStore, refresh_message_counts, refresh_notification_count
 
 
 @login_required
@@ -36,7 +39,7 @@ def chat_room_list(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user is board member
-    if request.user not in board.members.all():
+    if not BoardAccessService.is_member(request.user, board):
         django_messages.error(request, 'You do not have access to this board.')
         return redirect('board_list')
     
@@ -59,23 +62,34 @@ def chat_room_detail(request, room_id):
         return redirect('board_list')
     
     # Mark all notifications related to this chat room as read
-    Notification.objects.filter(
+    if Notification.objects.filter(
         recipient=request.user,
         chat_message__chat_room=chat_room,
         is_read=False
-    ).update(is_read=True)
+    ).update(is_read=True):
+        refresh_notification_count(request.user.id)
     
     # Get recent messages (last 50)
-    chat_messages = chat_room.messages.all().order_by('-created_at')[:50]
-    chat_messages = reversed(list(chat_messages))
+    chat_messages = list(chat_room.messages.select_related('author').order_by('-created_at')[:50])
+    chat_messages.reverse()
     
     form = ChatMessageForm()
     
+    # Read receipts come from the members' read watermarks (one query for the whole page)
+    watermarks = dict(chat_room.read_states.values_list('user_id', 'last_read_message_id'))
+    for message in chat_messages:
+        message.read_count = sum(
+            1 for user_id, last_read in watermarks.items()
+            if last_read >= message.id or user_id == message.author_id
+        )
+    
     # Get list of message IDs that current user has read
     # Include messages from the current user (they don't need to be marked as read)
-    read_message_ids = set(chat_room.messages.filter(
-        Q(read_by=request.user) | Q(author=request.user)
-    ).values_list('id', flat=True))
+    last_read = watermarks.get(request.user.id, 0)
+    read_message_ids = {
+        message.id for message in chat_messages
+        if message.id <= last_read or message.author_id == request.user.id
+    }
     
     context = {
         'chat_room': chat_room,
@@ -93,7 +107,7 @@ def create_chat_room(request, board_id):
     board = get_object_or_404(Board, id=board_id)
     
     # Check if user is board admin/creator
-    if request.user != board.created_by and request.user not in board.members.all():
+    if not BoardAccessService.can_access(request.user, board):
         django_messages.error(request, 'You do not have permission to create rooms.')
         return redirect('chat_room_list', board_id=board_id)
     
@@ -138,6 +152,7 @@ def send_chat_message(request, room_id):
         message.chat_room = chat_room
         message.author = request.user
         message.save()
+        RoomReadState.advance(request.user, chat_room.id, message.id)
         
         # Process mentions
         message.notify_mentioned_users()
@@ -163,7 +178,7 @@ def task_thread_comments(request, task_id):
     
     # Check if user has access to this task
     board = task.column.board
-    if request.user not in board.members.all():
+    if not BoardAccessService.is_member(request.user, board):
         django_messages.error(request, 'You do not have access to this task.')
         return redirect('board_list')
     
@@ -192,11 +207,12 @@ def task_thread_comments(request, task_id):
         form = TaskThreadCommentForm()
     
     # Mark all notifications related to this task as read
-    Notification.objects.filter(
+    if Notification.objects.filter(
         recipient=request.user,
         task_thread_comment__task=task,
         is_read=False
-    ).update(is_read=True)
+    ).update(is_read=True):
+        refresh_notification_count(request.user.id)
     
     comments = task.thread_comments.all().order_by('-created_at')
     
@@ -242,6 +258,7 @@ def notifications(request):
     # Mark as read if requested
     if request.GET.get('mark_read'):
         user_notifications.update(is_read=True)
+        refresh_notification_count(request.user.id)
     
     context = {
         'notifications': user_notifications,
@@ -266,10 +283,7 @@ def mark_notification_read(request, notification_id):
 @require_http_methods(["GET"])
 def get_unread_notification_count(request):
     """API endpoint to get unread notification count"""
-    count = Notification.objects.filter(
-        recipient=request.user,
-        is_read=False
-    ).count()
+    count = UnreadCounterStore(request.user.id).get_notification_count()
     
     return JsonResponse({'count': count})
 
@@ -310,7 +324,7 @@ def task_comment_history(request, task_id):
     task = get_object_or_404(Task, id=task_id)
     board = task.column.board
     
-    if request.user not in board.members.all():
+    if not BoardAccessService.is_member(request.user, board):
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
     offset = int(request.GET.get('offset', 0))
@@ -333,6 +347,20 @@ def task_comment_history(request, task_id):
     return JsonResponse({'comments': comments_data})
 
 
+def _unread_message_count(request):
+    """Unread messages for the current user from the counter cache, optionally for one board"""
+    counts = UnreadCounterStore(request.user.id).get_counts()
+    
+    board_id = request.GET.get('board_id')
+    if board_id:
+        try:
+            return counts['unread_messages_by_board'].get(int(board_id), 0)
+        except (ValueError, TypeError):
+            pass  # Invalid board_id, ignore the filter
+    
+    return counts['unread_messages']
+
+
 @login_required
 @require_http_methods(["GET"])
 def get_unread_message_count(request):
@@ -342,28 +370,7 @@ def get_unread_message_count(request):
     Optional query parameter:
     - board_id: If provided, only count messages from chat rooms in this board
     """
-    board_id = request.GET.get('board_id')
-    
-    # Get all chat rooms the user is a member of
-    user_chat_rooms = ChatRoom.objects.filter(members=request.user)
-    
-    # If board_id is provided, filter to only that board
-    if board_id:
-        try:
-            board_id = int(board_id)
-            user_chat_rooms = user_chat_rooms.filter(board_id=board_id)
-        except (ValueError, TypeError):
-            pass  # Invalid board_id, ignore the filter
-    
-    # Count total unread messages
-    # Messages are unread if: the user hasn't marked them as read AND they're not from the user
-    unread_count = 0
-    for room in user_chat_rooms:
-        # Count messages from this room that the current user hasn't read
-        room_unread = room.messages.exclude(read_by=request.user).exclude(author=request.user).count()
-        unread_count += room_unread
-    
-    return JsonResponse({'unread_count': unread_count})
+    return JsonResponse({'unread_count': _unread_message_count(request)})
 
 
 @login_required
@@ -376,20 +383,14 @@ def mark_chat_message_read(request, message_id):
     if request.user not in message.chat_room.members.all():
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    # Mark message as read by this user
-    message.read_by.add(request.user)
-    
-    # Check if all members have read it
+    # Mark message (and everything before it) as read by this user
     chat_room = message.chat_room
-    total_members = chat_room.members.count()
-    read_count = message.read_by.count()
-    
-    all_read = read_count >= total_members
+    result = chat_room.mark_read(request.user, message.id)
+    broadcast_read_event(chat_room, request.user, result)
     
-    if all_read:
-        message.is_read = True
-        message.read_at = timezone.now()
-        message.save()
+    total_members = chat_room.members.count()
+    read_count = message.get_read_count()
+    all_read = message.is_read or bool(result and message.id in result['all_read_ids'])
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({
@@ -412,27 +413,7 @@ def get_unread_message_count_v2(request):
     Optional query parameter:
     - board_id: If provided, only count messages from chat rooms in this board
     """
-    board_id = request.GET.get('board_id')
-    
-    # Get all chat rooms the user is a member of
-    user_chat_rooms = ChatRoom.objects.filter(members=request.user)
-    
-    # If board_id is provided, filter to only that board
-    if board_id:
-        try:
-            board_id = int(board_id)
-            user_chat_rooms = user_chat_rooms.filter(board_id=board_id)
-        except (ValueError, TypeError):
-            pass
-    
-    # Count messages the user hasn't marked as read
-    unread_count = 0
-    for room in user_chat_rooms:
-        # Count messages that the current user hasn't read
-        unread_msgs = room.messages.exclude(read_by=request.user).exclude(author=request.user).count()
-        unread_count += unread_msgs
-    
-    return JsonResponse({'unread_count': unread_count})
+    return JsonResponse({'unread_count': _unread_message_count(request)})
 
 
 @login_required
@@ -444,13 +425,16 @@ def mark_room_messages_read(request, room_id):
     if request.user not in chat_room.members.all():
         return JsonResponse({'error': 'Unauthorized'}, status=403)
     
-    # Get all messages the user hasn't read
-    messages_to_mark = chat_room.messages.exclude(read_by=request.user)
+    # Advance the user's read watermark to the newest message
+    last_read = RoomReadState.last_read_id(request.user, chat_room.id)
+    messages_to_mark = chat_room.messages.filter(id__gt=last_read)
+    count = messages_to_mark.exclude(author=request.user).count()
     
-    count = 0
-    for message in messages_to_mark:
-        message.read_by.add(request.user)
-        count += 1
+    latest_id = messages_to_mark.order_by('-id').values_list('id', flat=True).first()
+    if latest_id:
+        # One watermark upsert and one flag UPDATE, broadcast as a single event
+        result = chat_room.mark_read(request.user, latest_id)
+        broadcast_read_event(chat_room, request.user, result)
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({
@@ -478,6 +462,7 @@ def delete_chat_message(request, message_id):
     
     message_id = message.id
     message.delete()
+    refresh_message_counts(chat_room.members.values_list('id', flat=True))
     
     return JsonResponse({
         'success': True,
@@ -501,6 +486,7 @@ def clear_chat_room_messages(request, room_id):
     
     # Delete all messages
     chat_room.messages.all().delete()
+    refresh_message_counts(chat_room.members.values_list('id', flat=True))
     
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({
@@ -516,9 +502,6 @@ def clear_chat_room_messages(request, room_id):
 @login_required
 def go_to_first_unread_room(request):
     """Redirect user to the first chat room with unread messages, or to messaging hub if none"""
-    from django.utils import timezone
-    from datetime import timedelta
-    
     # Get all chat rooms the user is a member of
     user_chat_rooms = ChatRoom.objects.filter(members=request.user).order_by('-created_at')
     
@@ -531,16 +514,14 @@ def go_to_first_unread_room(request):
         except (ValueError, TypeError):
             pass
     
-    # Find first room with unread messages
-    recent_cutoff = timezone.now() - timedelta(hours=24)
-    
-    for room in user_chat_rooms:
-        unread_count = room.messages.filter(
-            created_at__gte=recent_cutoff
-        ).exclude(author=request.user).count()
-        
-        if unread_count > 0:
-            return redirect('messaging:chat_room_detail', room_id=room.id)
+    # Find first room with unread messages (counts come from the counter cache)
+    unread_room_ids = [
+        room_id for room_id, room in UnreadCounterStore(request.user.id).get_rooms().items()
+        if room['unread'] > 0
+    ]
+    room = user_chat_rooms.filter(id__in=unread_room_ids).first()
+    if room:
+        return redirect('messaging:chat_room_detail', room_id=room.id)
     
     # No unread messages found, go to messaging hub
     return redirect('messaging:hub')
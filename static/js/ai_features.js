@@ -550,9 +550,12 @@ function analyzeWorkflowOptimization(boardId, callback) {
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
         }
-        return response.json();
+        return resolveAIJob(response);
     })
     .then(data => {
+        if (data.error) {
+            throw new Error(data.error);
+        }
         if (aiSpinner) aiSpinner.classList.add('d-none');
         if (analyzeButton) analyzeButton.disabled = false;
         
@@ -0,0 +1,67 @@
+// Background AI jobs: long analyses answer 202 with a job to wait for
+
+(function() {
+    const POLL_INTERVAL = 2000;
+    const MAX_WAIT = 10 * 60 * 1000;
+
+    function finished(job) {
+        return job.status === 'succeeded' || job.status === 'failed';
+    }
+
+    function jobBody(job) {
+        return job.status === 'succeeded' ? job.result : { error: job.error || 'AI job failed' };
+    }
+
+    /**
+     * Resolve an AI endpoint response to its final JSON body.
+     *
+     * Responses other than 202 are parsed as-is. For a queued job, resolves
+     * with the job result once it succeeds, or { error } if it fails. The
+     * notification WebSocket completion event ends the wait early; polling
+     * covers tabs without a socket.
+     */
+    window.resolveAIJob = function(response) {
+        if (response.status !== 202) {
+            return response.json();
+        }
+
+        return response.json().then(job => new Promise(resolve => {
+            const startedAt = Date.now();
+            let timer = null;
+
+            function done(update) {
+                clearTimeout(timer);
+                document.removeEventListener('aiJobUpdated', onPush);
+                resolve(jobBody(update));
+            }
+
+            function onPush(e) {
+                if (e.detail.job_id === job.job_id && finished(e.detail)) {
+                    done(e.detail);
+                }
+            }
+
+            function poll() {
+                if (Date.now() - startedAt > MAX_WAIT) {
+                    done({ status: 'failed', error: 'The AI analysis is taking too long. Please try again later.' });
+                    return;
+                }
+                fetch(job.status_url, { headers: { 'X-Requested-With': 'XMLHttpRequest' } })
+                    .then(r => r.json())
+                    .then(update => {
+                        if (finished(update)) {
+                            done(update);
+                        } else {
+                            timer = setTimeout(poll, POLL_INTERVAL);
+                        }
+                    })
+                    .catch(() => {
+                        timer = setTimeout(poll, POLL_INTERVAL);
+                    });
+            }
+
+            document.addEventListener('aiJobUpdated', onPush);
+            timer = setTimeout(poll, POLL_INTERVAL);
+        }));
+    };
+})();
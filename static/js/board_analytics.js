@@ -492,7 +492,7 @@ function analyzeWorkflow(boardId) {
             board_id: boardId
         })
     })
-    .then(response => response.json())
+    .then(resolveAIJob)
     .then(data => {
         if (data.error) {
             throw new Error(data.error);
@@ -0,0 +1,164 @@
+// Real-time board sync: applies task/column diffs pushed over ws/board/<id>/
+
+(function() {
+    const board = document.getElementById('kanban-board');
+    if (!board || !board.dataset.boardId || !('WebSocket' in window)) {
+        return;
+    }
+
+    const boardId = board.dataset.boardId;
+    const taskUrlTemplate = board.dataset.taskUrl;  // contains a 0 placeholder for the task id
+    const protocol = window.location.protocol === 'https:' ? 'wss://' : 'ws://';
+    let reconnectDelay = 1000;
+
+    function progressColorClass(progress) {
+        if (progress < 30) return 'bg-danger';
+        if (progress < 70) return 'bg-warning';
+        return 'bg-success';
+    }
+
+    function escapeHtml(value) {
+        const div = document.createElement('div');
+        div.textContent = value == null ? '' : value;
+        return div.innerHTML;
+    }
+
+    function formatShortDate(isoString) {
+        const date = new Date(isoString);
+        return date.toLocaleDateString('en-US', { month: 'short', day: '2-digit' });
+    }
+
+    function columnTasks(columnId) {
+        return board.querySelector(`.kanban-column-tasks[data-column-id="${columnId}"]`);
+    }
+
+    function placeTask(taskElement, columnId, position) {
+        const container = columnTasks(columnId);
+        if (!container) return;
+
+        taskElement.dataset.position = position;
+        const next = Array.from(container.querySelectorAll('.kanban-task'))
+            .find(el => el !== taskElement && Number(el.dataset.position) > position);
+        container.insertBefore(taskElement, next || null);
+    }
+
+    function setProgress(taskElement, progress) {
+        const bar = taskElement.querySelector('.progress-bar');
+        if (bar) {
+            bar.classList.remove('bg-danger', 'bg-warning', 'bg-success');
+            bar.classList.add(progressColorClass(progress));
+            bar.style.width = progress + '%';
+            bar.dataset.progress = progress;
+            bar.setAttribute('aria-valuenow', progress);
+        }
+        const label = taskElement.querySelector('.task-progress-container small');
+        if (label) {
+            label.textContent = progress + '% complete';
+        }
+    }
+
+    function setDueDate(taskElement, dueDate) {
+        const dueEl = taskElement.querySelector('.task-due-date');
+        if (!dueEl || !dueDate) return;
+        dueEl.innerHTML = '<i class="far fa-calendar-alt me-1"></i> ' + escapeHtml(formatShortDate(dueDate));
+        dueEl.classList.toggle('overdue', new Date(dueDate) < new Date());
+    }
+
+    function buildTaskCard(event) {
+        const card = document.createElement('div');
+        card.className = 'kanban-task';
+        card.id = `task-${event.task_id}`;
+        card.setAttribute('draggable', 'true');
+        if (typeof dragStart === 'function') {
+            // Same drag handlers kanban.js attaches to server-rendered cards
+            card.addEventListener('dragstart', dragStart);
+            card.addEventListener('dragend', dragEnd);
+        }
+        card.innerHTML = `
+            <div class="task-title">${escapeHtml(event.title)}</div>
+            <div class="task-progress-container mt-2 mb-2">
+                <div class="progress flex-grow-1 mx-1" style="height: 12px;">
+                    <div class="progress-bar" role="progressbar" aria-valuemin="0" aria-valuemax="100"></div>
+                </div>
+                <div class="text-center"><small class="text-muted"></small></div>
+            </div>
+            <div class="task-footer">
+                <div><span class="task-priority priority-${escapeHtml(event.priority)}">${escapeHtml(event.priority)}</span></div>
+                <div>${event.due_date ? '<span class="task-due-date"></span>' : ''}</div>
+            </div>
+            ${event.assigned_to ? `<div class="task-assignee mt-2"><small>${escapeHtml(event.assigned_to)}</small></div>` : ''}
+            <div class="mt-2 text-end">
+                <a href="${taskUrlTemplate.replace('/0/', `/${event.task_id}/`)}" class="btn btn-sm btn-outline-secondary">
+                    <i class="fas fa-eye"></i>
+                </a>
+            </div>`;
+        setProgress(card, event.is_done ? 100 : event.progress);
+        setDueDate(card, event.due_date);
+        return card;
+    }
+
+    const handlers = {
+        task_moved(event) {
+            const taskElement = document.getElementById(`task-${event.task_id}`);
+            if (!taskElement) return;
+            placeTask(taskElement, event.column_id, event.position);
+            setProgress(taskElement, event.is_done ? 100 : event.progress);
+        },
+        task_created(event) {
+            if (document.getElementById(`task-${event.task_id}`)) return;
+            placeTask(buildTaskCard(event), event.column_id, event.position);
+        },
+        task_progress(event) {
+            const taskElement = document.getElementById(`task-${event.task_id}`);
+            if (taskElement) setProgress(taskElement, event.progress);
+        },
+        task_dates(event) {
+            const taskElement = document.getElementById(`task-${event.task_id}`);
+            if (taskElement) setDueDate(taskElement, event.due_date);
+        },
+        columns_reordered(event) {
+            // Keep the "add column" button after the columns
+            const anchor = board.querySelector('.add-column-btn');
+            event.columns
+                .slice()
+                .sort((a, b) => a.position - b.position)
+                .forEach(item => {
+                    const column = document.getElementById(`column-${item.column_id}`);
+                    if (column) board.insertBefore(column, anchor);
+                });
+            board.querySelectorAll('.kanban-column .column-position-badge').forEach((badge, index) => {
+                badge.textContent = index + 1;
+            });
+        }
+    };
+
+    function connect() {
+        const socket = new WebSocket(protocol + window.location.host + '/ws/board/' + boardId + '/');
+
+        socket.onopen = function() {
+            reconnectDelay = 1000;
+        };
+
+        socket.onmessage = function(e) {
+            const data = JSON.parse(e.data);
+            if (data.type !== 'board_update') return;
+
+            data.events.forEach(event => {
+                const handler = handlers[event.event];
+                if (handler) handler(event);
+            });
+
+            if (typeof window.updateColumnScrolling === 'function') {
+                window.updateColumnScrolling();
+            }
+        };
+
+        socket.onclose = function() {
+            // Back off up to 30s while the server is unavailable
+            setTimeout(connect, reconnectDelay);
+            reconnectDelay = Math.min(reconnectDelay * 2, 30000);
+        };
+    }
+
+    connect();
+})();
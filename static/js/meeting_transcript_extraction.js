@@ -171,7 +171,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 meeting_context: meetingContext
             })
         })
-        .then(response => response.json())
+        .then(resolveAIJob)
         .then(data => {
             hideProcessing();
             if (data.error) {
@@ -96,9 +96,9 @@ const RiskManagement = (() => {
                 })
             });
 
-            const data = await response.json();
+            const data = await resolveAIJob(response);
 
-            if (!response.ok) {
+            if (!response.ok || data.error) {
                 showNotification('Error calculating risk: ' + data.error, 'danger');
                 return;
             }